@@ -0,0 +1,13 @@
+"""
+Offline balance tools for the game data under src/data/.
+
+Each tool is a module with its own entry point and reproduces one part of the
+game loop in NumPy, so whole campaigns can be simulated in batches without
+running Phaser:
+
+    python -m balance.spawnsim              # spawns, concurrency, time in view
+    python -m balance.calibrate             # star thresholds from simulated scores
+    python -m balance.scoring               # check and time the scoring engine
+    python -m balance.constants             # constants.ts as JSON
+    python -m balance.economy               # soul income and time to unlock shop items
+"""
@@ -0,0 +1,370 @@
+"""
+Star-threshold calibrator: Monte Carlo scores per level for a modelled
+player, and starThresholds proposed at chosen score percentiles.
+
+    python -m balance.calibrate                              # all levels, 200k runs each
+    python -m balance.calibrate 1-1 1-2 --runs 200000 --hit-rate 0.7
+    python -m balance.calibrate --percentiles 30 65 90 --write
+
+Each run is a spawnsim level instance played by the skill model:
+
+- every monster that comes into view is sliced with probability --hit-rate,
+  at a uniformly random frame of its in-view spans. An entity that rises
+  above the top edge and falls back has two spans, and the frames in between
+  are never drawn
+- ghosts cycle through Ghost.ts's GHOST_VISIBLE_DURATION visible and
+  GHOST_INVISIBLE_DURATION invisible from their spawn, with a
+  GHOST_FADE_DURATION alpha fade after each toggle, and isSliceable() only
+  holds while alpha > 0.5. Their kill frame is drawn from the in-view frames
+  in which they are sliceable, and a ghost that is never sliceable in view
+  is never killed. The Holy Cross Blade's alwaysVisible is not modelled
+- a villager in view is sliced by mistake with probability
+  1 - --villager-avoidance, at a random in-view frame, which costs
+  VILLAGER_PENALTY and the combo
+- between two kills the combo survives with probability
+  --combo-retention ** (gap / COMBO_TIMEOUT), on top of ComboSystem's own
+  timeout
+
+and is scored by scoring.score_runs() with each type's getPoints() (30 for
+ghosts, whose constructor overrides MONSTER_BASE_POINTS). Power-ups,
+upgrades, critical hits, slash-pattern bonuses and boss fights are not
+modelled. Percentiles are taken over the runs that complete the level
+(minKills reached; boss levels always count), since only those are awarded
+stars.
+
+Runs are split into chunks of --chunk and spread over a process pool; chunk
+k of level i always uses the seed (--seed, i, k), so results do not depend on
+--jobs. --write rewrites the starThresholds arrays in levels.json in place,
+leaving the rest of the file as it is.
+
+Requires numpy.
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from codemod.cache import content_digest
+from codemod.engine import REPO_ROOT
+from codemod.transaction import Transaction, TransactionError
+
+from .constants import load_constants
+from .data import LEVELS_PATH, load_levels, select_levels
+from .scoring import ScoreRules, Scores, score_runs
+from .spawnsim import MONSTER_TYPES, VILLAGER, LevelBatch, Physics, simulate_level
+
+DEFAULT_RUNS = 200_000
+DEFAULT_CHUNK = 5_000
+DEFAULT_PERCENTILES = (25, 60, 90)
+# Percentiles listed in the report besides the chosen ones
+REPORT_PERCENTILES = (1, 10, 25, 50, 75, 90, 99)
+# Ghost.ts's alpha while visible and invisible, and isSliceable()'s threshold
+GHOST_ALPHA = (1.0, 0.2)
+GHOST_SLICEABLE_ALPHA = 0.5
+GHOST = MONSTER_TYPES.index('ghost')
+
+
+@dataclasses.dataclass(frozen=True)
+class Skill:
+    hit_rate: float = 0.8
+    combo_retention: float = 0.9
+    villager_avoidance: float = 0.9
+
+
+def _phase_frames(duration_ms: float, delta: float) -> int:
+    """Frames Ghost.update() spends in a phase: it adds delta to a timer
+    that starts at 0 and toggles on the first frame with timer >= duration,
+    so float rounding can add a frame (120 * 1000 / 60 < 2000)."""
+    timer = 0.0
+    frames = 0
+    while timer < duration_ms:
+        timer += delta
+        frames += 1
+    return frames
+
+
+@dataclasses.dataclass(frozen=True)
+class GhostCycle:
+    """Ghost.ts's visibility cycle in frames after spawn. A ghost spawns
+    visible, so in the first cycle it is sliceable from frame 0; in cycle k
+    it is sliceable from k * period + fade_in, once the fade-in has taken
+    alpha above the threshold, until k * period + fade_out (exclusive),
+    partway into the fade-out. Each fade starts on the frame the phase
+    timer toggles, the last frame of the phase."""
+    # Frames per visible plus invisible phase
+    period: int
+    fade_in: int
+    fade_out: int
+
+    @classmethod
+    def from_constants(cls, constants: dict, fps: int) -> 'GhostCycle':
+        delta = 1000 / fps
+        visible, invisible = (_phase_frames(constants[name] * 1000, delta) for name in
+                              ('GHOST_VISIBLE_DURATION', 'GHOST_INVISIBLE_DURATION'))
+        fade = constants['GHOST_FADE_DURATION'] * fps
+        shown, hidden = GHOST_ALPHA
+        # Share of the linear fade spent below the threshold
+        below = (GHOST_SLICEABLE_ALPHA - hidden) / (shown - hidden)
+        # alpha > threshold strictly: from more than fade * below frames
+        # into the fade-in, for fewer than fade * (1 - below) into the fade-out
+        return cls(period=visible + invisible, fade_in=math.floor(fade * below),
+                   fade_out=visible - 1 + math.ceil(fade * (1 - below)))
+
+
+def kill_spans(batch: LevelBatch, cycle: GhostCycle) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Inclusive (first, last) frames after spawn in which each entity can
+    be sliced, as a list of spans of shape (runs, entities); empty spans
+    have last < first. These are the in-view spans, cut for ghosts to the
+    sliceable part of every visibility cycle."""
+    spans = [(first.astype(np.int64), last.astype(np.int64)) for first, last in batch.view_spans]
+    ghost = batch.kind == GHOST
+    if not ghost.any():
+        return spans
+    cycles = max(int(last[ghost].max()) for _, last in spans) // cycle.period + 1
+    pieces = []
+    for first, last in spans:
+        for k in range(cycles):
+            lo = k * cycle.period + (cycle.fade_in if k else 0)
+            hi = k * cycle.period + cycle.fade_out - 1
+            # Other entities keep the whole span, once
+            pieces.append((np.where(ghost, np.maximum(first, lo), first),
+                           np.where(ghost, np.minimum(last, hi), last if k == 0 else first - 1)))
+    return pieces
+
+
+def draw_frames(rng: np.random.Generator, spans: list[tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+    """A uniformly random frame out of the spans per entity (-1 where they
+    are all empty) and the number of frames they hold."""
+    counts = [np.maximum(last - first + 1, 0) for first, last in spans]
+    total = sum(counts)
+    pick = (rng.random(total.shape) * total).astype(np.int64)
+    frame = np.full(total.shape, -1, np.int64)
+    for (first, _), count in zip(spans, counts):
+        frame = np.where((pick >= 0) & (pick < count), first + pick, frame)
+        pick -= count
+    return frame, total
+
+
+def play(level: dict, runs: int, rng: np.random.Generator, physics: Physics, rules: ScoreRules,
+         skill: Skill, ghost_cycle: GhostCycle) -> tuple[np.ndarray, np.ndarray]:
+    """Score and completion of runs instances of level played with skill."""
+    scores, completed = play_scores(level, runs, rng, physics, rules, skill, ghost_cycle)
+    return scores.score, completed
+
+
+def play_scores(level: dict, runs: int, rng: np.random.Generator, physics: Physics, rules: ScoreRules,
+                skill: Skill, ghost_cycle: GhostCycle, critical_chance: np.ndarray | None = None,
+                score_multiplier: float = 1.0) -> tuple[Scores, np.ndarray]:
+    """play() with the full Scores; critical_chance is the per-run chance of
+    a critical hit per kill, score_multiplier the upgrade's multiplier."""
+    batch = simulate_level(level, runs, rng, physics, concurrency=False)
+    shape = batch.kind.shape
+    after_spawn, window = draw_frames(rng, kill_spans(batch, ghost_cycle))
+
+    killed = (batch.kind < VILLAGER) & (window > 0) & (rng.random(shape) < skill.hit_rate)
+    sliced = (batch.kind == VILLAGER) & (window > 0) & (rng.random(shape) >= skill.villager_avoidance)
+    frame = batch.spawn_frame + after_spawn
+
+    kill_run, kill_entity = np.nonzero(killed)
+    kill_frame = frame[kill_run, kill_entity]
+    order = np.lexsort((kill_frame, kill_run))
+    kill_run, kill_entity, kill_frame = kill_run[order], kill_entity[order], kill_frame[order]
+    # Gaps in COMBO_TIMEOUTs; a run's first kill starts a combo anyway
+    gap = np.diff(kill_frame, prepend=0) / rules.combo_frames
+    breaks = rng.random(len(kill_run)) >= skill.combo_retention ** gap
+    villager_run, villager_entity = np.nonzero(sliced)
+    critical = None
+    if critical_chance is not None:
+        critical = rng.random(len(kill_run)) < np.asarray(critical_chance)[kill_run]
+
+    scores = score_runs(runs, kill_run, kill_frame, batch.kind[kill_run, kill_entity].astype(np.int64),
+                        villager_run, frame[villager_run, villager_entity], rules, breaks,
+                        critical=critical, score_multiplier=score_multiplier)
+    completed = np.full(runs, True) if level.get('isBoss') else scores.kills >= level['minKills']
+    return scores, completed
+
+
+# Per worker process: levels, physics and score rules, loaded once
+_worker = {}
+
+
+def _init_worker(root: str, skill: Skill, fps: int) -> None:
+    constants = load_constants(root)
+    physics = Physics.from_constants(constants, fps)
+    _worker.update(levels=load_levels(root), physics=physics, skill=skill,
+                   rules=ScoreRules.from_constants(constants, physics.delta),
+                   ghost_cycle=GhostCycle.from_constants(constants, fps))
+
+
+def _play_chunk(index: int, chunk: int, runs: int, seed: int):
+    rng = np.random.default_rng([seed, index, chunk])
+    score, completed = play(_worker['levels'][index], runs, rng, _worker['physics'], _worker['rules'],
+                            _worker['skill'], _worker['ghost_cycle'])
+    return index, score[completed].astype(np.int32)
+
+
+def propose(scores: np.ndarray, percentiles, step: int) -> list[int]:
+    """Thresholds at percentiles of scores rounded to step, strictly
+    increasing."""
+    thresholds = []
+    for value in np.percentile(scores, percentiles):
+        threshold = max(step, int(round(value / step)) * step)
+        if thresholds and threshold <= thresholds[-1]:
+            threshold = thresholds[-1] + step
+        thresholds.append(threshold)
+    return thresholds
+
+
+def star_shares(scores: np.ndarray, runs: int, thresholds: list[int]) -> list[float]:
+    """Share of all runs ending with 0..3 stars (incomplete runs get 0)."""
+    stars = np.searchsorted(np.asarray(thresholds), scores, side='right')
+    counts = np.bincount(stars, minlength=4)
+    counts[0] += runs - len(scores)
+    return [round(float(count / runs), 4) for count in counts]
+
+
+def calibrate(levels: list[dict], runs: int = DEFAULT_RUNS, skill: Skill = Skill(), seed: int = 0,
+              percentiles=DEFAULT_PERCENTILES, step: int = 50, chunk: int = DEFAULT_CHUNK, jobs: int | None = None,
+              fps: int = 60, root: Path | str = REPO_ROOT) -> list[dict]:
+    """Simulate runs of every level and report proposed thresholds."""
+    order = {level['id']: i for i, level in enumerate(load_levels(root))}
+    tasks = [(order[level['id']], k, min(chunk, runs - k * chunk))
+             for level in levels for k in range((runs + chunk - 1) // chunk)]
+    jobs = jobs or os.cpu_count() or 1
+    collected = {order[level['id']]: [] for level in levels}
+    if jobs == 1 or len(tasks) == 1:
+        _init_worker(str(root), skill, fps)
+        results = (_play_chunk(index, k, n, seed) for index, k, n in tasks)
+        for index, scores in results:
+            collected[index].append(scores)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(str(root), skill, fps)) as pool:
+            for index, scores in pool.map(_play_chunk, *zip(*tasks), [seed] * len(tasks)):
+                collected[index].append(scores)
+
+    report = []
+    for level in levels:
+        scores = np.concatenate(collected[order[level['id']]])
+        entry = {'id': level['id'], 'runs': runs, 'completed': round(len(scores) / runs, 4),
+                 'current': level['starThresholds']}
+        if len(scores):
+            entry['percentiles'] = {str(p): int(v) for p, v in
+                                    zip(REPORT_PERCENTILES, np.percentile(scores, REPORT_PERCENTILES))}
+            entry['proposed'] = propose(scores, percentiles, step)
+            entry['stars_current'] = star_shares(scores, runs, level['starThresholds'])
+            entry['stars_proposed'] = star_shares(scores, runs, entry['proposed'])
+        report.append(entry)
+    return report
+
+
+_THRESHOLDS = re.compile(r'("id":\s*"(?P<id>[^"]+)"(?:(?!"id").)*?"starThresholds":\s*)\[[^\]]*\]', re.S)
+
+
+def write_thresholds(root: Path | str, proposals: dict[str, list[int]]) -> list[str]:
+    """Replace the starThresholds of the given level ids in levels.json;
+    return the ids that changed."""
+    root = Path(root)
+    data = (root / LEVELS_PATH).read_bytes()
+    changed = []
+
+    def replace(match: re.Match) -> str:
+        thresholds = proposals.get(match['id'])
+        if thresholds is None:
+            return match[0]
+        text = f'{match[1]}[{", ".join(map(str, thresholds))}]'
+        if text != match[0]:
+            changed.append(match['id'])
+        return text
+
+    source = _THRESHOLDS.sub(replace, data.decode('utf-8'))
+    if changed:
+        transaction = Transaction(root)
+        transaction.stage(LEVELS_PATH, content_digest(data), source)
+        transaction.commit()
+    return changed
+
+
+def _format_row(entry: dict) -> str:
+    if 'proposed' not in entry:
+        return f'{entry["id"]:<6} {entry["completed"] * 100:>6.1f}%  no completed runs'
+    current = '/'.join(map(str, entry['current']))
+    proposed = '/'.join(map(str, entry['proposed']))
+    p = entry['percentiles']
+    return (f'{entry["id"]:<6} {entry["completed"] * 100:>6.1f}% {p["10"]:>6} {p["50"]:>6} {p["90"]:>6} '
+            f'{current:>16} {entry["stars_current"][3] * 100:>5.1f}% {proposed:>16}')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m balance.calibrate',
+                                     description='Propose star thresholds from simulated scores.')
+    parser.add_argument('levels', nargs='*', metavar='LEVEL', help='level ids (default: all)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='runs per level (default: %(default)s)')
+    parser.add_argument('--hit-rate', type=float, default=Skill.hit_rate,
+                        help='chance to slice a monster in view (default: %(default)s)')
+    parser.add_argument('--combo-retention', type=float, default=Skill.combo_retention,
+                        help='chance to keep a combo per COMBO_TIMEOUT between kills (default: %(default)s)')
+    parser.add_argument('--villager-avoidance', type=float, default=Skill.villager_avoidance,
+                        help='chance not to slice a villager in view (default: %(default)s)')
+    parser.add_argument('--percentiles', type=float, nargs=3, default=DEFAULT_PERCENTILES, metavar='P',
+                        help='score percentiles for 1, 2 and 3 stars (default: %(default)s)')
+    parser.add_argument('--round', type=int, default=50, dest='step',
+                        help='round thresholds to a multiple of this (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK, help='runs per task (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON')
+    parser.add_argument('--write', action='store_true', help='write the proposed thresholds to levels.json')
+    args = parser.parse_args(argv)
+
+    rates = (args.hit_rate, args.combo_retention, args.villager_avoidance)
+    if not all(0 <= rate <= 1 for rate in rates) or not all(0 <= p <= 100 for p in args.percentiles):
+        print('Rates must be in [0, 1] and percentiles in [0, 100]', file=sys.stderr)
+        return 2
+    if args.runs < 1 or args.chunk < 1 or args.step < 1:
+        print('--runs, --chunk and --round must be at least 1', file=sys.stderr)
+        return 2
+    try:
+        levels = select_levels(load_levels(args.root), args.levels)
+    except KeyError as exc:
+        print(f'Unknown level: {exc.args[0]}', file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    skill = Skill(*rates)
+    report = calibrate(levels, args.runs, skill, args.seed, sorted(args.percentiles), args.step, args.chunk,
+                       args.jobs, root=args.root)
+    print(f'{"level":<6} {"done":>7} {"p10":>6} {"p50":>6} {"p90":>6} {"current":>16} {"3 star":>6} '
+          f'{"proposed":>16}')
+    for entry in report:
+        print(_format_row(entry))
+    print(f'{len(levels)} levels x {args.runs} runs in {time.perf_counter() - started:.1f} s')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'skill': dataclasses.asdict(skill),
+                       'percentiles': sorted(args.percentiles), 'levels': report}, f, indent=2)
+            f.write('\n')
+    if args.write:
+        try:
+            changed = write_thresholds(args.root, {entry['id']: entry['proposed']
+                                                   for entry in report if 'proposed' in entry})
+        except TransactionError as exc:
+            print(f'Error: {exc}', file=sys.stderr)
+            return 1
+        print(f'{LEVELS_PATH}: {len(changed)} levels updated')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
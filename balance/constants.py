@@ -0,0 +1,237 @@
+"""
+Constants from src/config/constants.ts, as a cached JSON snapshot.
+
+    python -m balance.constants                      # every extracted constant
+    python -m balance.constants GRAVITY MULTI_KILL_BONUS
+    python -m balance.constants --skipped            # exports that are not literals
+
+extract() evaluates the literal-valued `export const` declarations with the
+codemod tokenizer: numbers (with a sign), strings, templates without ${...},
+true/false/null, and arrays and object literals of those, nested to any
+depth. Object keys stay strings, as in JavaScript; `as const` and type
+annotations are ignored. Anything computed (arrow functions, references to
+other constants, arithmetic) is skipped as a whole export and listed.
+
+load_constants() keeps the result in .balance-constants.json at the
+repository root with the SHA-256 of constants.ts and re-extracts only when
+the file's hash no longer matches, so a simulator start costs one small file
+read and a JSON parse.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from codemod.cache import content_digest
+from codemod.engine import REPO_ROOT
+from codemod.tokenizer import IDENT, NUMBER, PUNCT, STRING, TEMPLATE, tokenize
+
+CONSTANTS_PATH = 'src/config/constants.ts'
+SNAPSHOT_FILENAME = '.balance-constants.json'
+# Bump when extract() changes what it produces
+SNAPSHOT_VERSION = 1
+
+_KEYWORDS = {'true': True, 'false': False, 'null': None}
+# Tokens that may follow a complete value at the top level
+_VALUE_END = (';', 'as', 'satisfies', 'export')
+_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+                   '\n': '', '\r\n': ''}
+
+
+class _NotLiteral(Exception):
+    pass
+
+
+def _number(text: str) -> int | float:
+    text = text.replace('_', '')
+    if text.endswith('n'):
+        raise _NotLiteral(text)
+    if text[:2].lower() in ('0x', '0b', '0o'):
+        return int(text, 0)
+    value = float(text)
+    return int(value) if value.is_integer() and not any(c in text for c in '.eE') else value
+
+
+def _unescape(body: str) -> str:
+    def replace(match: re.Match) -> str:
+        escape = match[1]
+        if escape[0] == 'u':
+            return chr(int(escape[1:].strip('{}'), 16))
+        if escape[0] == 'x':
+            return chr(int(escape[1:], 16))
+        return _SIMPLE_ESCAPES.get(escape, escape)
+
+    return _ESCAPE.sub(replace, body)
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.i].text if self.i < len(self.tokens) else None
+
+    def take(self, text: str | None = None):
+        if self.i >= len(self.tokens) or (text is not None and self.tokens[self.i].text != text):
+            raise _NotLiteral(text)
+        self.i += 1
+        return self.tokens[self.i - 1]
+
+    def value(self):
+        token = self.take()
+        if token.kind == PUNCT and token.text in '-+':
+            number = self.take()
+            if number.kind != NUMBER:
+                raise _NotLiteral(number.text)
+            return -_number(number.text) if token.text == '-' else _number(number.text)
+        if token.kind == NUMBER:
+            return _number(token.text)
+        if token.kind == STRING:
+            return _unescape(token.text[1:-1])
+        if token.kind == TEMPLATE and '${' not in token.text:
+            return _unescape(token.text[1:-1])
+        if token.kind == IDENT and token.text in _KEYWORDS:
+            return _KEYWORDS[token.text]
+        if token.text == '[':
+            items = []
+            while self.peek() != ']':
+                items.append(self.value())
+                if self.peek() != ']':
+                    self.take(',')
+            self.take(']')
+            return items
+        if token.text == '{':
+            members = {}
+            while self.peek() != '}':
+                key = self.take()
+                if key.kind == STRING:
+                    name = _unescape(key.text[1:-1])
+                elif key.kind == NUMBER:
+                    name = str(_number(key.text))
+                elif key.kind == IDENT:
+                    name = key.text
+                else:
+                    raise _NotLiteral(key.text)
+                self.take(':')
+                members[name] = self.value()
+                if self.peek() != '}':
+                    self.take(',')
+            self.take('}')
+            return members
+        raise _NotLiteral(token.text)
+
+    def skip_annotation(self) -> None:
+        """Skip `: Type` up to the `=` at bracket depth 0."""
+        depth = 0
+        while self.peek() is not None:
+            text = self.peek()
+            if depth == 0 and text == '=':
+                return
+            if text in ('(', '[', '{', '<'):
+                depth += 1
+            elif text in (')', ']', '}', '>'):
+                depth -= 1
+            self.i += 1
+
+
+def extract(source: str) -> tuple[dict, list[str]]:
+    """(constants, skipped names) for the `export const` declarations of
+    source, in file order. A name declared twice keeps its last value."""
+    tokens = list(tokenize(source))
+    constants = {}
+    skipped = []
+    for i, token in enumerate(tokens[:-3]):
+        if token.text != 'export' or tokens[i + 1].text != 'const' or tokens[i + 2].kind != IDENT:
+            continue
+        name = tokens[i + 2].text
+        parser = _Parser(tokens)
+        parser.i = i + 3
+        try:
+            if parser.peek() == ':':
+                parser.skip_annotation()
+            parser.take('=')
+            value = parser.value()
+            if parser.peek() not in _VALUE_END and parser.peek() is not None:
+                raise _NotLiteral(parser.peek())
+        except _NotLiteral:
+            skipped.append(name)
+            continue
+        constants.pop(name, None)
+        constants[name] = value
+    return constants, [name for name in skipped if name not in constants]
+
+
+def _read_snapshot(path: Path) -> dict | None:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snapshot if isinstance(snapshot, dict) and snapshot.get('version') == SNAPSHOT_VERSION else None
+
+
+def snapshot(root: Path | str = REPO_ROOT, refresh: bool = False) -> dict:
+    """The snapshot document for root's constants.ts, re-extracted and
+    saved when its digest changed (or refresh is set)."""
+    root = Path(root)
+    data = (root / CONSTANTS_PATH).read_bytes()
+    digest = content_digest(data)
+    path = root / SNAPSHOT_FILENAME
+    document = None if refresh else _read_snapshot(path)
+    if document is None or document.get('digest') != digest:
+        constants, skipped = extract(data.decode('utf-8'))
+        document = {'version': SNAPSHOT_VERSION, 'source': CONSTANTS_PATH, 'digest': digest,
+                    'constants': constants, 'skipped': skipped}
+        temp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=1)
+                f.write('\n')
+            os.replace(temp, path)
+        except OSError:
+            # Read-only checkouts still get the constants, just uncached
+            temp.unlink(missing_ok=True)
+    return document
+
+
+def load_constants(root: Path | str = REPO_ROOT) -> dict:
+    """Every literal `export const` in constants.ts by name."""
+    return snapshot(root)['constants']
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m balance.constants',
+                                     description='Print the literal exports of constants.ts as JSON.')
+    parser.add_argument('names', nargs='*', metavar='NAME', help='constants to print (default: all)')
+    parser.add_argument('--skipped', action='store_true', help='list the exports that are not literals')
+    parser.add_argument('--refresh', action='store_true', help=f'rebuild {SNAPSHOT_FILENAME}')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    document = snapshot(args.root, args.refresh)
+    elapsed = time.perf_counter() - started
+    constants = document['constants']
+    if args.skipped:
+        print('\n'.join(document['skipped']))
+    else:
+        missing = [name for name in args.names if name not in constants]
+        if missing:
+            print(f'Not a literal export: {", ".join(missing)}', file=sys.stderr)
+            return 1
+        selected = {name: constants[name] for name in args.names} if args.names else constants
+        json.dump(selected, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    print(f'{len(constants)} constants, {len(document["skipped"])} skipped, '
+          f'{elapsed * 1000:.2f} ms', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Game data files under src/data/.
+"""
+
+import json
+from pathlib import Path
+
+from codemod.engine import REPO_ROOT
+
+LEVELS_PATH = 'src/data/levels.json'
+WEAPONS_PATH = 'src/data/weapons.json'
+UPGRADES_PATH = 'src/data/upgrades.json'
+
+
+def load_json(path: str, root: Path | str = REPO_ROOT):
+    with open(Path(root) / path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_levels(root: Path | str = REPO_ROOT) -> list[dict]:
+    """The campaign levels in file order."""
+    return load_json(LEVELS_PATH, root)['levels']
+
+
+def load_bosses(root: Path | str = REPO_ROOT) -> dict[str, dict]:
+    """Boss configs by id."""
+    return load_json(LEVELS_PATH, root)['bosses']
+
+
+def load_weapons(root: Path | str = REPO_ROOT) -> list[dict]:
+    """The weapons in shop order."""
+    return load_json(WEAPONS_PATH, root)['weapons']
+
+
+def load_upgrades(root: Path | str = REPO_ROOT) -> list[dict]:
+    """The permanent upgrades in shop order."""
+    return load_json(UPGRADES_PATH, root)['upgrades']
+
+
+def select_levels(levels: list[dict], ids: list[str] | None) -> list[dict]:
+    """levels filtered to ids (all when ids is empty); raises KeyError naming
+    the first unknown id."""
+    if not ids:
+        return list(levels)
+    by_id = {level['id']: level for level in levels}
+    for level_id in ids:
+        if level_id not in by_id:
+            raise KeyError(level_id)
+    return [by_id[level_id] for level_id in ids]
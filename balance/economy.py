@@ -0,0 +1,455 @@
+"""
+Soul economy simulator: batches of players progressing through the campaign
+and buying weapons and upgrades, with the play time until every shop item is
+bought.
+
+    python -m balance.economy                                # all strategies, 2000 players each
+    python -m balance.economy --strategies cheapest score --players 10000
+    python -m balance.economy --csv economy.csv --json economy.json
+
+Each player starts from the default save (the isStarter weapons at tier 1,
+no upgrades, no souls) and plays the levels in campaign order; every attempt
+is a calibrate.play_scores() run for the --hit-rate / --combo-retention /
+--villager-avoidance player. An attempt lasts the level's duration, and a
+run short of minKills is abandoned at the timer. A completion with at least
+one star unlocks the next level, judged by the starThresholds in levels.json
+as they are (balance.calibrate --write changes the pace here); after 5-5 the
+player keeps replaying the last level. A player stops once the shop is empty,
+so the report also shows where players stood in the campaign at that point.
+Income follows the game as it ships:
+
+- MONSTER_SOULS per kill, as the kill happens (failed attempts keep them)
+- LevelManager.completeLevel: floor((base + perWorld * (world - 1)) *
+  STAR_BONUS_MULTIPLIER[stars]) from LEVEL_COMPLETE_SOULS, or
+  BOSS_DEFEAT_SOULS on boss levels
+- LevelCompleteScene: the run's kill souls again plus LEVEL_COMPLETE_SOULS
+  base + perWorld * world; --single-award leaves this out
+
+Bosses' soulsReward is never paid (the addSouls call in handleBossDefeated is
+commented out); --boss-rewards pays it on every boss completion. A completion
+with 0 stars has no STAR_BONUS_MULTIPLIER entry and adds NaN souls to the
+save in the game; here it pays no LevelManager bonus and is counted in the
+report as zero-star completions.
+
+After every attempt the player shops as ShopManager allows: weapon unlocks
+at unlockCost, weapon upgrades at tiers[tier].upgradeCost up to the last
+tier, upgrades at tiers[tier].cost up to maxTier, each only when affordable.
+A strategy ranks the shop's slots; the player buys the best-ranked,
+cheapest next purchase while they can afford it and otherwise saves for it.
+score_multiplier and critical_hit feed back into the score (and so the
+stars) with the values getUpgradeValue() returns, which index tiers by the
+owned tier: one tier ahead, and back to baseValue at maxTier. Lives, power-
+ups, slash-pattern bonuses, slash width, slow motion and weapon stats are not
+modelled.
+
+Players are split into chunks of --chunk and spread over a process pool;
+chunk k of strategy s always uses the seed (--seed, s, k), so results do not
+depend on --jobs. Times are minutes of play until the purchase; the report
+has percentiles and a histogram per item over shared bins, and --csv writes
+one row per strategy and item.
+
+Requires numpy.
+"""
+
+import argparse
+import csv
+import dataclasses
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from codemod.engine import REPO_ROOT
+
+from .calibrate import GhostCycle, Skill, play_scores
+from .constants import load_constants
+from .data import load_bosses, load_levels, load_upgrades, load_weapons
+from .scoring import ScoreRules
+from .spawnsim import Physics
+
+DEFAULT_PLAYERS = 2000
+DEFAULT_CHUNK = 500
+DEFAULT_MAX_ATTEMPTS = 1000
+DEFAULT_BINS = 20
+REPORT_PERCENTILES = (10, 50, 90)
+# Shop slots a strategy buys first; the rest follow, cheapest first
+STRATEGIES = {
+    'cheapest': (),
+    'weapons': ('weapon',),
+    'upgrades': ('upgrade',),
+    'score': ('upgrade:score_multiplier', 'upgrade:critical_hit'),
+}
+_SPARKS = ' ▁▂▃▄▅▆▇█'
+# Above any price, so a slot's rank outweighs its cost
+_RANK_SCALE = 1e9
+
+
+@dataclasses.dataclass(frozen=True)
+class Catalog:
+    """The shop as arrays over slots (one per weapon and upgrade)."""
+    # 'weapon:<id>' or 'upgrade:<id>'
+    slots: tuple[str, ...]
+    # Cost of the next purchase by slot and owned tier, inf when maxed
+    costs: np.ndarray
+    # Tier of each slot in the default save
+    start: np.ndarray
+    # Item bought by raising slot s from tier t, -1 past the last tier
+    item_of: np.ndarray
+    # '<id>@<tier>' per item, with its slot and cost
+    items: tuple[str, ...]
+    item_slot: np.ndarray
+    item_cost: np.ndarray
+    # getUpgradeValue() by owned tier
+    score_multiplier: np.ndarray
+    critical_chance: np.ndarray
+
+    @classmethod
+    def from_data(cls, weapons: list[dict], upgrades: list[dict]) -> 'Catalog':
+        slots, ladders, start = [], [], []
+        for weapon in weapons:
+            slots.append(f'weapon:{weapon["id"]}')
+            # getUpgradeCost(id, tier) is tiers[tier].upgradeCost
+            ladders.append([weapon['unlockCost']] + [tier['upgradeCost'] for tier in weapon['tiers'][1:]])
+            start.append(1 if weapon['isStarter'] else 0)
+        for upgrade in upgrades:
+            slots.append(f'upgrade:{upgrade["id"]}')
+            ladders.append([tier['cost'] for tier in upgrade['tiers'][:upgrade['maxTier']]])
+            start.append(0)
+
+        width = max(map(len, ladders)) + 1
+        costs = np.full((len(slots), width), np.inf)
+        item_of = np.full((len(slots), width), -1)
+        items, item_slot, item_cost = [], [], []
+        for s, (slot, ladder) in enumerate(zip(slots, ladders)):
+            for t in range(start[s], len(ladder)):
+                costs[s, t] = ladder[t]
+                item_of[s, t] = len(items)
+                items.append(f'{slot.split(":", 1)[1]}@{t + 1}')
+                item_slot.append(s)
+                item_cost.append(ladder[t])
+
+        by_id = {upgrade['id']: upgrade for upgrade in upgrades}
+
+        def values(upgrade_id: str, default: float) -> np.ndarray:
+            upgrade = by_id.get(upgrade_id)
+            if upgrade is None:
+                return np.full(width, default)
+            tiers = upgrade['tiers']
+            # tiers[tier]?.value || baseValue
+            return np.array([(tiers[t]['value'] if t < len(tiers) else 0) or upgrade['baseValue']
+                             for t in range(width)], float)
+
+        return cls(tuple(slots), costs, np.array(start), item_of, tuple(items), np.array(item_slot),
+                   np.array(item_cost), values('score_multiplier', 1.0), values('critical_hit', 0.0))
+
+    def slot(self, name: str) -> int | None:
+        return self.slots.index(name) if name in self.slots else None
+
+    def ranks(self, strategy: str) -> np.ndarray:
+        """Priority of every slot under strategy, lower buys first."""
+        first = STRATEGIES[strategy]
+        return np.array([0 if any(slot == name or slot.split(':')[0] == name for name in first) else 1
+                         for slot in self.slots])
+
+
+@dataclasses.dataclass(frozen=True)
+class Rewards:
+    """Completion income per level index."""
+    # LevelManager.completeLevel before the star multiplier
+    manager: np.ndarray
+    # LevelCompleteScene's bonus on top of the kill souls
+    scene: np.ndarray
+    # levels.json bosses[bossId].soulsReward, 0 on normal levels
+    boss: np.ndarray
+    # STAR_BONUS_MULTIPLIER by stars, 0 for 0 stars
+    star_bonus: np.ndarray
+    double_award: bool = True
+    boss_rewards: bool = False
+
+    @classmethod
+    def from_constants(cls, constants: dict, levels: list[dict], bosses: dict[str, dict],
+                       double_award: bool = True, boss_rewards: bool = False) -> 'Rewards':
+        complete, defeat = constants['LEVEL_COMPLETE_SOULS'], constants['BOSS_DEFEAT_SOULS']
+        manager = [(defeat if level.get('isBoss') else complete)['base']
+                   + (defeat if level.get('isBoss') else complete)['perWorld'] * (level['world'] - 1)
+                   for level in levels]
+        scene = [complete['base'] + complete['perWorld'] * level['world'] for level in levels]
+        boss = [bosses[level['bossId']]['soulsReward'] if level.get('isBoss') and level.get('bossId') in bosses
+                else 0 for level in levels]
+        star_bonus = [0.0] + [constants['STAR_BONUS_MULTIPLIER'][str(stars)] for stars in (1, 2, 3)]
+        return cls(np.array(manager, float), np.array(scene), np.array(boss), np.array(star_bonus),
+                   double_award, boss_rewards)
+
+
+@dataclasses.dataclass
+class Progress:
+    """Per player results of one chunk."""
+    # Minutes played when each item was bought, NaN if never
+    unlocked: np.ndarray
+    # Minutes played when 5-5 was first cleared, NaN if never
+    campaign: np.ndarray
+    # Levels cleared in campaign order when the player stopped
+    cleared: np.ndarray
+    attempts: np.ndarray
+    zero_star: np.ndarray
+
+
+def _shop(catalog: Catalog, ranks: np.ndarray, tier: np.ndarray, souls: np.ndarray, unlocked: np.ndarray,
+          minutes: np.ndarray) -> None:
+    """Buy the best-ranked next purchase while affordable, in place."""
+    rows = np.arange(len(souls))
+    slots = np.arange(len(catalog.slots))
+    while True:
+        cost = catalog.costs[slots, tier]
+        key = ranks * _RANK_SCALE + cost
+        choice = np.argmin(key, axis=1)
+        price = cost[rows, choice]
+        buyers = np.flatnonzero(np.isfinite(price) & (price <= souls))
+        if not len(buyers):
+            return
+        slot = choice[buyers]
+        unlocked[buyers, catalog.item_of[slot, tier[buyers, slot]]] = minutes[buyers]
+        souls[buyers] -= price[buyers].astype(np.int64)
+        tier[buyers, slot] += 1
+
+
+def progress(players: int, strategy: str, rng: np.random.Generator, catalog: Catalog, rewards: Rewards,
+             levels: list[dict], physics: Physics, rules: ScoreRules, skill: Skill, ghost_cycle: GhostCycle,
+             max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Progress:
+    """Play players through the campaign under strategy until each has
+    bought every item or made max_attempts attempts."""
+    ranks = catalog.ranks(strategy)
+    multiplier_slot = catalog.slot('upgrade:score_multiplier')
+    critical_slot = catalog.slot('upgrade:critical_hit')
+    duration = np.array([level['duration'] for level in levels]) / 60
+    thresholds = [np.asarray(level['starThresholds']) for level in levels]
+
+    tier = np.tile(catalog.start, (players, 1))
+    souls = np.zeros(players, np.int64)
+    minutes = np.zeros(players)
+    cleared = np.zeros(players, np.int64)
+    attempts = np.zeros(players, np.int64)
+    zero_star = np.zeros(players, np.int64)
+    unlocked = np.full((players, len(catalog.items)), np.nan)
+    campaign = np.full(players, np.nan)
+    active = np.ones(players, bool)
+    _shop(catalog, ranks, tier, souls, unlocked, minutes)
+
+    for _ in range(max_attempts):
+        index = np.flatnonzero(active)
+        if not len(index):
+            break
+        position = np.minimum(cleared[index], len(levels) - 1)
+        multiplier = tier[index, multiplier_slot] if multiplier_slot is not None else np.zeros(len(index), int)
+        critical = tier[index, critical_slot] if critical_slot is not None else np.zeros(len(index), int)
+        income = np.zeros(len(index), np.int64)
+        advanced = np.zeros(len(index), bool)
+        group_key = position * catalog.costs.shape[1] + multiplier
+        for key in np.unique(group_key):
+            group = np.flatnonzero(group_key == key)
+            at = int(position[group[0]])
+            scores, completed = play_scores(levels[at], len(group), rng, physics, rules, skill, ghost_cycle,
+                                            catalog.critical_chance[critical[group]],
+                                            float(catalog.score_multiplier[multiplier[group[0]]]))
+            stars = np.searchsorted(thresholds[at], scores.score, side='right') * completed
+            earned = scores.souls + np.floor(rewards.manager[at] * rewards.star_bonus[stars]).astype(np.int64)
+            if rewards.double_award:
+                earned += np.where(completed, scores.souls + rewards.scene[at], 0)
+            if rewards.boss_rewards:
+                earned += np.where(completed, rewards.boss[at], 0)
+            income[group] = earned
+            advanced[group] = stars > 0
+            zero_star[index[group]] += completed & (stars == 0)
+
+        souls[index] += income
+        minutes[index] += duration[position]
+        attempts[index] += 1
+        cleared[index] += advanced
+        finished = index[(cleared[index] >= len(levels)) & np.isnan(campaign[index])]
+        campaign[finished] = minutes[finished]
+        _shop(catalog, ranks, tier, souls, unlocked, minutes)
+        active = np.isnan(unlocked).any(axis=1)
+    return Progress(unlocked, campaign, np.minimum(cleared, len(levels)), attempts, zero_star)
+
+
+# Per worker process: levels, shop, rewards and score rules, loaded once
+_worker = {}
+
+
+def _init_worker(root: str, skill: Skill, fps: int, double_award: bool, boss_rewards: bool,
+                 max_attempts: int) -> None:
+    constants = load_constants(root)
+    physics = Physics.from_constants(constants, fps)
+    levels = load_levels(root)
+    _worker.update(levels=levels, physics=physics, skill=skill, max_attempts=max_attempts,
+                   catalog=Catalog.from_data(load_weapons(root), load_upgrades(root)),
+                   rewards=Rewards.from_constants(constants, levels, load_bosses(root), double_award, boss_rewards),
+                   rules=ScoreRules.from_constants(constants, physics.delta),
+                   ghost_cycle=GhostCycle.from_constants(constants, fps))
+
+
+def _progress_chunk(strategy: str, chunk: int, players: int, seed: int):
+    rng = np.random.default_rng([seed, list(STRATEGIES).index(strategy), chunk])
+    result = progress(players, strategy, rng, _worker['catalog'], _worker['rewards'], _worker['levels'],
+                      _worker['physics'], _worker['rules'], _worker['skill'], _worker['ghost_cycle'],
+                      _worker['max_attempts'])
+    return strategy, result
+
+
+def _percentiles(values: np.ndarray) -> dict[str, float | None]:
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return {f'p{p}': None for p in REPORT_PERCENTILES}
+    return {f'p{p}': round(float(v), 1) for p, v in zip(REPORT_PERCENTILES, np.percentile(values, REPORT_PERCENTILES))}
+
+
+def simulate(strategies: list[str], players: int = DEFAULT_PLAYERS, skill: Skill = Skill(), seed: int = 0,
+             bins: int = DEFAULT_BINS, chunk: int = DEFAULT_CHUNK, jobs: int | None = None,
+             max_attempts: int = DEFAULT_MAX_ATTEMPTS, double_award: bool = True, boss_rewards: bool = False,
+             fps: int = 60, root: Path | str = REPO_ROOT) -> dict:
+    """Simulate players under every strategy and report time-to-unlock per
+    item, with histograms over shared bin edges (minutes)."""
+    tasks = [(strategy, k, min(chunk, players - k * chunk))
+             for strategy in strategies for k in range((players + chunk - 1) // chunk)]
+    initargs = (str(root), skill, fps, double_award, boss_rewards, max_attempts)
+    jobs = jobs or os.cpu_count() or 1
+    collected = {strategy: [] for strategy in strategies}
+    if jobs == 1 or len(tasks) == 1:
+        _init_worker(*initargs)
+        for strategy, result in (_progress_chunk(strategy, k, n, seed) for strategy, k, n in tasks):
+            collected[strategy].append(result)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+            for strategy, result in pool.map(_progress_chunk, *zip(*tasks), [seed] * len(tasks)):
+                collected[strategy].append(result)
+
+    catalog = Catalog.from_data(load_weapons(root), load_upgrades(root))
+    level_ids = [level['id'] for level in load_levels(root)] + ['done']
+    unlocked = {strategy: np.concatenate([result.unlocked for result in results])
+                for strategy, results in collected.items()}
+    finite = np.concatenate([times[np.isfinite(times)] for times in unlocked.values()])
+    edges = np.linspace(0, max(float(np.ceil(finite.max(initial=0))), 1.0), bins + 1)
+
+    report = {'players': players, 'edges': [round(float(edge), 1) for edge in edges], 'strategies': []}
+    for strategy, results in collected.items():
+        campaign = np.concatenate([result.campaign for result in results])
+        cleared = np.concatenate([result.cleared for result in results])
+        entry = {
+            'strategy': strategy,
+            'campaign': {'cleared': round(float(np.isfinite(campaign).mean()), 4), **_percentiles(campaign)},
+            # Share of players whose next level was each level id when they stopped
+            'stopped_at': {level_ids[i]: round(count / players, 4)
+                           for i, count in enumerate(np.bincount(cleared, minlength=len(level_ids))) if count},
+            'attempts': _percentiles(np.concatenate([result.attempts for result in results]).astype(float)),
+            'zero_star_completions': round(float(np.mean(np.concatenate([r.zero_star for r in results]))), 3),
+            'items': [],
+        }
+        for i, item in enumerate(catalog.items):
+            times = unlocked[strategy][:, i]
+            bought = times[np.isfinite(times)]
+            entry['items'].append({
+                'item': item, 'kind': catalog.slots[catalog.item_slot[i]].split(':')[0],
+                'cost': int(catalog.item_cost[i]), 'unlocked': round(len(bought) / players, 4),
+                'mean': round(float(bought.mean()), 1) if len(bought) else None, **_percentiles(times),
+                'histogram': np.histogram(bought, edges)[0].tolist(),
+            })
+        report['strategies'].append(entry)
+    return report
+
+
+def write_csv(path: str, report: dict) -> None:
+    edges = report['edges']
+    header = ['strategy', 'item', 'kind', 'cost', 'players', 'unlocked', 'mean'] + \
+        [f'p{p}' for p in REPORT_PERCENTILES] + [f'{lo:g}-{hi:g}' for lo, hi in zip(edges, edges[1:])]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for entry in report['strategies']:
+            for item in entry['items']:
+                writer.writerow([entry['strategy'], item['item'], item['kind'], item['cost'], report['players'],
+                                 item['unlocked'], item['mean']] +
+                                [item[f'p{p}'] for p in REPORT_PERCENTILES] + item['histogram'])
+
+
+def _sparkline(counts: list[int]) -> str:
+    top = max(counts, default=0)
+    if not top:
+        return ' ' * len(counts)
+    return ''.join(_SPARKS[0 if not count else max(1, round(count / top * (len(_SPARKS) - 1)))]
+                   for count in counts)
+
+
+def _minutes(value: float | None) -> str:
+    return f'{value:>7.1f}' if value is not None else f'{"-":>7}'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m balance.economy',
+                                     description='Simulate soul income and shop purchases over the campaign.')
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES),
+                        help='purchase strategies (default: all)')
+    parser.add_argument('--players', type=int, default=DEFAULT_PLAYERS,
+                        help='players per strategy (default: %(default)s)')
+    parser.add_argument('--hit-rate', type=float, default=Skill.hit_rate,
+                        help='chance to slice a monster in view (default: %(default)s)')
+    parser.add_argument('--combo-retention', type=float, default=Skill.combo_retention,
+                        help='chance to keep a combo per COMBO_TIMEOUT between kills (default: %(default)s)')
+    parser.add_argument('--villager-avoidance', type=float, default=Skill.villager_avoidance,
+                        help='chance not to slice a villager in view (default: %(default)s)')
+    parser.add_argument('--single-award', action='store_true',
+                        help="leave out LevelCompleteScene's second award of kill souls and bonus")
+    parser.add_argument('--boss-rewards', action='store_true', help="pay bosses' soulsReward on defeat")
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help='attempts per player before giving up (default: %(default)s)')
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS, help='histogram bins (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK, help='players per task (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON')
+    parser.add_argument('--csv', metavar='PATH', help='write one row per strategy and item as CSV')
+    args = parser.parse_args(argv)
+
+    rates = (args.hit_rate, args.combo_retention, args.villager_avoidance)
+    if not all(0 <= rate <= 1 for rate in rates):
+        print('Rates must be in [0, 1]', file=sys.stderr)
+        return 2
+    if min(args.players, args.chunk, args.max_attempts, args.bins) < 1:
+        print('--players, --chunk, --max-attempts and --bins must be at least 1', file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    skill = Skill(*rates)
+    strategies = list(dict.fromkeys(args.strategies))
+    report = simulate(strategies, args.players, skill, args.seed, args.bins, args.chunk, args.jobs,
+                      args.max_attempts, not args.single_award, args.boss_rewards, root=args.root)
+    edges = report['edges']
+    for entry in report['strategies']:
+        campaign = entry['campaign']
+        stopped = max(entry['stopped_at'], key=entry['stopped_at'].get)
+        print(f'{entry["strategy"]}: campaign cleared by {campaign["cleared"] * 100:.1f}% '
+              f'(p50 {_minutes(campaign["p50"]).strip()} min), most stopped at {stopped}, '
+              f'{entry["zero_star_completions"]:.2f} zero-star completions per player')
+        print(f'  {"item":<24} {"cost":>5} {"bought":>7} {"p10":>7} {"p50":>7} {"p90":>7}  '
+              f'0-{edges[-1]:g} min')
+        for item in entry['items']:
+            print(f'  {item["item"]:<24} {item["cost"]:>5} {item["unlocked"] * 100:>6.1f}% {_minutes(item["p10"])} '
+                  f'{_minutes(item["p50"])} {_minutes(item["p90"])}  |{_sparkline(item["histogram"])}|')
+    print(f'{len(strategies)} strategies x {args.players} players in {time.perf_counter() - started:.1f} s')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'skill': dataclasses.asdict(skill), 'double_award': not args.single_award,
+                       'boss_rewards': args.boss_rewards, **report}, f, indent=2)
+            f.write('\n')
+    if args.csv:
+        write_csv(args.csv, report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Score and souls for batches of kill streams, computed the way SlashSystem
+and ComboSystem do it in the game.
+
+    python -m balance.scoring                   # check against the reference, then time it
+    python -m balance.scoring --runs 100000 --kills 200
+
+A batch is flat arrays of kill events (run, frame, monster type) sorted by
+run and frame, plus the frames on which villagers were sliced. Timestamps
+become frames with frames_of(). Per kill, as in
+SlashSystem.checkMonsterCollisions():
+
+- the combo carries over from the previous kill unless ComboSystem.update()
+  has timed it out in between (combo_timeout_frames()), a villager was sliced
+  in between, or the caller breaks it (a player-skill model)
+- the multiplier is 1 + combo * COMBO_MULTIPLIER_RATE with the combo before
+  the kill, times 2 under frenzy, the upgrades' scoreMultiplier and the
+  critical-hit multiplier, in that order; points are
+  floor(monster.getPoints() * multiplier). getPoints() is MONSTER_BASE_POINTS
+  unless the subclass constructor sets its own (Ghost's 30, as recorded in
+  codemod.entity_specs); see monster_points()
+- souls are MONSTER_SOULS, floor(souls * 1.5) under a soul magnet
+
+Kills on the same frame are one SlashSystem.update() cycle: with 2 or more
+the cycle earns floor(cycle points * (getMultiKillBonus(kills) - 1)) on
+top, MULTI_KILL_BONUS capped at its largest key. A sliced villager costs
+VILLAGER_PENALTY and resets the combo unless a shield absorbs it; within a
+frame villagers count as sliced after the monsters. COMBO_MILESTONES only
+trigger effects, so they are reported but never scored. Slash-pattern
+bonuses (SLASH_PATTERN_BONUSES applied to slashSessionPoints when a trail
+is recognised as a pattern) are not modelled.
+
+All constants come from constants.ts. score_runs() is a handful of array
+operations over all runs at once; score_stream() is a frame-by-frame port of
+the TypeScript that the CLI checks it against on random streams.
+"""
+
+import argparse
+import dataclasses
+import math
+import sys
+import time
+
+import numpy as np
+
+from codemod.engine import REPO_ROOT
+from codemod.entity_specs import ENTITIES
+
+from .constants import load_constants
+from .spawnsim import DEFAULT_FPS, MONSTER_TYPES
+
+# SOUL_MAGNET multiplier in SlashSystem
+SOUL_MAGNET_MULTIPLIER = 1.5
+# FRENZY multiplier in SlashSystem
+FRENZY_MULTIPLIER = 2
+# criticalHitMultiplier in UpgradeManager.getPlayerStats()
+CRITICAL_MULTIPLIER = 2.0
+
+
+def combo_timeout_frames(timeout: float, delta: float) -> int:
+    """Frames after a kill on which ComboSystem.update() resets the combo:
+    it subtracts delta from a COMBO_TIMEOUT * 1000 ms timer every frame and
+    resets once the timer is <= 0, before SlashSystem runs. A kill fewer
+    frames later keeps the combo."""
+    timer = timeout * 1000
+    frames = 0
+    while timer > 0:
+        timer -= delta
+        frames += 1
+    return frames
+
+
+def monster_points(constants: dict) -> tuple[int, ...]:
+    """getPoints() per MONSTER_TYPES entry: the points a subclass
+    constructor assigns, else Monster's MONSTER_BASE_POINTS[type] || 10."""
+    overrides = {spec.monster_type.lower(): spec.points for spec in ENTITIES
+                 if spec.monster_type is not None and spec.points is not None}
+    return tuple(overrides.get(name) or constants['MONSTER_BASE_POINTS'].get(name) or 10 for name in MONSTER_TYPES)
+
+
+def frames_of(times_ms: np.ndarray, delta: float) -> np.ndarray:
+    """Frame of each timestamp (ms since the level started)."""
+    return np.floor_divide(times_ms, delta).astype(np.int64)
+
+
+@dataclasses.dataclass(frozen=True)
+class ScoreRules:
+    # Per MONSTER_TYPES entry
+    points: tuple[int, ...]
+    souls: tuple[int, ...]
+    combo_rate: float
+    # COMBO_TIMEOUT in seconds and as frames (combo_timeout_frames())
+    combo_timeout: float
+    combo_frames: int
+    villager_penalty: int
+    # getMultiKillBonus() indexed by kills in one cycle, capped at the last entry
+    multi_kill: tuple[float, ...]
+    milestones: tuple[int, ...]
+    # Frame length in ms
+    delta: float
+
+    @classmethod
+    def from_constants(cls, constants: dict, delta: float = 1000 / DEFAULT_FPS) -> 'ScoreRules':
+        bonus = {int(kills): value for kills, value in constants['MULTI_KILL_BONUS'].items()}
+        return cls(points=monster_points(constants),
+                   souls=tuple(constants['MONSTER_SOULS'][name] for name in MONSTER_TYPES),
+                   combo_rate=constants['COMBO_MULTIPLIER_RATE'],
+                   combo_timeout=constants['COMBO_TIMEOUT'],
+                   combo_frames=combo_timeout_frames(constants['COMBO_TIMEOUT'], delta),
+                   villager_penalty=constants['VILLAGER_PENALTY'],
+                   multi_kill=tuple(bonus.get(kills, 1.0) for kills in range(max(bonus) + 1)),
+                   milestones=tuple(constants['COMBO_MILESTONES']),
+                   delta=delta)
+
+    def multi_kill_bonus(self, kills):
+        """getMultiKillBonus() for a kill count or an array of them."""
+        return np.asarray(self.multi_kill)[np.minimum(kills, len(self.multi_kill) - 1)]
+
+
+@dataclasses.dataclass
+class Scores:
+    """Totals per run."""
+    score: np.ndarray
+    souls: np.ndarray
+    kills: np.ndarray
+    villagers: np.ndarray
+    max_combo: np.ndarray
+    # Multi-kill bonus points and cycles with 2 or more kills
+    multi_kill_score: np.ndarray
+    multi_kills: np.ndarray
+
+    def milestones(self, rules: ScoreRules) -> np.ndarray:
+        """Runs reaching each of rules.milestones, shape (runs, milestones):
+        the combo passes through every count up to max_combo."""
+        return self.max_combo[:, None] >= np.asarray(rules.milestones)
+
+
+def combo_before(kill_run: np.ndarray, kill_frame: np.ndarray, villager_run: np.ndarray,
+                 villager_frame: np.ndarray, combo_frames: int, breaks: np.ndarray | None = None) -> np.ndarray:
+    """The combo each kill starts from. A villager sliced on the frame of a
+    kill counts as after it: SlashSystem checks monsters first."""
+    count = len(kill_run)
+    index = np.arange(count)
+    reset = np.ones(count, bool)
+    if count > 1:
+        same_run = kill_run[1:] == kill_run[:-1]
+        span = int(max(kill_frame.max(), villager_frame.max(initial=0))) + 1
+        villagers = np.sort(villager_run.astype(np.int64) * span + villager_frame)
+        seen = np.searchsorted(villagers, kill_run.astype(np.int64) * span + kill_frame, side='left')
+        reset[1:] = ~same_run | (kill_frame[1:] - kill_frame[:-1] >= combo_frames) | (seen[1:] > seen[:-1])
+    if breaks is not None:
+        reset |= breaks
+    return index - np.maximum.accumulate(np.where(reset, index, 0))
+
+
+def score_runs(runs: int, kill_run: np.ndarray, kill_frame: np.ndarray, kill_type: np.ndarray,
+               villager_run: np.ndarray, villager_frame: np.ndarray, rules: ScoreRules,
+               breaks: np.ndarray | None = None, *, frenzy: np.ndarray | None = None,
+               critical: np.ndarray | None = None, soul_magnet: np.ndarray | None = None,
+               shielded: np.ndarray | None = None, score_multiplier: float = 1.0) -> Scores:
+    """Score runs kill streams; kills sorted by (run, frame), kill_type
+    indexes MONSTER_TYPES, breaks marks kills the player starts afresh.
+    frenzy, critical and soul_magnet flag kills, shielded flags villager
+    hits absorbed by a shield."""
+    if shielded is not None:
+        villager_run, villager_frame = villager_run[~shielded], villager_frame[~shielded]
+    combo = combo_before(kill_run, kill_frame, villager_run, villager_frame, rules.combo_frames, breaks)
+
+    multiplier = 1 + combo * rules.combo_rate
+    if frenzy is not None:
+        multiplier = np.where(frenzy, multiplier * FRENZY_MULTIPLIER, multiplier)
+    if score_multiplier != 1.0:
+        multiplier = multiplier * score_multiplier
+    if critical is not None:
+        multiplier = np.where(critical, multiplier * CRITICAL_MULTIPLIER, multiplier)
+    points = np.floor(np.asarray(rules.points)[kill_type] * multiplier).astype(np.int64)
+    souls = np.asarray(rules.souls)[kill_type]
+    if soul_magnet is not None:
+        souls = np.where(soul_magnet, np.floor(souls * SOUL_MAGNET_MULTIPLIER).astype(np.int64), souls)
+
+    # One SlashSystem.update() cycle per (run, frame) with kills
+    new_cycle = np.ones(len(kill_run), bool)
+    new_cycle[1:] = (kill_run[1:] != kill_run[:-1]) | (kill_frame[1:] != kill_frame[:-1])
+    cycle = np.cumsum(new_cycle) - 1
+    cycle_run = kill_run[new_cycle]
+    cycle_kills = np.bincount(cycle, minlength=len(cycle_run))
+    cycle_points = np.bincount(cycle, points, minlength=len(cycle_run)).astype(np.int64)
+    bonus = np.floor(cycle_points * (rules.multi_kill_bonus(cycle_kills) - 1.0)).astype(np.int64)
+    bonus = np.where(cycle_kills >= 2, np.maximum(bonus, 0), 0)
+
+    villagers = np.bincount(villager_run, minlength=runs)
+    max_combo = np.zeros(runs, np.int64)
+    np.maximum.at(max_combo, kill_run, combo + 1)
+    multi_kill_score = np.bincount(cycle_run, bonus, minlength=runs).astype(np.int64)
+    return Scores(
+        score=(np.bincount(kill_run, points, minlength=runs).astype(np.int64) + multi_kill_score
+               - rules.villager_penalty * villagers),
+        souls=np.bincount(kill_run, souls, minlength=runs).astype(np.int64),
+        kills=np.bincount(kill_run, minlength=runs),
+        villagers=villagers,
+        max_combo=max_combo,
+        multi_kill_score=multi_kill_score,
+        multi_kills=np.bincount(cycle_run, cycle_kills >= 2, minlength=runs).astype(np.int64),
+    )
+
+
+def score_stream(kills: list[tuple], villagers: list[tuple], rules: ScoreRules,
+                 score_multiplier: float = 1.0) -> dict:
+    """One run, frame by frame, as GameplayScene.update() drives
+    ComboSystem.update() and SlashSystem.update(). kills are
+    (frame, type, broken, frenzy, critical, soul_magnet) and villagers
+    (frame, shielded), both sorted by frame."""
+    score = souls = max_combo = combo = multi_kill_score = multi_kills = 0
+    multiplier = 1.0
+    timer = 0.0
+    last = max([kill[0] for kill in kills] + [villager[0] for villager in villagers], default=-1)
+    k = v = 0
+    for frame in range(last + 1):
+        # ComboSystem.update()
+        if combo > 0:
+            timer -= rules.delta
+            if timer <= 0:
+                combo, timer, multiplier = 0, 0.0, 1.0
+
+        # SlashSystem.update(): monsters, then villagers
+        kills_this_cycle = score_this_cycle = 0
+        while k < len(kills) and kills[k][0] == frame:
+            _, kind, broken, frenzy, critical, magnet = kills[k]
+            k += 1
+            if broken:
+                combo, timer, multiplier = 0, 0.0, 1.0
+            kills_this_cycle += 1
+            kill_multiplier = multiplier
+            combo += 1
+            timer = rules.combo_timeout * 1000
+            multiplier = 1 + combo * rules.combo_rate
+            max_combo = max(max_combo, combo)
+            if frenzy:
+                kill_multiplier *= FRENZY_MULTIPLIER
+            kill_multiplier *= score_multiplier
+            if critical:
+                kill_multiplier *= CRITICAL_MULTIPLIER
+            points = math.floor(rules.points[kind] * kill_multiplier)
+            score += points
+            score_this_cycle += points
+            souls += math.floor(rules.souls[kind] * SOUL_MAGNET_MULTIPLIER) if magnet else rules.souls[kind]
+        while v < len(villagers) and villagers[v][0] == frame:
+            if not villagers[v][1]:
+                score -= rules.villager_penalty
+                combo, timer, multiplier = 0, 0.0, 1.0
+            v += 1
+        if kills_this_cycle >= 2:
+            bonus = math.floor(score_this_cycle * (float(rules.multi_kill_bonus(kills_this_cycle)) - 1.0))
+            if bonus > 0:
+                score += bonus
+                multi_kill_score += bonus
+            multi_kills += 1
+    return {'score': score, 'souls': souls, 'kills': len(kills), 'max_combo': max_combo,
+            'multi_kill_score': multi_kill_score, 'multi_kills': multi_kills}
+
+
+def random_streams(rng: np.random.Generator, runs: int, kills: int, rules: ScoreRules, villagers: int = 0):
+    """Kill and villager events for runs runs, with gaps around the combo
+    timeout, frames shared by several kills and every flag set sometimes."""
+    span = kills * rules.combo_frames // 3
+    kill_run = np.repeat(np.arange(runs), kills)
+    kill_frame = np.sort(rng.integers(0, span, (runs, kills)), axis=1).ravel()
+    villager_run = np.repeat(np.arange(runs), villagers)
+    villager_frame = np.sort(rng.integers(0, span, (runs, villagers)), axis=1).ravel()
+    count = runs * kills
+    return {
+        'kill_run': kill_run, 'kill_frame': kill_frame,
+        'kill_type': rng.integers(0, len(MONSTER_TYPES), count),
+        'villager_run': villager_run, 'villager_frame': villager_frame,
+        'breaks': rng.random(count) < 0.02, 'frenzy': rng.random(count) < 0.1,
+        'critical': rng.random(count) < 0.1, 'soul_magnet': rng.random(count) < 0.1,
+        'shielded': rng.random(len(villager_run)) < 0.3,
+    }
+
+
+def check(streams: dict, runs: int, rules: ScoreRules, score_multiplier: float = 1.0) -> list[str]:
+    """Runs where score_runs() and score_stream() disagree, described."""
+    scores = score_runs(runs, streams['kill_run'], streams['kill_frame'], streams['kill_type'],
+                        streams['villager_run'], streams['villager_frame'], rules, streams['breaks'],
+                        frenzy=streams['frenzy'], critical=streams['critical'],
+                        soul_magnet=streams['soul_magnet'], shielded=streams['shielded'],
+                        score_multiplier=score_multiplier)
+    kill_bounds = np.searchsorted(streams['kill_run'], np.arange(runs + 1))
+    villager_bounds = np.searchsorted(streams['villager_run'], np.arange(runs + 1))
+    columns = [streams[name].tolist() for name in
+               ('kill_frame', 'kill_type', 'breaks', 'frenzy', 'critical', 'soul_magnet')]
+    kill_events = list(zip(*columns))
+    villager_events = list(zip(streams['villager_frame'].tolist(), streams['shielded'].tolist()))
+    mismatches = []
+    for run in range(runs):
+        expected = score_stream(kill_events[kill_bounds[run]:kill_bounds[run + 1]],
+                                villager_events[villager_bounds[run]:villager_bounds[run + 1]],
+                                rules, score_multiplier)
+        for name, value in expected.items():
+            actual = int(getattr(scores, name)[run])
+            if actual != value:
+                mismatches.append(f'run {run}: {name} {actual} != {value}')
+    return mismatches
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m balance.scoring',
+                                     description='Check the vectorized scoring against a frame-by-frame '
+                                                 'port of SlashSystem/ComboSystem and time it.')
+    parser.add_argument('--runs', type=int, default=100_000, help='runs timed (default: %(default)s)')
+    parser.add_argument('--kills', type=int, default=100, help='kills per run (default: %(default)s)')
+    parser.add_argument('--chunk', type=int, default=2000, help='runs scored per call (default: %(default)s)')
+    parser.add_argument('--villagers', type=int, default=5, help='villager hits per run (default: %(default)s)')
+    parser.add_argument('--check', type=int, default=2000, metavar='RUNS',
+                        help='runs compared with the reference first, 0 to skip (default: %(default)s)')
+    parser.add_argument('--score-multiplier', type=float, default=1.0,
+                        help="upgrades' scoreMultiplier (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if min(args.runs, args.kills, args.chunk) < 1 or args.villagers < 0 or args.check < 0:
+        print('--runs, --kills and --chunk must be at least 1', file=sys.stderr)
+        return 2
+    rules = ScoreRules.from_constants(load_constants(args.root))
+    rng = np.random.default_rng(args.seed)
+    if args.check > 0:
+        mismatches = check(random_streams(rng, args.check, args.kills, rules, args.villagers), args.check,
+                           rules, args.score_multiplier)
+        for line in mismatches[:20]:
+            print(line)
+        if mismatches:
+            print(f'{len(mismatches)} mismatches against the reference', file=sys.stderr)
+            return 1
+        print(f'{args.check} runs match the reference')
+
+    # Batches of --chunk runs: arrays that fit in cache are several times
+    # faster per element than one batch of every run
+    elapsed = 0.0
+    total = 0
+    for lo in range(0, args.runs, args.chunk):
+        runs = min(args.chunk, args.runs - lo)
+        streams = random_streams(rng, runs, args.kills, rules, args.villagers)
+        started = time.perf_counter()
+        scores = score_runs(runs, streams['kill_run'], streams['kill_frame'], streams['kill_type'],
+                            streams['villager_run'], streams['villager_frame'], rules, streams['breaks'],
+                            frenzy=streams['frenzy'], critical=streams['critical'],
+                            soul_magnet=streams['soul_magnet'], shielded=streams['shielded'],
+                            score_multiplier=args.score_multiplier)
+        elapsed += time.perf_counter() - started
+        total += int(scores.score.sum())
+    print(f'{args.runs} runs x {args.kills} kills in {elapsed * 1000:.1f} ms: '
+          f'{args.runs / elapsed:,.0f} runs/s, {args.runs * args.kills / elapsed:,.0f} kills/s, '
+          f'mean score {total / args.runs:.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+"""
+Headless level simulator: SpawnSystem for every level of src/data/levels.json,
+thousands of seeded runs at once as NumPy arrays.
+
+    python -m balance.spawnsim                       # all levels, 2000 runs each
+    python -m balance.spawnsim 1-1 4-3 --runs 10000 --seed 7
+    python -m balance.spawnsim --json spawns.json
+
+Per level it reports what was spawned (monsters by type, villagers,
+power-ups), how many entities are on screen at once, and how long each kind
+of entity stays in view.
+
+What is reproduced from src/systems/SpawnSystem.ts and the entities:
+
+- the spawn and power-up timers, frame by frame at --fps. The timers are the
+  same in every run, so the spawn frames are computed once per level; only
+  what spawns and where is drawn per run
+- updateDifficulty() runs every frame and sets spawnInterval to
+  2000 -> 500 ms over the first 60 s, replacing what setLevelConfig() derived
+  from the level's spawnRate; spawnRate therefore has no effect in the game
+  and none here. The report lists it next to the effective rate
+- spawnEntity(): villager with probability villagerChance, otherwise
+  weightedRandom() over monsterWeights
+- spawnMonster() / spawnVillager() / spawnPowerUp() positions, targets and
+  speeds, the ghost_realm pattern's four sides, VILLAGER_SPEED_MULTIPLIER and
+  calculateLaunchVelocity() under GRAVITY
+- motion: entities add GRAVITY to their vertical velocity every frame in
+  update() and the arcade world applies its own gravity (physics.arcade.gravity
+  in src/main.ts) on top, so they fall under both; --world-gravity 0 shows
+  the trajectories calculateLaunchVelocity() was written for. Positions follow
+  semi-implicit Euler steps and entities are destroyed once y > 800
+
+An entity is in view while its centre is inside the GAME_WIDTH x GAME_HEIGHT
+screen. Slicing, slow motion and the boss are not modelled: every entity
+lives until it falls off screen or the level's duration is over.
+
+Requires numpy.
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from codemod.engine import REPO_ROOT
+
+from .constants import load_constants
+from .data import load_levels, select_levels
+
+KINDS = ('zombie', 'vampire', 'ghost', 'villager', 'power_up')
+MONSTER_TYPES = KINDS[:3]
+VILLAGER = KINDS.index('villager')
+POWER_UP = KINDS.index('power_up')
+POWER_UP_TYPES = ('slow_motion', 'frenzy', 'shield', 'soul_magnet')
+
+DEFAULT_RUNS = 2000
+DEFAULT_FPS = 60
+# physics.arcade.gravity.y in src/main.ts
+WORLD_GRAVITY = 800
+GHOST_REALM = 'ghost_realm'
+
+# Spawn geometry from SpawnSystem.ts
+SPAWN_X = (100, 1180)
+SPAWN_Y = 750
+SIDE_Y = (100, 620)
+OFF_LEFT_X = -50
+OFF_RIGHT_X = 1330
+OFF_TOP_Y = -50
+TARGET_X = (200, 1080)
+TARGET_Y = (100, 400)
+SPEED = (200, 300)
+# Entities destroy themselves once y passes this
+DESPAWN_Y = 800
+
+# Upper bound on the (runs x frames) elements counted at once
+CHUNK_ELEMENTS = 1 << 22
+
+
+@dataclasses.dataclass(frozen=True)
+class Physics:
+    gravity: float
+    world_gravity: float
+    width: int
+    height: int
+    villager_speed: float
+    power_up_interval: float
+    # Frame length in ms
+    delta: float
+
+    @classmethod
+    def from_constants(cls, constants: dict, fps: int = DEFAULT_FPS,
+                       world_gravity: float = WORLD_GRAVITY) -> 'Physics':
+        return cls(gravity=constants['GRAVITY'], world_gravity=world_gravity,
+                   width=constants['GAME_WIDTH'], height=constants['GAME_HEIGHT'],
+                   villager_speed=constants['VILLAGER_SPEED_MULTIPLIER'],
+                   power_up_interval=constants['POWERUP_BASE_SPAWN_INTERVAL'], delta=1000 / fps)
+
+
+@dataclasses.dataclass
+class LevelBatch:
+    """runs simulated instances of one level. Entities are indexed by spawn
+    order: the SpawnSystem.spawnEntity() spawns first, then the power-ups."""
+    level: dict
+    physics: Physics
+    frames: int
+    # Frame of each entity's spawn, the same in every run, shape (entities,)
+    spawn_frame: np.ndarray
+    # KINDS index per run and entity, shape (runs, entities)
+    kind: np.ndarray
+    # POWER_UP_TYPES index per run and power-up, shape (runs, power-ups)
+    power_up_type: np.ndarray
+    # Frames with the entity in view and the first of them (-1: never)
+    frames_in_view: np.ndarray
+    first_seen: np.ndarray
+    # The in-view frames as two inclusive (first, last) spans after spawn,
+    # shape (2, 2, runs, entities); empty spans are (0, -1)
+    view_spans: np.ndarray
+    # Entities in view per run and frame, shape (runs, frames); None when
+    # simulated without concurrency
+    on_screen: np.ndarray | None
+    monsters_on_screen: np.ndarray | None
+
+    @property
+    def runs(self) -> int:
+        return self.kind.shape[0]
+
+    @property
+    def dt(self) -> float:
+        return self.physics.delta / 1000
+
+
+def spawn_schedule(duration: float, power_up_interval: float, delta: float) -> tuple[list[int], list[int]]:
+    """Frames on which SpawnSystem.update() calls spawnEntity() and
+    spawnPowerUp() during duration seconds; the interval is in seconds."""
+    entities, power_ups = [], []
+    elapsed = spawn_timer = power_up_timer = 0.0
+    power_up_ms = power_up_interval * 1000
+    for frame in range(math.ceil(duration * 1000 / delta)):
+        elapsed += delta
+        spawn_interval = 2000 - min(elapsed / 60000, 1) * 1500
+        spawn_timer += delta
+        if spawn_timer >= spawn_interval:
+            entities.append(frame)
+            spawn_timer = 0.0
+        power_up_timer += delta
+        if power_up_timer >= power_up_ms:
+            power_ups.append(frame)
+            power_up_timer = 0.0
+    return entities, power_ups
+
+
+def launch_velocity(sx, sy, tx, ty, gravity: float) -> tuple[np.ndarray, np.ndarray]:
+    """calculateLaunchVelocity() from src/utils/helpers.ts, elementwise."""
+    height = sy - ty
+    rising = height > 0
+    vy = np.where(rising, -np.sqrt(2 * gravity * np.maximum(height, 0)), -math.sqrt(gravity * 100))
+    t_peak = np.where(rising, -vy / gravity, 1.0)
+    vx = np.where(rising, (tx - sx) / t_peak, 0.0)
+    return vx, vy
+
+
+def _launch(rng: np.random.Generator, shape: tuple, sx, sy, gravity: float, speed_factor=1.0):
+    tx = rng.integers(TARGET_X[0], TARGET_X[1] + 1, shape)
+    ty = rng.integers(TARGET_Y[0], TARGET_Y[1] + 1, shape)
+    speed = rng.uniform(*SPEED, shape) * speed_factor
+    vx, vy = launch_velocity(sx, sy, tx, ty, gravity)
+    return vx * (speed / 200), vy * (speed / 200)
+
+
+def _spawn_entities(level: dict, physics: Physics, rng: np.random.Generator, shape: tuple):
+    """spawnEntity() for every (run, spawn): kind, position, velocity."""
+    villager = rng.random(shape) < level['villagerChance']
+    weights = np.cumsum([level['monsterWeights'].get(name, 0) for name in MONSTER_TYPES])
+    # weightedRandom() returns the first type whose running weight reaches r
+    pick = np.searchsorted(weights, rng.random(shape) * weights[-1], side='left')
+    kind = np.where(villager, VILLAGER, np.minimum(pick, len(MONSTER_TYPES) - 1)).astype(np.int8)
+
+    sx = rng.integers(SPAWN_X[0], SPAWN_X[1] + 1, shape).astype(float)
+    sy = np.full(shape, float(SPAWN_Y))
+    if level.get('spawnPattern') == GHOST_REALM:
+        side = np.where(villager, 0, rng.integers(0, 4, shape))
+        side_y = rng.integers(SIDE_Y[0], SIDE_Y[1] + 1, shape)
+        sy = np.select([side == 1, side >= 2], [OFF_TOP_Y, side_y], sy)
+        sx = np.select([side == 2, side == 3], [OFF_LEFT_X, OFF_RIGHT_X], sx)
+
+    vx, vy = _launch(rng, shape, sx, sy, physics.gravity, np.where(villager, physics.villager_speed, 1.0))
+    return kind, sx, sy, vx, vy
+
+
+def _spawn_power_ups(physics: Physics, rng: np.random.Generator, shape: tuple):
+    sx = rng.integers(SPAWN_X[0], SPAWN_X[1] + 1, shape).astype(float)
+    sy = np.full(shape, float(SPAWN_Y))
+    vx, vy = _launch(rng, shape, sx, sy, physics.gravity)
+    return rng.integers(0, len(POWER_UP_TYPES), shape).astype(np.int8), sx, sy, vx, vy
+
+
+def _roots(a: float, b, c):
+    """Real roots r1 <= r2 of a*k^2 + b*k + c (a > 0), nan where there are
+    none."""
+    disc = b * b - 4 * a * c
+    with np.errstate(invalid='ignore'):
+        root = np.sqrt(disc)
+    return (-b - root) / (2 * a), (-b + root) / (2 * a)
+
+
+def _frame(value, rounding) -> np.ndarray:
+    """Round a frame bound; nan and infinities become far out of range."""
+    return rounding(np.nan_to_num(value, nan=_FAR, posinf=_FAR, neginf=-_FAR)).clip(-_FAR, _FAR).astype(np.int64)
+
+
+# Out-of-range frame index for empty intervals
+_FAR = 1 << 40
+
+
+def _visible_spans(sx, sy, vx, vy, alive: np.ndarray, physics: Physics):
+    """Frames after spawn (0 = spawn frame) with the entity in view, as up to
+    two inclusive spans (first, last); empty spans have last < first.
+
+    After k frames of semi-implicit Euler y = sy + B*k + A*k^2 and
+    x = sx + C*k, so every bound is a root of a quadratic or linear
+    equation: in view needs y <= height (one interval, y is convex), x inside
+    the screen (one interval) and y >= 0, which excludes the frames above
+    the top edge and can split the rest in two."""
+    dt = physics.delta / 1000
+    a = (physics.gravity + physics.world_gravity) * dt * dt / 2
+    if a <= 0:
+        raise ValueError('entities never fall off screen without gravity')
+    b = vy * dt + a
+    c = vx * dt
+
+    below_lo, below_hi = _roots(a, b, sy - physics.height)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left, right = -sx / c, (physics.width - sx) / c
+    inside = (sx >= 0) & (sx <= physics.width)
+    x_lo = np.where(c == 0, np.where(inside, 0, _FAR), np.minimum(left, right))
+    x_hi = np.where(c == 0, np.where(inside, _FAR, -_FAR), np.maximum(left, right))
+    first = np.maximum(_frame(np.maximum(below_lo, x_lo), np.ceil), 0)
+    last = np.minimum(_frame(np.minimum(below_hi, x_hi), np.floor), alive - 1)
+
+    above_lo, above_hi = _roots(a, b, sy)
+    hole_lo = _frame(np.floor(above_lo) + 1, np.floor)
+    hole_hi = _frame(np.ceil(above_hi) - 1, np.floor)
+    return (first, np.minimum(last, hole_lo - 1)), (np.maximum(first, hole_hi + 1), last)
+
+
+def simulate_level(level: dict, runs: int, rng: np.random.Generator, physics: Physics,
+                   concurrency: bool = True) -> LevelBatch:
+    """Simulate runs instances of level; concurrency=False skips the
+    per-frame on-screen counts, the only part that grows with duration."""
+    interval = level.get('powerUpInterval') or physics.power_up_interval
+    entity_frames, power_up_frames = spawn_schedule(level['duration'], interval, physics.delta)
+    frames = math.ceil(level['duration'] * 1000 / physics.delta)
+
+    kind, sx, sy, vx, vy = _spawn_entities(level, physics, rng, (runs, len(entity_frames)))
+    power_up_type, px, py, pvx, pvy = _spawn_power_ups(physics, rng, (runs, len(power_up_frames)))
+    kind = np.concatenate([kind, np.full(power_up_type.shape, POWER_UP, np.int8)], axis=1)
+    sx, sy = np.concatenate([sx, px], axis=1), np.concatenate([sy, py], axis=1)
+    vx, vy = np.concatenate([vx, pvx], axis=1), np.concatenate([vy, pvy], axis=1)
+    spawn_frame = np.array(entity_frames + power_up_frames, dtype=np.int64)
+
+    # Destroyed on the first frame with y > DESPAWN_Y, or cut off by the level's end
+    a = (physics.gravity + physics.world_gravity) * (physics.delta / 1000) ** 2 / 2
+    _, falls = _roots(a, vy * physics.delta / 1000 + a, sy - DESPAWN_Y)
+    alive = np.minimum(_frame(falls, np.floor) + 1, frames - spawn_frame)
+    spans = _visible_spans(sx, sy, vx, vy, alive, physics)
+
+    counts = [np.maximum(last - first + 1, 0) for first, last in spans]
+    frames_in_view = (counts[0] + counts[1]).astype(np.int16)
+    first_seen = np.where(counts[0] > 0, spans[0][0], np.where(counts[1] > 0, spans[1][0], -1)).astype(np.int16)
+    view_spans = np.array([(np.where(count > 0, first, 0), np.where(count > 0, last, -1))
+                           for (first, last), count in zip(spans, counts)], dtype=np.int16)
+
+    if not concurrency:
+        return LevelBatch(level=level, physics=physics, frames=frames, spawn_frame=spawn_frame, kind=kind,
+                          power_up_type=power_up_type, frames_in_view=frames_in_view, first_seen=first_seen,
+                          view_spans=view_spans, on_screen=None, monsters_on_screen=None)
+
+    on_screen = np.zeros((runs, frames), np.uint8)
+    monsters_on_screen = np.zeros((runs, frames), np.uint8)
+    chunk = max(1, CHUNK_ELEMENTS // (frames + 1))
+    for lo in range(0, runs, chunk):
+        hi = min(runs, lo + chunk)
+        rows = np.arange(hi - lo)[:, None] * (frames + 1)
+        for target, mask in ((on_screen, None), (monsters_on_screen, kind[lo:hi] < VILLAGER)):
+            # Entities in view per frame as the running sum of +1 at each
+            # span's first frame and -1 after its last
+            diff = np.zeros((hi - lo) * (frames + 1), np.int32)
+            for (first, last), count in zip(spans, counts):
+                keep = count[lo:hi] > 0 if mask is None else (count[lo:hi] > 0) & mask
+                starts = rows + spawn_frame + first[lo:hi]
+                diff += np.bincount(starts[keep], minlength=diff.size)
+                diff -= np.bincount((starts + count[lo:hi])[keep], minlength=diff.size)
+            target[lo:hi] = diff.reshape(hi - lo, frames + 1).cumsum(axis=1, dtype=np.int32)[:, :frames]
+
+    return LevelBatch(level=level, physics=physics, frames=frames, spawn_frame=spawn_frame, kind=kind,
+                      power_up_type=power_up_type, frames_in_view=frames_in_view, first_seen=first_seen,
+                      view_spans=view_spans, on_screen=on_screen, monsters_on_screen=monsters_on_screen)
+
+
+def level_rng(seed: int, index: int) -> np.random.Generator:
+    """The generator for the level at index in levels.json, so a level's
+    results do not depend on which other levels are simulated."""
+    return np.random.default_rng([seed, index])
+
+
+def _spread(values: np.ndarray) -> dict:
+    if not values.size:
+        return {'mean': 0.0, 'p5': 0.0, 'p95': 0.0, 'max': 0.0}
+    p5, p95 = np.percentile(values, [5, 95])
+    return {'mean': round(float(values.mean()), 3), 'p5': round(float(p5), 3),
+            'p95': round(float(p95), 3), 'max': round(float(values.max()), 3)}
+
+
+def summarize(batch: LevelBatch) -> dict:
+    """Per-level report: spawn counts per run, seconds in view per entity and
+    entities in view per frame."""
+    level = batch.level
+    per_run = {name: (batch.kind == i).sum(axis=1) for i, name in enumerate(KINDS)}
+    in_view = {}
+    for i, name in enumerate(KINDS):
+        mask = batch.kind == i
+        if not mask.any():
+            continue
+        seen = mask & (batch.first_seen >= 0)
+        in_view[name] = {'seconds': _spread(batch.frames_in_view[seen] * batch.dt),
+                         'never_visible': round(float(1 - seen.sum() / mask.sum()), 4)}
+    spawns = int((batch.kind[0] != POWER_UP).sum())
+    return {
+        'id': level['id'],
+        'name': level.get('name', ''),
+        'duration': level['duration'],
+        'runs': batch.runs,
+        'spawn_rate': level.get('spawnRate'),
+        'effective_spawn_rate': round(spawns / level['duration'], 3),
+        'spawned': {name: _spread(counts) for name, counts in per_run.items()},
+        'power_ups': {name: round(float((batch.power_up_type == i).sum() / batch.runs), 3)
+                      for i, name in enumerate(POWER_UP_TYPES)},
+        'time_in_view': in_view,
+        'on_screen': {'all': _spread(batch.on_screen), 'monsters': _spread(batch.monsters_on_screen)},
+    }
+
+
+def simulate(levels: list[dict], runs: int = DEFAULT_RUNS, seed: int = 0, physics: Physics | None = None,
+             root: Path | str = REPO_ROOT, on_level=None) -> list[dict]:
+    """Simulate and summarize levels; on_level(summary) is called as each
+    level finishes."""
+    physics = physics or Physics.from_constants(load_constants(root))
+    order = {level['id']: i for i, level in enumerate(load_levels(root))}
+    summaries = []
+    for level in levels:
+        summary = summarize(simulate_level(level, runs, level_rng(seed, order.get(level['id'], 0)), physics))
+        summaries.append(summary)
+        if on_level:
+            on_level(summary)
+    return summaries
+
+
+def _format_row(summary: dict) -> str:
+    spawned, in_view = summary['spawned'], summary['time_in_view']
+    monsters = sum(spawned[name]['mean'] for name in MONSTER_TYPES)
+    hidden = [in_view[name]['never_visible'] for name in MONSTER_TYPES if name in in_view]
+    view = [in_view[name]['seconds']['mean'] for name in MONSTER_TYPES if name in in_view]
+    on_screen = summary['on_screen']['all']
+    return (f'{summary["id"]:<6} {summary["spawn_rate"] or 0:>6.2f} {summary["effective_spawn_rate"]:>6.2f} '
+            f'{monsters:>8.1f} {spawned["villager"]["mean"]:>6.1f} {spawned["power_up"]["mean"]:>5.1f} '
+            f'{max(hidden, default=0) * 100:>7.1f}% {sum(view) / max(1, len(view)):>7.2f} '
+            f'{on_screen["mean"]:>6.2f} {on_screen["p95"]:>5.0f} {on_screen["max"]:>4.0f}')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m balance.spawnsim',
+                                     description='Simulate SpawnSystem over the campaign levels.')
+    parser.add_argument('levels', nargs='*', metavar='LEVEL', help='level ids (default: all)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='runs per level (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS, help='frames per second (default: %(default)s)')
+    parser.add_argument('--world-gravity', type=float, default=WORLD_GRAVITY,
+                        help='arcade world gravity added to GRAVITY (default: %(default)s)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='write the per-level summaries as JSON')
+    args = parser.parse_args(argv)
+
+    if args.runs < 1 or args.fps < 1:
+        print('--runs and --fps must be at least 1', file=sys.stderr)
+        return 2
+    try:
+        levels = select_levels(load_levels(args.root), args.levels)
+    except KeyError as exc:
+        print(f'Unknown level: {exc.args[0]}', file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    physics = Physics.from_constants(load_constants(args.root), args.fps, args.world_gravity)
+    print(f'{"level":<6} {"rate":>6} {"eff.":>6} {"monsters":>8} {"vill.":>6} {"pwr":>5} '
+          f'{"unseen":>8} {"view s":>7} {"screen":>6} {"p95":>5} {"max":>4}')
+    summaries = simulate(levels, args.runs, args.seed, physics, args.root,
+                         on_level=lambda summary: print(_format_row(summary), flush=True))
+    print(f'{len(levels)} levels x {args.runs} runs in {time.perf_counter() - started:.2f} s')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'runs': args.runs, 'physics': dataclasses.asdict(physics),
+                       'levels': summaries}, f, indent=2)
+            f.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
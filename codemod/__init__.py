@@ -0,0 +1,16 @@
+"""
+Codemod engine for the TypeScript sources under src/.
+
+Replaces the one-off fix_*.py scripts: every script is now a rule module in
+codemod/rules/, and a single run reads each affected file once, applies all
+matching rules in one pass and spreads the work over a process pool.
+
+    python -m codemod                 # run every rule
+    python -m codemod --rule console_logs --rule villager
+    python -m codemod --list
+"""
+
+from .engine import RunReport, run
+from .rule import Rule
+
+__all__ = ['Rule', 'RunReport', 'run']
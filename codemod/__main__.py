@@ -0,0 +1,5 @@
+import sys
+
+from .cli import main, run_cli
+
+sys.exit(run_cli(main))
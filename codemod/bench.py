@@ -0,0 +1,209 @@
+"""
+Rule benchmark: time every codemod rule over a synthetic corpus built by
+replicating src/ 1x to 50x, and report files/s, MB/s and peak RSS per rule.
+
+    python -m codemod.bench                          # scales 1 5 10 25 50
+    python -m codemod.bench --scale 1 --scale 10 --rule eslint_issues
+    python -m codemod.bench --json bench.json --compare previous.json
+
+Replica k of src/foo/Bar.ts is written to <tmp>/r<k>/src/foo/Bar.ts and handed
+to the rules under its original path, so targeted rules (the ObjectPool
+Phaser import, duplicate cases, structural patches) see one copy of their file
+per replica. --all-files feeds every file to every rule instead, to measure what a
+rule costs on code it was not written for; files a rule raises on are counted
+as errors, not timed.
+
+Each (scale, rule) measurement runs in a fresh spawned process that reads the
+corpus one file at a time, so only the file being processed is held in memory.
+baseline_rss_kb is that process before the first file is read, peak_rss_kb its
+peak and rss_growth_kb the difference: what the rule itself needs, plus one
+file. Only Rule.apply_with_notes is timed, best of --repeat passes.
+
+--compare prints the files/s ratio of this run against an earlier --json file,
+per rule and scale.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .cli import run_cli
+from .engine import REPO_ROOT, SOURCE_EXTENSIONS, SRC_DIR
+from .reader import peak_rss_kb
+from .rules import select_rules
+
+DEFAULT_SCALES = (1, 5, 10, 25, 50)
+# Bump when the JSON layout changes
+RESULTS_VERSION = 2
+
+
+def build_corpus(root: Path, directory: Path, scale: int) -> list[tuple[str, str]]:
+    """Write scale replicas of root's src/ under directory; return
+    (file on disk, original repo-relative path) pairs."""
+    src = root / SRC_DIR
+    originals = sorted(Path(dirpath, filename).relative_to(root).as_posix()
+                       for dirpath, _, filenames in os.walk(src)
+                       for filename in filenames if filename.endswith(SOURCE_EXTENSIONS))
+    files = []
+    for k in range(scale):
+        replica = directory / f'r{k}'
+        if not replica.exists():
+            shutil.copytree(src, replica / SRC_DIR)
+        files.extend((str(replica / rel), rel) for rel in originals)
+    return files
+
+
+def _measure(rule_name: str, files: list[tuple[str, str]], all_files: bool, repeat: int) -> dict:
+    """Runs in a fresh process: time one rule over the corpus."""
+    rule = select_rules([rule_name])[0]
+    baseline = peak_rss_kb()
+    selected = [(disk_path, path) for disk_path, path in files if all_files or rule.matches(path)]
+
+    best = None
+    changed = errors = 0
+    size = 0
+    for _ in range(repeat):
+        elapsed = 0.0
+        changed = errors = 0
+        size = 0
+        # One file in memory at a time, so the peak is the rule's, not the corpus's
+        for disk_path, path in selected:
+            with open(disk_path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            start = time.perf_counter()
+            try:
+                new, _ = rule.apply_with_notes(path, source)
+            except Exception:
+                errors += 1
+                continue
+            elapsed += time.perf_counter() - start
+            size += len(source.encode('utf-8'))
+            changed += new != source
+        best = elapsed if best is None else min(best, elapsed)
+
+    timed = len(selected) - errors
+    peak = peak_rss_kb()
+    return {
+        'rule': rule.name,
+        'version': rule.version,
+        'files': timed,
+        'changed': changed,
+        'errors': errors,
+        'bytes': size,
+        'seconds': best,
+        'files_per_sec': timed / best if best else None,
+        'mb_per_sec': size / best / 1e6 if best else None,
+        'baseline_rss_kb': baseline,
+        'peak_rss_kb': peak,
+        'rss_growth_kb': peak - baseline if peak is not None else None,
+    }
+
+
+def benchmark(rule_names: list[str] | None = None, scales=DEFAULT_SCALES, root: Path | str = REPO_ROOT,
+              all_files: bool = False, repeat: int = 3, on_result=None) -> dict:
+    """Benchmark the selected rules at each scale; return the JSON document."""
+    root = Path(root)
+    rules = select_rules(rule_names)
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(prefix='codemod-bench-') as tmp:
+        for scale in sorted(set(scales)):
+            # Replicas are added incrementally, so the 50x corpus reuses the 25x one
+            files = build_corpus(root, Path(tmp), scale)
+            for rule in rules:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(_measure, rule.name, files, all_files, repeat).result()
+                result['scale'] = scale
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'all_files': all_files,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def _mib(kb: int | None) -> str:
+    return f'{kb / 1024:.1f}' if kb is not None else '-'
+
+
+def _format_row(result: dict) -> str:
+    if not result['files']:
+        return f'{result["scale"]:>5}x  {result["rule"]:<34} {"no matching files":>44}'
+    return (f'{result["scale"]:>5}x  {result["rule"]:<34} {result["files"]:>6} '
+            f'{result["files_per_sec"]:>11.0f} {result["mb_per_sec"]:>9.2f} '
+            f'{_mib(result["rss_growth_kb"]):>9} {result["errors"]:>6}')
+
+
+def compare(old: dict, new: dict) -> list[str]:
+    """files/s ratio new/old per (rule, scale) present in both documents."""
+    before = {(r['rule'], r['scale']): r for r in old.get('results', [])}
+    lines = []
+    for result in new['results']:
+        previous = before.get((result['rule'], result['scale']))
+        if not previous or not previous.get('files_per_sec') or not result['files_per_sec']:
+            continue
+        ratio = result['files_per_sec'] / previous['files_per_sec']
+        flag = '  slower' if ratio < 0.9 else ''
+        versions = '' if previous.get('version') == result['version'] else \
+            f'  (v{previous.get("version")} -> v{result["version"]})'
+        lines.append(f'{result["scale"]:>5}x  {result["rule"]:<34} {ratio:>6.2f}x{flag}{versions}')
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.bench',
+                                     description='Benchmark codemod rules over a replicated src/ tree.')
+    parser.add_argument('--rule', '-r', action='append', metavar='NAME',
+                        help='rule or group to benchmark (repeatable, default: all)')
+    parser.add_argument('--scale', '-s', action='append', type=int, metavar='N',
+                        help=f'corpus size as a multiple of src/ (repeatable, default: '
+                             f'{" ".join(map(str, DEFAULT_SCALES))})')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--all-files', action='store_true', help="feed every file to every rule, ignoring targets")
+    parser.add_argument('--repeat', type=int, default=3, help='timed passes per measurement, best kept '
+                                                              '(default: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='compare files/s against an earlier --json file')
+    args = parser.parse_args(argv)
+
+    try:
+        select_rules(args.rule)
+    except KeyError as exc:
+        print(f'Unknown rule: {exc.args[0]}', file=sys.stderr)
+        return 2
+    if any(scale < 1 for scale in args.scale or ()):
+        print('--scale must be at least 1', file=sys.stderr)
+        return 2
+
+    print(f'{"scale":>6}  {"rule":<34} {"files":>6} {"files/s":>11} {"MB/s":>9} {"+RSS MiB":>9} {"errors":>6}')
+    document = benchmark(args.rule, args.scale or DEFAULT_SCALES, args.root, args.all_files,
+                         max(1, args.repeat), on_result=lambda result: print(_format_row(result), flush=True))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+            f.write('\n')
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        print(f'\nfiles/s relative to {args.compare}:')
+        for line in compare(old, document):
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
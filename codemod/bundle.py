@@ -0,0 +1,149 @@
+"""
+Per-scene bundle-weight estimate for src/main.ts.
+
+Every scene is imported statically by main.ts, so all of them end up in the
+initial chunk. For each scene this reports what it costs that chunk:
+
+- closure:   minified bytes of everything the scene statically pulls in
+- exclusive: bytes that would leave the initial chunk if the scene were
+             loaded with import() instead (modules no other eager path reaches)
+- shared:    the rest of its closure, which stays in the initial chunk anyway
+
+Scenes are ranked by exclusive bytes as import() splitting candidates; the
+scenes Phaser starts first (--eager) are never candidates.
+
+    python -m codemod.bundle
+    python -m codemod.bundle --eager src/scenes/GameplayScene.ts --json
+
+Minified size is estimated from the token stream: comments and whitespace
+dropped, `import type` declarations removed. Type annotations are still
+counted, so absolute numbers are upper bounds; the ranking is what matters.
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .cli import run_cli
+from .engine import REPO_ROOT
+from .graph import ENTRY_POINT, SCENES_DIR, ModuleGraph, load_graph
+from .imports import parse_imports
+from .tokenizer import IDENT, NUMBER, tokenize
+
+# Started before the player can choose anything: Boot -> Preloader -> MainMenu
+EAGER_SCENES = ('src/scenes/BootScene.ts', 'src/scenes/PreloaderScene.ts', 'src/scenes/MainMenuScene.ts')
+_WORD = (IDENT, NUMBER)
+
+
+def minified_size(source: str) -> int:
+    """Estimated byte size of source after minification."""
+    tokens = list(tokenize(source))
+    skip = set()
+    for decl in parse_imports(source, tokens):
+        if decl.type_only:
+            skip.update(range(decl.first, decl.last + 1))
+    size = 0
+    prev = None
+    for i, tok in enumerate(tokens):
+        if i in skip:
+            continue
+        # Two adjacent words need a space between them
+        if prev is not None and prev.kind in _WORD and tok.kind in _WORD:
+            size += 1
+        size += len(tok.text.encode('utf-8'))
+        prev = tok
+    return size
+
+
+@dataclass
+class SceneWeight:
+    path: str
+    # Modules / estimated minified bytes in the scene's static closure
+    modules: int
+    closure: int
+    # Bytes only this scene brings into the initial chunk
+    exclusive: int
+    exclusive_modules: int
+    shared: int
+    eager: bool
+
+
+def module_sizes(root: Path, paths) -> dict[str, int]:
+    sizes = {}
+    for path in paths:
+        full = root / path
+        if path.endswith(('.ts', '.tsx')):
+            with open(full, 'r', encoding='utf-8') as f:
+                sizes[path] = minified_size(f.read())
+        else:
+            # JSON and other data imports are inlined roughly as-is
+            sizes[path] = os.path.getsize(full)
+    return sizes
+
+
+def scene_weights(graph: ModuleGraph, sizes: dict[str, int], entry: str = ENTRY_POINT,
+                  eager=EAGER_SCENES) -> list[SceneWeight]:
+    """Weights of every scene entry imports statically, largest exclusive first."""
+    initial = graph.closure(entry)
+    weights = []
+    for scene in graph.dependencies(entry):
+        if not scene.startswith(SCENES_DIR):
+            continue
+        closure = graph.closure(scene)
+        # What the entry still reaches without this scene
+        remaining = graph.closure(entry, exclude=(scene,))
+        exclusive = initial - remaining
+        closure_bytes = sum(sizes[path] for path in closure)
+        exclusive_bytes = sum(sizes[path] for path in exclusive)
+        weights.append(SceneWeight(scene, len(closure), closure_bytes, exclusive_bytes, len(exclusive),
+                                   closure_bytes - exclusive_bytes, scene in eager))
+    return sorted(weights, key=lambda w: (w.eager, -w.exclusive, w.path))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.bundle',
+                                     description='Estimate what each scene adds to the initial JS chunk.')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--eager', action='append', metavar='PATH',
+                        help='scene that must stay in the initial chunk (repeatable; default: '
+                             + ', '.join(EAGER_SCENES) + ')')
+    parser.add_argument('--json', action='store_true', help='print the estimate as JSON')
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    graph = load_graph(root)
+    if ENTRY_POINT not in graph.edges:
+        print(f'{ENTRY_POINT} not found under {root}', file=sys.stderr)
+        return 1
+    initial = graph.closure(ENTRY_POINT)
+    sizes = module_sizes(root, initial)
+    weights = scene_weights(graph, sizes, eager=tuple(args.eager or EAGER_SCENES))
+    total = sum(sizes.values())
+
+    if args.json:
+        json.dump({'entry': ENTRY_POINT, 'modules': len(initial), 'bytes': total,
+                   'scenes': [asdict(w) for w in weights]}, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f'Initial chunk ({ENTRY_POINT} static closure): {len(initial)} modules, '
+          f'~{total / 1024:.1f} KiB minified (excluding packages)')
+    print(f'\n  {"closure":>9}  {"exclusive":>9}  {"shared":>9}  {"modules":>7}  scene')
+    for w in weights:
+        flag = '  (eager)' if w.eager else ''
+        print(f'  {w.closure / 1024:>7.1f}K  {w.exclusive / 1024:>7.1f}K  {w.shared / 1024:>7.1f}K  '
+              f'{w.exclusive_modules:>3}/{w.modules:<3}  {w.path}{flag}')
+
+    candidates = [w for w in weights if not w.eager and w.exclusive]
+    if candidates:
+        print('\nimport() candidates (initial chunk saving):')
+        for w in candidates:
+            print(f'  {w.exclusive / 1024:>6.1f}K  {100 * w.exclusive / total:>4.1f}%  {w.path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
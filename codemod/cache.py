@@ -0,0 +1,72 @@
+"""
+Persistent content-hash cache for codemod runs.
+
+An entry records that running a given rule set over a file whose content hashes
+to a given SHA-256 produced no change. On the next run such a file is only
+read and hashed: no rule runs and nothing is written, so mtimes (and the
+Vite/tsc caches keyed on them) stay untouched.
+
+Only verified fixed points are cached. A file that was just rewritten is
+re-checked once on the following run before it gets an entry.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_FILENAME = '.codemod-cache'
+# Bump when the cache layout or engine semantics change
+CACHE_VERSION = 1
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def rules_signature(rules: list, path: str) -> str:
+    """Hash of name@version of every rule that applies to path."""
+    parts = sorted(f'{rule.name}@{rule.version}' for rule in rules if rule.matches(path))
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class ContentCache:
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.entries: dict[str, list[str]] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.entries = data.get('files', {})
+
+    def lookup(self, path: str, signature: str) -> str | None:
+        """Return the cached content digest for path under this rule set."""
+        entry = self.entries.get(path)
+        if entry and entry[1] == signature:
+            return entry[0]
+        return None
+
+    def record(self, path: str, digest: str, signature: str) -> None:
+        if self.entries.get(path) != [digest, signature]:
+            self.entries[path] = [digest, signature]
+            self.dirty = True
+
+    def forget(self, path: str) -> None:
+        if self.entries.pop(path, None) is not None:
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.entries}, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
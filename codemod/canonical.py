@@ -0,0 +1,210 @@
+"""
+Import canonicalizer for src/.
+
+Resolves every static import specifier through the tsconfig.json aliases
+(resolver.py) and rewrites the tree to one style in one parallel pass:
+
+- specifiers are respelled by Resolver.specifier_for(): with --style alias
+  (the default) through the most specific alias, files in the importer's own
+  directory as './Name'; with --style relative always relative
+- imports of the same file are merged, value and `import type` declarations
+  separately; namespace and side-effect imports are left as they are
+- named specifiers are sorted by imported name
+
+    python -m codemod.canonical --dry-run
+    python -m codemod.canonical --style relative
+
+Each worker builds one Resolver over the file list walked by the parent, so
+resolution never touches the filesystem and each (directory, specifier) pair
+is resolved once per worker. Files whose content hash and settings match a
+previous no-change run are skipped, in .codemod-canonical. Writes go through
+one Transaction.
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .cache import ContentCache, content_digest
+from .cli import run_cli
+from .engine import MIN_FILES_FOR_POOL, REPO_ROOT, SOURCE_EXTENSIONS, SRC_DIR, unified_diff
+from .imports import ImportDeclaration, line_span, parse_imports, render_declaration
+from .resolver import STYLES, Resolver
+from .tokenizer import line_of, tokenize
+from .transaction import Transaction, TransactionError
+
+CACHE_FILENAME = '.codemod-canonical'
+# Bump when canonicalize() changes behaviour
+CANONICAL_VERSION = 2
+
+
+def _sort_key(spec) -> tuple[str, str]:
+    return spec.imported.lower(), spec.imported
+
+
+def canonicalize(source: str, path: str, resolver: Resolver, style: str = 'alias') -> tuple[str, list[str]]:
+    """Rewrite the imports of one file; return (source, notes)."""
+    tokens = list(tokenize(source))
+    declarations = parse_imports(source, tokens)
+    if not declarations:
+        return source, []
+
+    notes = []
+    specifiers = {}
+    groups: dict[tuple[str, bool], list[ImportDeclaration]] = {}
+    for decl in declarations:
+        target = resolver.resolve(decl.module, path)
+        spec = decl.module if target is None else resolver.specifier_for(target, path, style, like=decl.module)
+        specifiers[id(decl)] = spec
+        if spec != decl.module:
+            notes.append(f'line {line_of(source, decl.start)}: {decl.module} -> {spec}')
+        if not decl.side_effect_only and decl.namespace is None:
+            groups.setdefault((target or decl.module, decl.type_only), []).append(decl)
+
+    edits = []
+    merged_away = set()
+    for (_, type_only), group in groups.items():
+        defaults = {decl.default for decl in group if decl.default}
+        if len(group) < 2 or len(defaults) > 1:
+            continue
+        first = group[0]
+        named = {}
+        for decl in group:
+            for spec in decl.named:
+                named.setdefault(spec.text, spec)
+        merged = dataclasses.replace(first, default=next(iter(defaults), None), named=list(named.values()))
+        specifiers[id(merged)] = specifiers[id(first)]
+        group[0] = merged
+        for decl in group[1:]:
+            merged_away.add(id(decl))
+            edits.append((*line_span(source, decl.start, decl.end), ''))
+        notes.append(f'line {line_of(source, first.start)}: merged {len(group)} '
+                     f'{"type " if type_only else ""}imports of {specifiers[id(first)]}')
+        declarations[declarations.index(first)] = merged
+
+    for decl in declarations:
+        if id(decl) in merged_away:
+            continue
+        spec = specifiers[id(decl)]
+        quote = decl.module_text[0]
+        decl = dataclasses.replace(decl, module_text=f'{quote}{spec}{quote}',
+                                   named=sorted(decl.named, key=_sort_key))
+        if decl.side_effect_only:
+            text = f'import {decl.module_text}{";" if decl.semicolon else ""}'
+        else:
+            text = render_declaration(source, tokens, decl, decl.default, decl.namespace, decl.named)
+        if text != source[decl.start:decl.end]:
+            edits.append((decl.start, decl.end, text))
+
+    for start, end, text in sorted(edits, reverse=True):
+        source = source[:start] + text + source[end:]
+    return source, notes
+
+
+def project_files(root: Path) -> list[str]:
+    """Every file under src/, for the Resolver."""
+    return sorted(Path(dirpath, filename).relative_to(root).as_posix()
+                  for dirpath, _, filenames in os.walk(root / SRC_DIR) for filename in filenames)
+
+
+def settings_signature(root: Path, files: list[str], style: str) -> str:
+    """Hash of everything resolution depends on besides the file itself."""
+    h = hashlib.sha256(f'{CANONICAL_VERSION}\n{style}\n'.encode('utf-8'))
+    h.update('\n'.join(files).encode('utf-8'))
+    try:
+        h.update((root / 'tsconfig.json').read_bytes())
+    except OSError:
+        pass
+    return h.hexdigest()[:16]
+
+
+# One Resolver per worker process, with its resolution cache
+_worker_resolver: Resolver | None = None
+
+
+def _init_worker(root: str, files: list[str]) -> None:
+    global _worker_resolver
+    _worker_resolver = Resolver(root, files=files)
+
+
+def _process(root: str, path: str, cached_digest: str | None, style: str):
+    with open(os.path.join(root, path), 'rb') as f:
+        data = f.read()
+    digest = content_digest(data)
+    if digest == cached_digest:
+        return path, digest, None, None, []
+    source = data.decode('utf-8')
+    new, notes = canonicalize(source, path, _worker_resolver, style)
+    return path, digest, source, new, notes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.canonical',
+                                     description='Rewrite imports under src/ to one canonical style.')
+    parser.add_argument('paths', nargs='*', metavar='PATH', help='repo-relative files (default: all of src/)')
+    parser.add_argument('--style', choices=STYLES, default='alias', help='specifier style (default: %(default)s)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--dry-run', '-n', action='store_true', help='print a unified diff instead of writing')
+    parser.add_argument('--no-cache', action='store_true', help=f'ignore and do not update {CACHE_FILENAME}')
+    parser.add_argument('--quiet', '-q', action='store_true', help='do not print one line per rewritten import')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    root = Path(args.root)
+    files = project_files(root)
+    paths = args.paths or [path for path in files if path.endswith(SOURCE_EXTENSIONS)]
+    signature = settings_signature(root, files, args.style)
+    cache = None if args.no_cache else ContentCache(root / CACHE_FILENAME)
+    cached = [cache.lookup(path, signature) if cache else None for path in paths]
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < MIN_FILES_FOR_POOL:
+        _init_worker(str(root), files)
+        results = [_process(str(root), path, digest, args.style) for path, digest in zip(paths, cached)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(str(root), files)) as pool:
+            results = list(pool.map(_process, [str(root)] * len(paths), paths, cached,
+                                    [args.style] * len(paths), chunksize=8))
+
+    out = sys.stderr if args.dry_run else sys.stdout
+    transaction = Transaction(root)
+    changed = 0
+    skipped = 0
+    for path, digest, source, new, notes in results:
+        if source is None:
+            skipped += 1
+            continue
+        if not args.quiet:
+            for note in notes:
+                print(f'{path}: {note}', file=out)
+        if new == source:
+            if cache:
+                cache.record(path, digest, signature)
+            continue
+        changed += 1
+        if args.dry_run:
+            sys.stdout.write(unified_diff(path, source, new))
+        else:
+            transaction.stage(path, digest, new)
+            if cache:
+                cache.forget(path)
+    try:
+        transaction.commit()
+    except TransactionError as exc:
+        print(f'Error: {exc}', file=sys.stderr)
+        return 1
+    if cache:
+        cache.save()
+    print(f'{len(paths)} files, {skipped} cached, {changed} {"would change" if args.dry_run else "changed"}, '
+          f'{(time.perf_counter() - started) * 1000:.1f} ms', file=out)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
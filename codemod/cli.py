@@ -0,0 +1,143 @@
+"""
+Command line entry point: python -m codemod [--rule NAME ...]
+"""
+
+import argparse
+import os
+import sys
+
+from .engine import REPO_ROOT, run
+from .profile import SLOWEST_COUNT, format_slowest, write_trace
+from .rules import ALL_RULES
+from .transaction import TransactionError, rollback
+from .watch import PollingWatcher, format_batch, format_race, watch
+
+
+def run_cli(main, argv: list[str] | None = None) -> int:
+    """main(argv), ending quietly with status 1 when stdout is closed early,
+    e.g. piped into head."""
+    try:
+        status = main(argv)
+        sys.stdout.flush()
+        return status
+    except BrokenPipeError:
+        # Python flushes stdout again at exit; point it at devnull so that
+        # does not raise too
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m codemod', description='Apply codemod rules to src/.')
+    parser.add_argument('--rule', '-r', action='append', dest='rules', metavar='NAME',
+                        help='rule or group name to run (repeatable, default: all)')
+    parser.add_argument('--list', action='store_true', help='list available rules and exit')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and do not update .codemod-cache')
+    parser.add_argument('--quiet', '-q', action='store_true', help='do not print the timing table')
+    parser.add_argument('--dry-run', '-n', action='store_true',
+                        help='print a unified diff of every change instead of writing (report goes to stderr)')
+    parser.add_argument('--watch', '-w', action='store_true', help='keep running and fix files under src/ as they change')
+    parser.add_argument('--polling', action='store_true', help='with --watch, poll instead of using inotify')
+    parser.add_argument('--rollback', action='store_true', help='restore the files changed by the last run and exit')
+    parser.add_argument('--trace', metavar='PATH', help='write a Chrome trace-event JSON of the run')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'print the {SLOWEST_COUNT} slowest file x rule pairs')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.list:
+        for rule in ALL_RULES:
+            print(f'{rule.group:<14} {rule.name:<34} {rule.description}')
+        return 0
+
+    if args.rollback:
+        try:
+            restored, skipped = rollback(args.root)
+        except TransactionError as exc:
+            print(f'Error: {exc}', file=sys.stderr)
+            return 1
+        for path in restored:
+            print(f'Restored: {path}')
+        for path in skipped:
+            print(f'Skipped: {path} (edited since the run)', file=sys.stderr)
+        if not restored and not skipped:
+            print('Nothing to roll back')
+        return 1 if skipped else 0
+
+    if args.watch:
+        return _watch(args)
+
+    def print_diff(result):
+        if result.diff:
+            sys.stdout.write(result.diff)
+            sys.stdout.flush()
+
+    try:
+        if args.dry_run:
+            report = run(args.rules, root=args.root, jobs=args.jobs, use_cache=not args.no_cache,
+                         write=False, diff=True, on_result=print_diff)
+        else:
+            report = run(args.rules, root=args.root, jobs=args.jobs, use_cache=not args.no_cache)
+    except KeyError as exc:
+        print(f'Unknown rule or group: {exc.args[0]}', file=sys.stderr)
+        return 2
+    except TransactionError as exc:
+        print(f'Error: {exc}', file=sys.stderr)
+        return 1
+
+    for path in report.recovered:
+        print(f'Rolled back interrupted run: {path}')
+
+    _print_report(report, args.dry_run, args.quiet)
+    out = sys.stderr if args.dry_run else sys.stdout
+    if args.profile:
+        print(format_slowest(report), file=out)
+    if args.trace:
+        write_trace(report, args.trace)
+        print(f'Trace written to {args.trace}', file=out)
+    return 1 if report.errors else 0
+
+
+def _print_report(report, dry_run: bool = False, quiet: bool = False) -> None:
+    # Keep stdout a clean patch in dry-run mode
+    out = sys.stderr if dry_run else sys.stdout
+    for path in report.files_changed:
+        print(f'Would fix: {path}' if dry_run else f'Fixed: {path}', file=out)
+    for path, rule, message in report.notes:
+        print(f'Note: {path} [{rule}] {message}', file=out)
+    for path, rule, message in report.errors:
+        print(f'Error: {path} [{rule}] {message}', file=sys.stderr)
+    if not quiet:
+        print(report.format_timings(), file=out)
+
+
+def _watch(args) -> int:
+    def on_ready(watcher):
+        method = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+        print(f'Watching {args.root}/src with {method} (Ctrl-C to stop)', flush=True)
+
+    def on_report(report, latency):
+        # Re-checks of files the watcher just wrote itself are not worth a line
+        if not (report.files_changed or report.notes or report.errors or report.recovered):
+            return
+        _print_report(report, quiet=True)
+        print(format_batch(report, latency), flush=True)
+
+    def on_error(paths, exc):
+        print(format_race(paths, exc), file=sys.stderr, flush=True)
+
+    try:
+        watch(args.rules, root=args.root, use_cache=not args.no_cache, polling=args.polling,
+              on_report=on_report, on_ready=on_ready, on_error=on_error)
+    except KeyError as exc:
+        print(f'Unknown rule or group: {exc.args[0]}', file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
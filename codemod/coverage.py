@@ -0,0 +1,76 @@
+"""
+Which files under src/entities/ the anchor patches cover.
+
+    python -m codemod.coverage
+
+Every file under src/entities/ and every file a PatchRule targets is listed
+as patched (its anchors all resolve), generated (owned by python -m
+codemod.generate), skipped (no anchor specs) or error (a missing anchor).
+Each patched file is indexed once for all of its patches. Exits 1 when an
+anchor is missing.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from .cli import run_cli
+from .engine import REPO_ROOT, SOURCE_EXTENSIONS
+from .entity_specs import ENTITIES
+from .patching import AnchorError, PatchRule, apply_patches
+from .rules import ALL_RULES
+
+ENTITIES_DIR = 'src/entities'
+STATUSES = ('patched', 'generated', 'skipped', 'error')
+
+
+def coverage(root: Path | str = REPO_ROOT) -> list[tuple[str, str, str]]:
+    """(path, status, detail) per file, sorted by path."""
+    root = Path(root)
+    by_path: dict[str, list] = {}
+    for rule in ALL_RULES:
+        if isinstance(rule, PatchRule):
+            for path, patches in rule.patches.items():
+                by_path.setdefault(path, []).append((rule.name, patches))
+    generated = {spec.path for spec in ENTITIES}
+    paths = set(by_path)
+    for dirpath, _, filenames in os.walk(root / ENTITIES_DIR):
+        paths.update(Path(dirpath, name).relative_to(root).as_posix()
+                     for name in filenames if name.endswith(SOURCE_EXTENSIONS))
+
+    report = []
+    for path in sorted(paths):
+        if path not in by_path:
+            if path in generated:
+                report.append((path, 'generated', 'python -m codemod.generate'))
+            else:
+                report.append((path, 'skipped', 'no anchor specs'))
+            continue
+        names = ', '.join(name for name, _ in by_path[path])
+        try:
+            source = (root / path).read_text(encoding='utf-8')
+            apply_patches(source, [patch for _, patches in by_path[path] for patch in patches])
+        except (OSError, AnchorError) as exc:
+            report.append((path, 'error', f'{names}: {exc}'))
+            continue
+        report.append((path, 'patched', names))
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.coverage',
+                                     description='Report which entity files the anchor patches cover.')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    report = coverage(args.root)
+    for path, status, detail in report:
+        print(f'{status:<10} {path:<36} {detail}')
+    counts = {status: sum(1 for _, s, _ in report if s == status) for status in STATUSES}
+    print(', '.join(f'{count} {status}' for status, count in counts.items()))
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
@@ -0,0 +1,311 @@
+"""
+Codemod engine.
+
+Collects every file under src/ that at least one selected rule matches, reads
+each file exactly once, applies all matching rules in registry order and
+writes the file back only if the result differs. Files are processed in
+batches on a process pool sized to the machine (bounded by the number of
+batches), and per-rule wall time is collected from the workers.
+
+With a ContentCache, files whose content hash and applicable rule set match a
+previous no-change run are only hashed, never decoded or rewritten.
+
+Writes go through a Transaction: nothing touches src/ until every file has
+been processed, and then all changed files are replaced together (see
+transaction.py). A run interrupted mid-commit is rolled back by the next run.
+
+For previews the workers also render a unified diff of every changed file, and
+results are handed to an on_result callback batch by batch as they complete,
+so output can be streamed while the rest of the tree is still being processed.
+"""
+
+import difflib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import CACHE_FILENAME, ContentCache, content_digest, rules_signature
+from .reader import contains_any, mapped
+from .rules import select_rules
+from .transaction import Transaction, pending_state, remove_stale_temps, rollback
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = 'src'
+SOURCE_EXTENSIONS = ('.ts',)
+
+# Below this many files a pool costs more to start than it saves
+MIN_FILES_FOR_POOL = 8
+# Span name for reading, hashing and decoding a file
+READ_SPAN = '(read)'
+
+
+@dataclass
+class FileResult:
+    path: str
+    # SHA-256 of the content that was read
+    digest: str
+    # New source, or None when no rule changed the file
+    new_source: str | None
+    # Rule name -> seconds spent in Rule.apply
+    timings: dict[str, float]
+    changed_by: list[str]
+    # (rule name, message) for rules that raised
+    errors: list[tuple[str, str]]
+    # (rule name, message) reported by Rule.apply_with_notes
+    notes: list[tuple[str, str]] = field(default_factory=list)
+    # True when the cache proved the file needs no work
+    cached: bool = False
+    # Unified diff of the change, when requested
+    diff: str | None = None
+    # Profiling: (rule name or READ_SPAN, perf_counter start, seconds), the
+    # file's size in bytes and the process that handled it
+    spans: list[tuple[str, float, float]] = field(default_factory=list)
+    size: int = 0
+    pid: int = 0
+
+
+@dataclass
+class Span:
+    path: str
+    # Rule name, or READ_SPAN for reading and hashing the file
+    name: str
+    pid: int
+    # time.perf_counter() value; CLOCK_MONOTONIC is shared by all processes
+    start: float
+    seconds: float
+    size: int
+
+
+@dataclass
+class RuleStats:
+    files: int = 0
+    changed: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class RunReport:
+    files_read: int = 0
+    files_cached: int = 0
+    files_changed: list[str] = field(default_factory=list)
+    rule_stats: dict[str, RuleStats] = field(default_factory=dict)
+    # (path, rule name, message)
+    errors: list[tuple[str, str, str]] = field(default_factory=list)
+    notes: list[tuple[str, str, str]] = field(default_factory=list)
+    jobs: int = 1
+    elapsed: float = 0.0
+    # Files restored from the journal of an interrupted earlier run
+    recovered: list[str] = field(default_factory=list)
+    # Per-file, per-rule spans (see profile.py); started is the run's
+    # perf_counter origin and commit the (start, seconds) of the write phase
+    spans: list[Span] = field(default_factory=list)
+    started: float = 0.0
+    commit: tuple[float, float] = (0.0, 0.0)
+
+    def format_timings(self) -> str:
+        """Render the per-rule timing table."""
+        width = max([len('rule')] + [len(name) for name in self.rule_stats])
+        lines = [f'{"rule":<{width}}  {"files":>6}  {"changed":>7}  {"total ms":>9}  {"ms/file":>8}']
+        for name, stats in self.rule_stats.items():
+            per_file = stats.seconds * 1000 / stats.files if stats.files else 0.0
+            lines.append(
+                f'{name:<{width}}  {stats.files:>6}  {stats.changed:>7}  '
+                f'{stats.seconds * 1000:>9.2f}  {per_file:>8.3f}'
+            )
+        lines.append(
+            f'{self.files_read} files read ({self.files_cached} cached), {len(self.files_changed)} changed, '
+            f'{self.jobs} worker(s), {self.elapsed * 1000:.1f} ms'
+        )
+        return '\n'.join(lines)
+
+
+def discover_files(root: Path, rules: list) -> list[str]:
+    """Return sorted repo-relative paths under src/ matched by any rule."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root / SRC_DIR):
+        dirnames.sort()
+        for filename in filenames:
+            if not filename.endswith(SOURCE_EXTENSIONS):
+                continue
+            rel = (Path(dirpath) / filename).relative_to(root).as_posix()
+            if any(rule.matches(rel) for rule in rules):
+                paths.append(rel)
+    return sorted(paths)
+
+
+def apply_rules(rules: list, path: str, source: str, digest: str = '') -> FileResult:
+    """Run every matching rule over one file's source."""
+    original = source
+    timings = {}
+    spans = []
+    changed_by = []
+    errors = []
+    notes = []
+    for rule in rules:
+        if not rule.matches(path) or (rule.trigger is not None and rule.trigger not in source):
+            continue
+        start = time.perf_counter()
+        try:
+            result, rule_notes = rule.apply_with_notes(path, source)
+            notes.extend((rule.name, note) for note in rule_notes)
+        except Exception as exc:  # a broken rule must not abort the whole run
+            errors.append((rule.name, f'{type(exc).__name__}: {exc}'))
+            result = source
+        timings[rule.name] = time.perf_counter() - start
+        spans.append((rule.name, start, timings[rule.name]))
+        if result != source:
+            changed_by.append(rule.name)
+            source = result
+    return FileResult(path, digest, source if source != original else None, timings, changed_by, errors, notes,
+                      spans=spans)
+
+
+def unified_diff(path: str, old: str, new: str) -> str:
+    """git-style unified diff of one file."""
+    lines = []
+    for line in difflib.unified_diff(old.splitlines(True), new.splitlines(True), f'a/{path}', f'b/{path}'):
+        lines.append(line)
+        if not line.endswith('\n'):
+            lines.append('\n\\ No newline at end of file\n')
+    return ''.join(lines)
+
+
+# Rules are resolved once per worker process instead of pickled per task
+_worker_rules: list = []
+_worker_diff = False
+
+
+def _init_worker(rule_names: list[str], diff: bool = False) -> None:
+    global _worker_rules, _worker_diff
+    _worker_rules = select_rules(rule_names)
+    _worker_diff = diff
+
+
+def _process_batch(root: str, tasks: list[tuple[str, str | None]]) -> list[FileResult]:
+    """Process (path, cached digest) pairs; a matching digest skips the rules."""
+    results = []
+    pid = os.getpid()
+    for path, cached_digest in tasks:
+        read_start = time.perf_counter()
+        with mapped(os.path.join(root, path)) as buffer:
+            size = len(buffer)
+            digest = content_digest(buffer)
+            rules = [rule for rule in _worker_rules if rule.matches(path)]
+            if digest == cached_digest:
+                result = FileResult(path, digest, None, {}, [], [], cached=True)
+            # No rule can change a file that contains none of their triggers
+            elif all(rule.trigger is not None for rule in rules) and \
+                    not contains_any(buffer, [rule.trigger.encode('utf-8') for rule in rules]):
+                result = FileResult(path, digest, None, {}, [], [])
+            else:
+                result = None
+                source = str(buffer, 'utf-8')
+        read = (READ_SPAN, read_start, time.perf_counter() - read_start)
+        if result is None:
+            result = apply_rules(rules, path, source, digest)
+            if _worker_diff and result.new_source is not None:
+                result.diff = unified_diff(path, source, result.new_source)
+        result.spans.insert(0, read)
+        result.size = size
+        result.pid = pid
+        results.append(result)
+    return results
+
+
+def _batches(tasks: list, jobs: int) -> list[list]:
+    # A few batches per worker keeps the pool busy when file sizes are uneven
+    size = max(1, -(-len(tasks) // (jobs * 4)))
+    return [tasks[i:i + size] for i in range(0, len(tasks), size)]
+
+
+def run(rule_names: list[str] | None = None, root: Path | str = REPO_ROOT,
+        jobs: int | None = None, write: bool = True, use_cache: bool = True,
+        diff: bool = False, on_result=None, paths: list[str] | None = None) -> RunReport:
+    """Apply the selected rules (all by default) to the tree at root.
+
+    diff: render FileResult.diff for changed files in the workers.
+    on_result: called with each FileResult as soon as its batch completes.
+    paths: only process these repo-relative paths instead of all of src/.
+    """
+    started = time.perf_counter()
+    root = Path(root)
+    rules = select_rules(rule_names)
+    names = [rule.name for rule in rules]
+    if paths is None:
+        paths = discover_files(root, rules)
+    else:
+        paths = sorted(path for path in set(paths) if any(rule.matches(path) for rule in rules))
+
+    report = RunReport(files_read=len(paths), started=started)
+    if write:
+        if pending_state(root) == 'prepared':
+            report.recovered = rollback(root)[0]
+        remove_stale_temps(root, paths)
+
+    cache = ContentCache(root / CACHE_FILENAME) if use_cache else None
+    signatures = {path: rules_signature(rules, path) for path in paths}
+    tasks = [(path, cache.lookup(path, signatures[path]) if cache else None) for path in paths]
+
+    jobs = jobs or os.cpu_count() or 1
+    batches = _batches(tasks, jobs)
+    jobs = max(1, min(jobs, len(batches)))
+
+    results = []
+
+    def collect(batch_results):
+        results.extend(batch_results)
+        if on_result:
+            for result in batch_results:
+                on_result(result)
+
+    if jobs == 1 or len(paths) < MIN_FILES_FOR_POOL:
+        jobs = 1
+        _init_worker(names, diff)
+        for task in tasks:
+            collect(_process_batch(str(root), [task]))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(names, diff)) as pool:
+            futures = [pool.submit(_process_batch, str(root), batch) for batch in batches]
+            for future in as_completed(futures):
+                collect(future.result())
+        # Completion order is arbitrary; keep the report deterministic
+        results.sort(key=lambda result: result.path)
+
+    report.jobs = jobs
+    transaction = Transaction(root)
+    report.rule_stats = {name: RuleStats() for name in names}
+    for result in results:
+        report.spans.extend(Span(result.path, name, result.pid, start, seconds, result.size)
+                            for name, start, seconds in result.spans)
+        if result.cached:
+            report.files_cached += 1
+            continue
+        for name, seconds in result.timings.items():
+            stats = report.rule_stats[name]
+            stats.files += 1
+            stats.seconds += seconds
+        for name in result.changed_by:
+            report.rule_stats[name].changed += 1
+        for name, message in result.errors:
+            report.errors.append((result.path, name, message))
+        for name, message in result.notes:
+            report.notes.append((result.path, name, message))
+        if result.new_source is not None:
+            if write:
+                transaction.stage(result.path, result.digest, result.new_source)
+            report.files_changed.append(result.path)
+            if cache:
+                cache.forget(result.path)
+        elif cache and not result.errors:
+            cache.record(result.path, result.digest, signatures[result.path])
+
+    if cache:
+        cache.save()
+    commit_start = time.perf_counter()
+    transaction.commit()
+    report.commit = (commit_start, time.perf_counter() - commit_start)
+
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,133 @@
+"""
+Declarative specs for the generated entity classes in src/entities/.
+
+codemod.generate renders a missing class from these specs and keeps existing
+classes in line with them (see generate.py for what is synced). Values here
+are the source of truth: edit the spec, then run python -m codemod.generate.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SplitHalves:
+    # Textures of the two halves left behind when the monster is sliced
+    left: str
+    right: str
+    # Flash a white circle before splitting
+    flash: bool = True
+
+
+@dataclass(frozen=True)
+class BatBurst:
+    # Each half releases Between(min_bats, max_bats) bats
+    texture: str
+    min_bats: int = 2
+    max_bats: int = 4
+
+
+@dataclass(frozen=True)
+class VisibilityCycle:
+    # Alternates GHOST_VISIBLE_DURATION visible and GHOST_INVISIBLE_DURATION
+    # at hidden_alpha, fading over fade_ms; sliceable above sliceable_alpha
+    hidden_alpha: float = 0.2
+    sliceable_alpha: float = 0.5
+    fade_ms: int = 300
+
+
+@dataclass(frozen=True)
+class Mist:
+    # Puffs of mist left behind when the monster is sliced
+    count: int = 12
+    color: str = '0x87ceeb'
+
+
+@dataclass(frozen=True)
+class EntitySpec:
+    name: str
+    # 'Monster' or 'Boss'
+    base: str
+    texture: str
+    # Doc comment lines under the class name (new files only)
+    summary: tuple[str, ...]
+    # MonsterType member, Monster subclasses only
+    monster_type: str | None = None
+    # Returned by getBaseHealth()
+    base_health: int | None = None
+    # Stats assigned in the constructor; None leaves Monster's defaults
+    health: int | None = None
+    speed: float | None = None
+    points: int | None = None
+    # Sprite scale set in the constructor, bosses only
+    scale: float | None = None
+    split_halves: SplitHalves | None = None
+    bat_burst: BatBurst | None = None
+    visibility_cycle: VisibilityCycle | None = None
+    mist: Mist | None = None
+
+    @property
+    def path(self) -> str:
+        return f'src/entities/{self.name}.ts'
+
+
+ENTITIES = [
+    EntitySpec(
+        'Zombie', 'Monster', 'monster_zombie',
+        ('Basic monster implementation that splits into two halves when sliced.',),
+        monster_type='ZOMBIE', base_health=1, health=1, speed=1.0, points=10,
+        split_halves=SplitHalves('zombie_left_half', 'zombie_right_half'),
+    ),
+    EntitySpec(
+        'Vampire', 'Monster', 'vampire',
+        ('A vampire monster that splits into two halves when hit.',
+         'Each half can spawn bats when destroyed.'),
+        monster_type='VAMPIRE', base_health=100,
+        split_halves=SplitHalves('vampire_left_half', 'vampire_right_half', flash=False),
+        bat_burst=BatBurst('vampire_bat', 2, 4),
+    ),
+    EntitySpec(
+        'Ghost', 'Monster', 'monster_ghost',
+        ('Medium-speed monster with visibility cycle.',
+         'Only sliceable when visible (alpha > 0.5).',
+         'Dissolves into mist when sliced.'),
+        monster_type='GHOST', base_health=1, health=1, speed=1.2, points=30,
+        visibility_cycle=VisibilityCycle(), mist=Mist(),
+    ),
+    EntitySpec(
+        'GraveTitan', 'Boss', 'boss_gravetitan',
+        ('World 1 Boss - A massive zombie animated by dark magic.',
+         'Attacks: Ground slam, Rock throw',
+         'Minions: Zombies'),
+        scale=2,
+    ),
+    EntitySpec(
+        'HeadlessHorseman', 'Boss', 'boss_horseman',
+        ('World 2 Boss - A legendary specter that rides through the night.',
+         'Attacks: Charge, Head throw',
+         'Minions: Zombies and Vampires'),
+        scale=1.8,
+    ),
+    EntitySpec(
+        'VampireLord', 'Boss', 'boss_vampirelord',
+        ('World 3 Boss - The ancient master of all vampires.',
+         'Attacks: Bat swarm, Blood drain',
+         'Minions: Vampires and Ghosts'),
+        scale=1.6,
+    ),
+    EntitySpec(
+        'PhantomKing', 'Boss', 'boss_phantomking',
+        ('World 4 Boss - The ruler of all restless spirits.',
+         'Attacks: Phase shift, Clone summon, Soul storm',
+         'Minions: Ghosts'),
+        scale=1.5,
+    ),
+    EntitySpec(
+        'DemonOverlord', 'Boss', 'boss_demonoverlord',
+        ('World 5 Boss - The source of all evil in the mortal realm.',
+         'Attacks: Fire breath, Summon pillars, Teleport fire, Inferno rage',
+         'Minions: All monster types'),
+        scale=2,
+    ),
+]
+
+SPECS_BY_NAME = {spec.name: spec for spec in ENTITIES}
@@ -0,0 +1,444 @@
+"""
+Entity class generator for src/entities/.
+
+Renders Monster and Boss subclasses from the specs in entity_specs.py and the
+templates in codemod/templates/. A class whose file does not exist yet is
+rendered in full. An existing class keeps its hand-written members; only the
+values the spec owns are brought in line, anchored on the class structure:
+
+- the texture key (and MonsterType) passed to super() in the constructor
+- the health/speed/points stats and the boss setScale() in the constructor,
+  inserted after the super() call when missing
+- the getBaseHealth() return value, adding the method when missing
+
+The templates are taken from the current Zombie (split halves with a flash),
+Vampire (bat burst) and Ghost (visibility cycle, mist) sources. The members
+a template owns are compared with their rendered template, ignoring comments
+and formatting; every other member is left alone. A class whose die()
+already calls createHalves() does not own an onSliced(): adding one would
+spawn the halves twice. A missing or differing owned member is reported as
+a warning; --regenerate rewrites it from the template instead, adding the
+imports it needs, and drops whatever was hand-written in that member.
+
+    python -m codemod.generate                 # every entity
+    python -m codemod.generate Vampire --dry-run
+    python -m codemod.generate Zombie --regenerate --dry-run
+
+Files whose content hash and spec signature match a previous no-change run
+are skipped without being parsed, in .codemod-generate. Writes go through one
+Transaction.
+"""
+
+import argparse
+import dataclasses
+import functools
+import hashlib
+import sys
+import textwrap
+import time
+from pathlib import Path
+from string import Template
+
+from .cache import ContentCache, content_digest
+from .cli import run_cli
+from .engine import REPO_ROOT, unified_diff
+from .entity_specs import ENTITIES, SPECS_BY_NAME, EntitySpec
+from .imports import ImportSpecifier, parse_imports, render_declaration
+from .patching import AnchorError, ClassInfo, MemberPatch, index_classes
+from .tokenizer import NUMBER, STRING, tokenize
+from .transaction import Transaction, TransactionError
+
+CACHE_FILENAME = '.codemod-generate'
+# Bump when sync() or render() change behaviour
+GENERATOR_VERSION = 3
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+STATS = ('health', 'speed', 'points')
+
+
+@functools.lru_cache(maxsize=None)
+def _template(name: str) -> Template:
+    return Template((TEMPLATE_DIR / f'{name}.ts.tmpl').read_text(encoding='utf-8'))
+
+
+def _number(value: float) -> str:
+    # repr keeps 1.0 as '1.0' and 2 as '2', matching how the sources write them
+    return repr(value)
+
+
+def spec_signature(spec: EntitySpec) -> str:
+    """Hash of the spec, the templates and the generator version."""
+    h = hashlib.sha256(f'{GENERATOR_VERSION}\n{spec!r}'.encode('utf-8'))
+    for path in sorted(TEMPLATE_DIR.glob('*.ts.tmpl')):
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _base_health_member(spec: EntitySpec) -> str:
+    return _template('base_health').substitute(lower=spec.name.lower(), base_health=spec.base_health)
+
+
+@dataclasses.dataclass(frozen=True)
+class TemplateMember:
+    # 'method' or 'property', as in patching.Member
+    kind: str
+    text: str
+
+
+def _members(template: str, **values) -> dict[str, TemplateMember]:
+    """The members of one rendered template, by member name."""
+    text = _template(template).substitute(**values)
+    source = f'class _ {{\n{text}\n}}'
+    members = {}
+    for member in index_classes(source)['_'].members.values():
+        line_start = source.rfind('\n', 0, member.start) + 1
+        members[member.name] = TemplateMember(member.kind, source[line_start:member.end] + '\n')
+    return members
+
+
+def template_members(spec: EntitySpec) -> dict[str, TemplateMember]:
+    """Rendered members the templates own, by member name."""
+    lower = spec.name.lower()
+    members = {}
+    effects = []
+    if spec.visibility_cycle:
+        cycle = spec.visibility_cycle
+        members.update(_members('visibility_cycle', lower=lower, hidden_alpha=_number(cycle.hidden_alpha),
+                                sliceable_alpha=_number(cycle.sliceable_alpha), fade_ms=cycle.fade_ms))
+    if spec.split_halves:
+        halves = spec.split_halves
+        if halves.flash:
+            effects.append(('Create visual flash effect', 'createFlashEffect'))
+            members.update(_members('flash_effect', lower=lower))
+        effects.append(('Create two halves', 'createHalves'))
+        if spec.bat_burst:
+            burst = spec.bat_burst
+            members.update(_members('bat_burst', lower=lower, left=halves.left, right=halves.right,
+                                    texture=burst.texture, min_bats=burst.min_bats, max_bats=burst.max_bats))
+        else:
+            members.update(_members('split_halves', name=spec.name, left=halves.left, right=halves.right))
+    if spec.mist:
+        effects.append(('Create mist effect', 'createMistEffect'))
+        members.update(_members('mist_effect', count=spec.mist.count, color=spec.mist.color))
+    if effects:
+        text = ''.join(f'    // {comment}\n    this.{method}();\n\n' for comment, method in effects)
+        members.update(_members('on_sliced', lower=lower, effects=text))
+    return members
+
+
+def owned_members(source: str, info: ClassInfo, spec: EntitySpec) -> dict[str, TemplateMember]:
+    """template_members() less what the class does by hand: a class whose
+    die() already calls createHalves() does not get an onSliced(), which
+    would spawn the halves a second time."""
+    members = template_members(spec)
+    die = info.members.get('die')
+    if die is not None and die.body_start is not None and \
+            'createHalves' in _code(source[die.body_start:die.body_end]):
+        members.pop('onSliced', None)
+    return members
+
+
+def _template_imports(spec: EntitySpec) -> list[tuple[str, str | None, str]]:
+    """(module, named import or None for the default, local name) the
+    template members use as values."""
+    needed = []
+    if spec.visibility_cycle:
+        needed += [("'@config/constants'", name, name)
+                   for name in ('GHOST_VISIBLE_DURATION', 'GHOST_INVISIBLE_DURATION')]
+    if spec.split_halves and not spec.bat_burst:
+        needed += [("'@config/constants'", 'GRAVITY', 'GRAVITY'), ("'@utils/DebugLogger'", 'debugWarn', 'debugWarn')]
+    if spec.bat_burst:
+        needed.append(("'phaser'", None, 'Phaser'))
+    return needed
+
+
+def _code(text: str) -> list[str]:
+    return [tok.text for tok in tokenize(text)]
+
+
+def stale_members(source: str, info: ClassInfo, spec: EntitySpec) -> list[str]:
+    """Template-owned members of info that are missing or differ from their
+    template in code (comments and layout aside)."""
+    return [name for name, member in owned_members(source, info, spec).items()
+            if name not in info.members
+            or _code(source[info.members[name].start:info.members[name].end]) != _code(member.text)]
+
+
+def _import_edits(source: str, spec: EntitySpec) -> list[tuple[int, int, str]]:
+    """Edits adding the value imports the template members need."""
+    tokens = list(tokenize(source))
+    declarations = parse_imports(source, tokens)
+    edits = []
+    new_lines = []
+    for module, imported, local in _template_imports(spec):
+        owner = next((decl for decl in declarations if local in decl.local_names()), None)
+        if owner is not None:
+            if owner.type_only:
+                # `import type Phaser` cannot be used as a value
+                text = render_declaration(source, tokens, dataclasses.replace(owner, type_only=False),
+                                          owner.default, owner.namespace, owner.named)
+                edits.append((owner.start, owner.end, text))
+            continue
+        target = next((decl for decl in declarations if decl.module_text[1:-1] == module[1:-1]
+                       and not decl.type_only and decl.open_brace is not None), None)
+        if imported is not None and target is not None:
+            named = target.named + [ImportSpecifier(imported, local, False, imported)]
+            edits.append((target.start, target.end,
+                          render_declaration(source, tokens, target, target.default, target.namespace, named)))
+            declarations.remove(target)
+        else:
+            binding = f'{{ {imported} }}' if imported is not None else local
+            new_lines.append(f'import {binding} from {module};')
+    if new_lines:
+        offset = declarations[-1].end if declarations else 0
+        text = ''.join(f'\n{line}' for line in new_lines) if declarations else ''.join(
+            f'{line}\n' for line in new_lines)
+        edits.append((offset, offset, text))
+    return edits
+
+
+def render(spec: EntitySpec) -> str:
+    """Full source of a new entity file."""
+    summary = '\n'.join(f' * {line}' for line in spec.summary)
+    if spec.base == 'Boss':
+        return _template('boss').substitute(name=spec.name, summary=summary, texture=spec.texture,
+                                            scale=_number(spec.scale if spec.scale is not None else 1))
+
+    imports = [
+        "import Phaser from 'phaser';" if spec.bat_burst else "import type Phaser from 'phaser';",
+        "import { Monster } from './Monster';",
+        "import { MonsterType } from '@config/types';",
+    ]
+    named = {}
+    for module, imported, _ in _template_imports(spec):
+        if imported is not None:
+            named.setdefault(module, []).append(imported)
+    imports += [f'import {{ {", ".join(names)} }} from {module};' for module, names in named.items()]
+    owned = template_members(spec).values()
+    fields = ''.join(member.text for member in owned if member.kind == 'property')
+    members = [member.text for member in owned if member.kind == 'method']
+    if spec.base_health is not None:
+        members.append(_base_health_member(spec))
+
+    stats = ''.join(f'    this.{stat} = {_number(getattr(spec, stat))};\n'
+                    for stat in STATS if getattr(spec, stat) is not None)
+    return _template('monster').substitute(
+        name=spec.name, summary=summary, imports='\n'.join(imports) + '\n', texture=spec.texture,
+        monster_type=spec.monster_type, stats=stats, fields=fields + '\n' if fields else '',
+        members=''.join('\n' + member for member in members))
+
+
+def _find(tokens, texts: tuple) -> int | None:
+    """Index of the first run of tokens whose texts are texts (None = any NUMBER)."""
+    width = len(texts)
+    for i in range(len(tokens) - width + 1):
+        if all(tokens[i + k].kind == NUMBER if want is None else tokens[i + k].text == want
+               for k, want in enumerate(texts)):
+            return i
+    return None
+
+
+def sync(source: str, spec: EntitySpec, regenerate: bool = False) -> tuple[str, list[str]]:
+    """Bring an existing class in line with its spec; return (source, notes).
+    With regenerate, stale template-owned members are rewritten too."""
+    info = index_classes(source).get(spec.name)
+    if info is None:
+        raise AnchorError(f'class {spec.name} not found')
+    ctor = info.members.get('constructor')
+    if ctor is None or ctor.body_start is None:
+        raise AnchorError(f'class {spec.name} has no constructor')
+
+    base = ctor.body_start
+    tokens = list(tokenize(source[base:ctor.body_end]))
+    edits = []
+
+    start = _find(tokens, ('super', '('))
+    if start is None:
+        raise AnchorError(f'{spec.name} constructor does not call super()')
+    # Split the super() arguments at top-level commas
+    args = [[]]
+    depth = 0
+    end = start + 1
+    for end in range(start + 1, len(tokens)):
+        tok = tokens[end]
+        if tok.text in ('(', '[', '{'):
+            depth += 1
+            if depth == 1:
+                continue
+        elif tok.text in (')', ']', '}'):
+            depth -= 1
+            if depth == 0:
+                break
+        if depth == 1 and tok.text == ',':
+            args.append([])
+        else:
+            args[-1].append(tok)
+    if len(args) < 4 or len(args[3]) != 1 or args[3][0].kind != STRING:
+        raise AnchorError(f'{spec.name} super() call has no texture argument')
+    texture = args[3][0]
+    if texture.text[1:-1] != spec.texture:
+        quote = texture.text[0]
+        edits.append((base + texture.start, base + texture.end, f'{quote}{spec.texture}{quote}'))
+    if spec.monster_type is not None:
+        member = args[4] if len(args) > 4 else []
+        if [tok.text for tok in member[:2]] != ['MonsterType', '.'] or len(member) != 3:
+            raise AnchorError(f'{spec.name} super() call has no MonsterType argument')
+        if member[2].text != spec.monster_type:
+            edits.append((base + member[2].start, base + member[2].end, spec.monster_type))
+
+    statement_end = tokens[end + 1].end if end + 1 < len(tokens) and tokens[end + 1].text == ';' else tokens[end].end
+    wanted = [(('this', '.', stat, '=', None), f'this.{stat} = {{}};', getattr(spec, stat))
+              for stat in STATS if getattr(spec, stat) is not None]
+    if spec.scale is not None:
+        wanted.append((('this', '.', 'setScale', '(', None, ')'), 'this.setScale({});', spec.scale))
+    missing = []
+    for pattern, line, value in wanted:
+        i = _find(tokens, pattern)
+        if i is None:
+            missing.append(line.format(_number(value)))
+            continue
+        number = tokens[i + pattern.index(None)]
+        if float(number.text) != value:
+            edits.append((base + number.start, base + number.end, _number(value)))
+    if missing:
+        line_start = source.rfind('\n', 0, base + tokens[start].start) + 1
+        indent = source[line_start:base + tokens[start].start]
+        edits.append((base + statement_end, base + statement_end, ''.join(f'\n{indent}{line}' for line in missing)))
+
+    if spec.base_health is not None:
+        method = info.members.get('getBaseHealth')
+        if method is None:
+            edit = MemberPatch(spec.name, _base_health_member(spec)).edit(source, info)
+            edits.append((edit[0], edit[0], edit[1]))
+        else:
+            body = list(tokenize(source[method.body_start:method.body_end]))
+            i = _find(body, ('return', None))
+            if i is None:
+                raise AnchorError(f'{spec.name}.getBaseHealth does not return a number literal')
+            if float(body[i + 1].text) != spec.base_health:
+                number = body[i + 1]
+                edits.append((method.body_start + number.start, method.body_start + number.end,
+                              _number(spec.base_health)))
+
+    notes = []
+    stale = stale_members(source, info, spec) if regenerate else []
+    rendered = template_members(spec)
+    new_fields = [name for name in stale if name not in info.members and rendered[name].kind == 'property']
+    if new_fields:
+        # Together after the last field, or above the constructor
+        indent = source[source.rfind('\n', 0, ctor.start) + 1:ctor.start]
+        text = textwrap.indent(textwrap.dedent(''.join(rendered[name].text for name in new_fields)).strip('\n'),
+                               indent)
+        fields = [other for other in info.members.values() if other.kind == 'property']
+        if fields:
+            # After the rest of its line, which may hold a comment
+            line_end = source.find('\n', fields[-1].end)
+            edits.append((line_end, line_end, '\n' + text))
+        else:
+            edits.append((ctor.start - len(indent), ctor.start - len(indent), text + '\n\n'))
+        notes.extend(f'added {name} from its template' for name in new_fields)
+    for name in stale:
+        member = info.members.get(name)
+        if name in new_fields:
+            continue
+        if member is None:
+            edit = MemberPatch(spec.name, rendered[name].text).edit(source, info)
+            edits.append((edit[0], edit[0], edit[1]))
+            notes.append(f'added {name} from its template')
+            continue
+        indent = source[source.rfind('\n', 0, member.start) + 1:member.start]
+        text = textwrap.indent(textwrap.dedent(rendered[name].text).strip('\n'), indent)
+        edits.append((member.start - len(indent), member.end, text))
+        notes.append(f'rewrote {name} from its template')
+    if stale:
+        edits.extend(_import_edits(source, spec))
+
+    for edit_start, edit_end, text in sorted(edits, reverse=True):
+        source = source[:edit_start] + text + source[edit_end:]
+    return source, notes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.generate',
+                                     description='Generate or sync entity classes from codemod/entity_specs.py.')
+    parser.add_argument('names', nargs='*', metavar='NAME', help='entity classes to process (default: all)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--dry-run', '-n', action='store_true', help='print a unified diff instead of writing')
+    parser.add_argument('--no-cache', action='store_true', help=f'ignore and do not update {CACHE_FILENAME}')
+    parser.add_argument('--regenerate', action='store_true',
+                        help='rewrite stale template-owned members of existing classes')
+    parser.add_argument('--list', action='store_true', help='list the entity specs and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for spec in ENTITIES:
+            print(f'{spec.name:<18} {spec.base:<8} {spec.path}')
+        return 0
+    unknown = [name for name in args.names if name not in SPECS_BY_NAME]
+    if unknown:
+        print(f'Unknown entity: {", ".join(unknown)}', file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    root = Path(args.root)
+    specs = [SPECS_BY_NAME[name] for name in args.names] if args.names else ENTITIES
+    cache = None if args.no_cache else ContentCache(root / CACHE_FILENAME)
+    transaction = Transaction(root)
+    status = 0
+    cached = 0
+    changed = []
+    for spec in specs:
+        signature = spec_signature(spec)
+        full = root / spec.path
+        if not full.exists():
+            source, digest = '', None
+            new, notes, stale = render(spec), [], []
+        else:
+            data = full.read_bytes()
+            digest = content_digest(data)
+            if cache and cache.lookup(spec.path, signature) == digest:
+                cached += 1
+                continue
+            source = data.decode('utf-8')
+            try:
+                new, notes = sync(source, spec, args.regenerate)
+                stale = [] if args.regenerate else stale_members(source, index_classes(source)[spec.name], spec)
+            except AnchorError as exc:
+                print(f'Error: {spec.path} {exc}', file=sys.stderr)
+                status = 1
+                continue
+            for name in stale:
+                print(f'Warning: {spec.path} {name} is stale against its template '
+                      f'(--regenerate rewrites it)', file=sys.stderr)
+        for note in notes:
+            print(f'Note: {spec.path} {note}')
+        if new == source:
+            # Stale members warn again on the next run
+            if cache and not notes and not stale:
+                cache.record(spec.path, digest, signature)
+            continue
+        changed.append((spec.path, 'Generated' if digest is None else 'Updated'))
+        if args.dry_run:
+            sys.stdout.write(unified_diff(spec.path, source, new))
+        else:
+            transaction.stage(spec.path, digest, new)
+            if cache:
+                cache.forget(spec.path)
+
+    try:
+        transaction.commit()
+    except TransactionError as exc:
+        print(f'Error: {exc}', file=sys.stderr)
+        return 1
+    if cache:
+        cache.save()
+
+    out = sys.stderr if args.dry_run else sys.stdout
+    for path, action in changed:
+        print(f'{action}: {path}' if not args.dry_run else f'Would update: {path}', file=out)
+    print(f'{len(specs)} entities, {cached} cached, {len(changed)} changed, '
+          f'{(time.perf_counter() - started) * 1000:.1f} ms', file=out)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
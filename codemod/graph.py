@@ -0,0 +1,210 @@
+"""
+Module dependency graph of src/.
+
+Built from the symbol index (so it is incremental too) with every import
+specifier resolved through tsconfig.json path aliases. Edges carry how the
+dependency is loaded: 'static', 'type' (import type, erased at runtime) or
+'dynamic' (import('...')). Runtime reports follow static edges only.
+
+    python -m codemod.graph                  # cycles, fan-in, scene closures
+    python -m codemod.graph --closure src/scenes/BootScene.ts
+    python -m codemod.graph --json > graph.json
+
+Bare package imports (phaser, @supabase/supabase-js) are not nodes.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+from .cli import run_cli
+from .engine import REPO_ROOT
+from .symbols import SymbolIndex
+
+ENTRY_POINT = 'src/main.ts'
+SCENES_DIR = 'src/scenes/'
+RUNTIME_KINDS = ('static',)
+# A 'static' edge outranks 'dynamic', which outranks 'type'
+_KIND_RANK = {'type': 0, 'dynamic': 1, 'static': 2}
+
+
+class ModuleGraph:
+    def __init__(self):
+        # path -> {dependency path: kind}
+        self.edges: dict[str, dict[str, str]] = {}
+        # Specifiers that point into the project but resolve to no file
+        self.unresolved: list[tuple[str, str]] = []
+
+    @classmethod
+    def from_index(cls, index: SymbolIndex) -> 'ModuleGraph':
+        graph = cls()
+        resolve = index.resolver.resolve
+        for path, record in sorted(index.files.items()):
+            targets = graph.edges.setdefault(path, {})
+            for specifier, kind in record.get('deps', ()):
+                target = resolve(specifier, path)
+                if target is None:
+                    if specifier.startswith(('.', '@/')) or any(
+                            specifier.startswith(alias[0]) for alias in index.resolver.aliases):
+                        if (path, specifier) not in graph.unresolved:
+                            graph.unresolved.append((path, specifier))
+                    continue
+                graph.edges.setdefault(target, {})
+                if _KIND_RANK[kind] > _KIND_RANK.get(targets.get(target), -1):
+                    targets[target] = kind
+        return graph
+
+    def dependencies(self, path: str, kinds=RUNTIME_KINDS) -> list[str]:
+        return [target for target, kind in self.edges.get(path, {}).items() if kind in kinds]
+
+    def closure(self, start: str, kinds=RUNTIME_KINDS, exclude=()) -> set[str]:
+        """Every module transitively imported by start (start included),
+        not walking into the modules in exclude."""
+        seen = {start, *exclude}
+        stack = [start]
+        while stack:
+            for target in self.dependencies(stack.pop(), kinds):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen.difference(exclude)
+
+    def fan_in(self, kinds=RUNTIME_KINDS) -> Counter:
+        counts = Counter({path: 0 for path in self.edges})
+        for path in self.edges:
+            for target in self.dependencies(path, kinds):
+                counts[target] += 1
+        return counts
+
+    def cycles(self, kinds=RUNTIME_KINDS) -> list[list[str]]:
+        """Strongly connected components with more than one module, or a
+        module importing itself (iterative Tarjan)."""
+        index_of: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+        for root in sorted(self.edges):
+            if root in index_of:
+                continue
+            work = [(root, iter(self.dependencies(root, kinds)))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index_of:
+                        index_of[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.dependencies(child, kinds))))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.dependencies(node, kinds):
+                            components.append(sorted(component))
+        return sorted(components, key=len, reverse=True)
+
+    def cycle_path(self, component: list[str], kinds=RUNTIME_KINDS) -> list[str]:
+        """One concrete import cycle through the first module of a component."""
+        members = set(component)
+        start = component[0]
+        parents = {start: None}
+        queue = [start]
+        for node in queue:
+            for target in self.dependencies(node, kinds):
+                if target == start:
+                    path = [node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return list(reversed(path)) + [start]
+                if target in members and target not in parents:
+                    parents[target] = node
+                    queue.append(target)
+        return [start]
+
+    def to_json(self) -> dict:
+        return {'edges': self.edges, 'unresolved': self.unresolved}
+
+
+def load_graph(root: Path | str = REPO_ROOT) -> ModuleGraph:
+    index = SymbolIndex(root)
+    index.refresh()
+    return ModuleGraph.from_index(index)
+
+
+def _size(root: Path, paths) -> int:
+    return sum(os.path.getsize(root / path) for path in paths)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.graph', description='Report on the src/ import graph.')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--top', type=int, default=15, help='fan-in modules to list (default: %(default)s)')
+    parser.add_argument('--closure', metavar='PATH', help='print the transitive import closure of one module')
+    parser.add_argument('--json', action='store_true', help='dump the graph as JSON')
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    graph = load_graph(root)
+
+    if args.json:
+        json.dump(graph.to_json(), sys.stdout, indent=2, sort_keys=True)
+        print()
+        return 0
+
+    if args.closure:
+        for path in sorted(graph.closure(args.closure)):
+            print(path)
+        return 0
+
+    edge_count = sum(len(targets) for targets in graph.edges.values())
+    print(f'{len(graph.edges)} modules, {edge_count} edges')
+    for path, specifier in graph.unresolved:
+        print(f'unresolved: {path} -> {specifier}')
+
+    cycles = graph.cycles()
+    print(f'\nCycles ({len(cycles)}):')
+    for component in cycles:
+        print(f'  {len(component)} modules: ' + ' -> '.join(graph.cycle_path(component)))
+
+    print('\nTop fan-in (runtime imports):')
+    for path, count in graph.fan_in().most_common(args.top):
+        print(f'  {count:>4}  {path}')
+
+    total = _size(root, graph.edges)
+    print(f'\nScene closures (static imports; {len(graph.edges)} modules, {total / 1024:.0f} KiB in src/):')
+    scenes = sorted(path for path in graph.edges if path.startswith(SCENES_DIR))
+    rows = []
+    for scene in [ENTRY_POINT] + scenes:
+        if scene not in graph.edges:
+            continue
+        closure = graph.closure(scene)
+        rows.append((len(closure), _size(root, closure), scene))
+    for count, size, scene in sorted(rows, reverse=True):
+        print(f'  {count:>4} modules  {size / 1024:>7.1f} KiB  {100 * size / total:>5.1f}%  {scene}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
@@ -0,0 +1,81 @@
+"""
+Search the tree with a bytes regex over memory-mapped files (see reader.py).
+
+    python -m codemod.grep 'console\\.(log|warn|error)\\('
+    python -m codemod.grep --json --root /path/to/copy 'switch\\s*\\('
+
+Prints each match with its line, then the peak RSS of the scan on stderr.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+from .cli import run_cli
+from .engine import MIN_FILES_FOR_POOL, REPO_ROOT, SOURCE_EXTENSIONS, SRC_DIR
+from .reader import Region, peak_rss_kb, scan_file
+
+
+def _scan_file(root: str, path: str, pattern: bytes, flags: int) -> list[Region]:
+    # re caches the compiled pattern per worker
+    return scan_file(path, os.path.join(root, path), re.compile(pattern, flags))
+
+
+def source_paths(root: Path) -> list[str]:
+    return sorted(Path(dirpath, filename).relative_to(root).as_posix()
+                  for dirpath, _, filenames in os.walk(root / SRC_DIR)
+                  for filename in filenames if filename.endswith(SOURCE_EXTENSIONS))
+
+
+def scan(pattern: bytes, root: Path | str = REPO_ROOT, paths: list[str] | None = None,
+         jobs: int | None = None, flags: int = 0) -> list[Region]:
+    """Matches of pattern in paths (default: every source file under src/)."""
+    root = Path(root)
+    if paths is None:
+        paths = source_paths(root)
+    if len(paths) < MIN_FILES_FOR_POOL or jobs == 1:
+        results = [_scan_file(str(root), path, pattern, flags) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_scan_file, [str(root)] * len(paths), paths, [pattern] * len(paths),
+                                    [flags] * len(paths), chunksize=16))
+    return [region for regions in results for region in regions]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.grep',
+                                     description='Search the tree with a bytes regex over memory-mapped files.')
+    parser.add_argument('pattern', help='Python regular expression, matched against UTF-8 bytes')
+    parser.add_argument('paths', nargs='*', metavar='PATH', help='repo-relative files (default: all of src/)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--ignore-case', '-i', action='store_true', help='case-insensitive match')
+    parser.add_argument('--json', action='store_true', help='print matches as a JSON array')
+    args = parser.parse_args(argv)
+
+    try:
+        re.compile(args.pattern.encode('utf-8'))
+    except re.error as exc:
+        print(f'Invalid pattern: {exc}', file=sys.stderr)
+        return 2
+    regions = scan(args.pattern.encode('utf-8'), args.root, args.paths or None, args.jobs,
+                   re.IGNORECASE if args.ignore_case else 0)
+    if args.json:
+        json.dump([asdict(region) for region in regions], sys.stdout, indent=2)
+        print()
+    else:
+        for region in regions:
+            print(f'{region.path}:{region.line}: {region.text}')
+    peak, workers = peak_rss_kb(), peak_rss_kb(children=True)
+    memory = f', peak RSS {peak / 1024:.1f} MiB (workers {workers / 1024:.1f} MiB)' if peak is not None else ''
+    print(f'{len(regions)} match(es){memory}', file=sys.stderr)
+    return 0 if regions else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
@@ -0,0 +1,312 @@
+"""
+Per-file import/export index.
+
+parse_imports() reads every top-level static import declaration of a file from
+its token stream in one pass: module, default/namespace bindings and named
+specifiers with their local names. parse_exports() does the same for export
+declarations and re-exports. referenced_names() collects the identifiers used
+anywhere outside the import declarations (including inside template literal
+expressions), which is what unused-import detection is checked against.
+
+Only declarations are modelled; dynamic import() and import.meta are ignored.
+"""
+
+from dataclasses import dataclass, field
+
+from .tokenizer import IDENT, PUNCT, STRING, TEMPLATE, Token, template_tokens
+
+
+@dataclass
+class ImportSpecifier:
+    # Name exported by the module and the local binding it is imported as
+    imported: str
+    local: str
+    # Inline `type` modifier: import { type Foo } from ...
+    type_only: bool
+    # Source text of the specifier, e.g. 'type Foo' or 'A as B'
+    text: str
+
+
+@dataclass
+class ImportDeclaration:
+    module: str
+    # Offsets of the declaration from `import` through the optional ';'
+    start: int
+    end: int
+    # Token index range [first, last] in the token list it was parsed from
+    first: int
+    last: int
+    # import type { ... } / import type X from ...
+    type_only: bool = False
+    default: str | None = None
+    namespace: str | None = None
+    named: list[ImportSpecifier] = field(default_factory=list)
+    # Token indexes of the named-import braces, None without braces
+    open_brace: int | None = None
+    close_brace: int | None = None
+    # Source text of the module string including quotes
+    module_text: str = ''
+    semicolon: bool = False
+
+    @property
+    def side_effect_only(self) -> bool:
+        return self.default is None and self.namespace is None and self.open_brace is None
+
+    def local_names(self) -> list[str]:
+        names = [self.default] if self.default else []
+        if self.namespace:
+            names.append(self.namespace)
+        names.extend(spec.local for spec in self.named)
+        return names
+
+
+def _parse_specifiers(source: str, tokens: list[Token], open_index: int, close_index: int) -> list[ImportSpecifier]:
+    specifiers = []
+    group = []
+    for tok in tokens[open_index + 1:close_index + 1]:
+        if tok.text in (',', '}'):
+            if group:
+                type_only = len(group) > 1 and group[0].text == 'type' and group[1].text != 'as'
+                names = group[1:] if type_only else group
+                imported = names[0].text
+                local = names[2].text if len(names) >= 3 and names[1].text == 'as' else imported
+                text = source[group[0].start:group[-1].end]
+                specifiers.append(ImportSpecifier(imported, local, type_only, text))
+            group = []
+        else:
+            group.append(tok)
+    return specifiers
+
+
+def parse_imports(source: str, tokens: list[Token]) -> list[ImportDeclaration]:
+    """Parse the top-level static import declarations of a tokenized file."""
+    declarations = []
+    depth = 0
+    i = 0
+    count = len(tokens)
+    while i < count:
+        tok = tokens[i]
+        if tok.kind == PUNCT and tok.text in ('{', '(', '['):
+            depth += 1
+        elif tok.kind == PUNCT and tok.text in ('}', ')', ']'):
+            depth -= 1
+        elif (depth == 0 and tok.kind == IDENT and tok.text == 'import'
+              and i + 1 < count and tokens[i + 1].text not in ('(', '.')):
+            decl = ImportDeclaration(module='', start=tok.start, end=tok.end, first=i, last=i)
+            j = i + 1
+            if tokens[j].text == 'type' and j + 1 < count and tokens[j + 1].text not in (',', 'from'):
+                decl.type_only = True
+                j += 1
+            while j < count and tokens[j].kind != STRING:
+                t = tokens[j]
+                if t.text == '{':
+                    decl.open_brace = j
+                    j += 1
+                    while j < count and tokens[j].text != '}':
+                        j += 1
+                    decl.close_brace = j
+                    decl.named = _parse_specifiers(source, tokens, decl.open_brace, j)
+                elif t.text == '*' and j + 2 < count and tokens[j + 1].text == 'as':
+                    decl.namespace = tokens[j + 2].text
+                    j += 2
+                elif t.kind == IDENT and t.text != 'from' and decl.default is None and decl.open_brace is None:
+                    decl.default = t.text
+                j += 1
+            if j >= count:
+                break
+            decl.module_text = tokens[j].text
+            decl.module = tokens[j].text[1:-1]
+            if j + 1 < count and tokens[j + 1].text == ';':
+                j += 1
+                decl.semicolon = True
+            decl.last = j
+            decl.end = tokens[j].end
+            declarations.append(decl)
+            i = j
+        i += 1
+    return declarations
+
+
+@dataclass
+class ExportEntry:
+    # Exported name ('default' for export default) and the local it refers to
+    name: str
+    local: str
+    # const, function, class, enum, interface, type, namespace, default or
+    # specifier (export { a } / export { a } from ...)
+    kind: str
+    start: int
+    # Module of a re-export (export { a } from '...'), else None
+    module: str | None = None
+
+
+@dataclass
+class StarExport:
+    module: str
+    start: int
+
+
+_DECLARATION_KEYWORDS = frozenset(('const', 'let', 'var', 'function', 'class', 'enum',
+                                   'interface', 'type', 'namespace'))
+_EXPORT_MODIFIERS = frozenset(('declare', 'abstract', 'async'))
+
+
+def parse_exports(tokens: list[Token]) -> tuple[list[ExportEntry], list[StarExport]]:
+    """Top-level exports of a tokenized file, plus `export * from` modules."""
+    exports = []
+    stars = []
+    depth = 0
+    count = len(tokens)
+    for i, tok in enumerate(tokens):
+        if tok.kind == PUNCT and tok.text in ('{', '(', '['):
+            depth += 1
+            continue
+        if tok.kind == PUNCT and tok.text in ('}', ')', ']'):
+            depth -= 1
+            continue
+        if depth != 0 or tok.kind != IDENT or tok.text != 'export' or i + 1 >= count:
+            continue
+        j = i + 1
+        if tokens[j].text == 'default':
+            exports.append(ExportEntry('default', 'default', 'default', tok.start))
+            continue
+        if tokens[j].text == 'type' and j + 1 < count and tokens[j + 1].text in ('{', '*'):
+            j += 1
+        if tokens[j].text == '*':
+            k = j + 1
+            while k < count and tokens[k].kind != STRING and tokens[k].text != ';':
+                k += 1
+            if k < count and tokens[k].kind == STRING:
+                stars.append(StarExport(tokens[k].text[1:-1], tok.start))
+            continue
+        if tokens[j].text == '{':
+            k = j + 1
+            names = []
+            group = []
+            while k < count and tokens[k].text != '}':
+                if tokens[k].text == ',':
+                    names.append(group)
+                    group = []
+                else:
+                    group.append(tokens[k])
+                k += 1
+            names.append(group)
+            module = None
+            if k + 2 < count and tokens[k + 1].text == 'from' and tokens[k + 2].kind == STRING:
+                module = tokens[k + 2].text[1:-1]
+            for group in names:
+                if group and group[0].text == 'type' and len(group) > 1 and group[1].text != 'as':
+                    group = group[1:]
+                if not group:
+                    continue
+                local = group[0].text
+                name = group[2].text if len(group) >= 3 and group[1].text == 'as' else local
+                exports.append(ExportEntry(name, local, 'specifier', group[0].start, module))
+            continue
+        while j < count and tokens[j].text in _EXPORT_MODIFIERS:
+            j += 1
+        if j + 1 < count and tokens[j].text in _DECLARATION_KEYWORDS:
+            kind = tokens[j].text
+            j += 1
+            if kind == 'function' and tokens[j].text == '*':
+                j += 1
+            if kind == 'const' and tokens[j].text == 'enum':
+                kind = 'enum'
+                j += 1
+            if j < count and tokens[j].kind == IDENT:
+                exports.append(ExportEntry(tokens[j].text, tokens[j].text, kind, tokens[j].start))
+    return exports, stars
+
+
+def iter_references(source: str, tokens: list[Token], skip: set[int] = frozenset()):
+    """Yield identifier tokens used as references, skipping token indexes in
+    skip and property names after '.' or '?.'."""
+    prev = None
+    for i, tok in enumerate(tokens):
+        if i in skip:
+            prev = None
+            continue
+        if tok.kind == IDENT and not (prev is not None and prev.text in ('.', '?.')):
+            yield tok
+        elif tok.kind == TEMPLATE:
+            inner_prev = None
+            for inner in template_tokens(source, tok):
+                if inner.kind == IDENT and not (inner_prev is not None and inner_prev.text in ('.', '?.')):
+                    yield inner
+                inner_prev = inner
+        prev = tok
+
+
+def declaration_indexes(declarations: list[ImportDeclaration]) -> set[int]:
+    skip = set()
+    for decl in declarations:
+        skip.update(range(decl.first, decl.last + 1))
+    return skip
+
+
+def referenced_names(source: str, tokens: list[Token], declarations: list[ImportDeclaration]) -> set[str]:
+    """Identifiers used outside the import declarations.
+
+    Property names after '.' or '?.' are not references. Everything else is
+    counted, which over-approximates (object keys, labels) and so never
+    reports a used import as unused.
+    """
+    return {tok.text for tok in iter_references(source, tokens, declaration_indexes(declarations))}
+
+
+def render_declaration(source: str, tokens: list[Token], decl: ImportDeclaration,
+                       default: str | None, namespace: str | None,
+                       named: list[ImportSpecifier]) -> str:
+    """Source text for decl with the given bindings, keeping its style.
+
+    Multi-line braces stay one specifier per line, with a comma after the
+    last one only if the original had one.
+    """
+    parts = []
+    if default:
+        parts.append(default)
+    if namespace:
+        parts.append(f'* as {namespace}')
+    if named:
+        if decl.open_brace is not None and '\n' in source[tokens[decl.open_brace].start:tokens[decl.close_brace].end]:
+            first = tokens[decl.open_brace + 1]
+            line_start = source.rfind('\n', 0, first.start) + 1
+            indent = source[line_start:first.start]
+            trailing = ',' if tokens[decl.close_brace - 1].text == ',' else ''
+            parts.append('{\n' + ',\n'.join(f'{indent}{spec.text}' for spec in named) + trailing + '\n}')
+        else:
+            parts.append('{ ' + ', '.join(spec.text for spec in named) + ' }')
+    type_kw = 'type ' if decl.type_only else ''
+    semicolon = ';' if decl.semicolon else ''
+    return f'import {type_kw}{", ".join(parts)} from {decl.module_text}{semicolon}'
+
+
+def line_span(source: str, start: int, end: int) -> tuple[int, int]:
+    """Widen [start, end) to whole lines when nothing else is on them."""
+    line_start = source.rfind('\n', 0, start) + 1
+    line_end = source.find('\n', end)
+    line_end = len(source) if line_end == -1 else line_end + 1
+    if source[line_start:start].strip() or source[end:line_end].strip():
+        return start, end
+    return line_start, line_end
+
+
+def prune_imports(source: str, tokens: list[Token], declarations: list[ImportDeclaration],
+                  used: set[str]) -> list[tuple[int, int, str]]:
+    """(start, end, text) edits, in source order, that drop every binding not
+    in used; a declaration left without bindings is removed with its line."""
+    edits = []
+    for decl in declarations:
+        if decl.side_effect_only:
+            continue
+        default = decl.default if decl.default in used else None
+        namespace = decl.namespace if decl.namespace in used else None
+        named = [spec for spec in decl.named if spec.local in used]
+        if (default, namespace, len(named)) == (decl.default, decl.namespace, len(decl.named)):
+            continue
+        if default or namespace or named:
+            edits.append((decl.start, decl.end, render_declaration(source, tokens, decl, default, namespace, named)))
+        else:
+            start, end = line_span(source, decl.start, decl.end)
+            edits.append((start, end, ''))
+    return edits
@@ -0,0 +1,335 @@
+"""
+Targeted fixes driven by ESLint's JSON output.
+
+Reads one ESLint report for the whole tree, indexes its messages by file and
+rule, and applies the narrowest fix for each finding:
+
+- ESLint's own autofix, when the message carries one
+- no-unused-vars on an import binding: the binding (or the whole declaration)
+  is removed
+- no-unused-vars on a variable or parameter used nowhere else in the file: it
+  is renamed with --rename-prefix; a shorthand destructuring property keeps
+  its key (`{ foo }` becomes `{ foo: _foo }`), so the property read and what
+  a `...rest` binding holds stay the same
+- anything else: an `// eslint-disable-next-line <rule>` comment above the
+  reported line, merged with one that is already there
+
+With --strip-headers the whole-file `/* eslint-disable ... */` comments are
+removed at the same time. Their findings only show up in the report when
+ESLint ignored them, so produce it with --no-inline-config:
+
+    npx eslint -f json --no-inline-config src > eslint.json
+    python -m codemod.lintfix eslint.json --strip-headers --dry-run
+    python -m codemod.lintfix eslint.json --strip-headers
+
+Files are fixed in parallel and written together through one Transaction.
+ESLint positions are in UTF-16 code units; they are converted per file. A
+file whose content differs from the source recorded in the report is skipped.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import content_digest
+from .cli import run_cli
+from .engine import MIN_FILES_FOR_POOL, REPO_ROOT, SOURCE_EXTENSIONS, SRC_DIR, unified_diff
+from .imports import iter_references, line_span, parse_imports, prune_imports
+from .rules.eslint_issues import file_disables
+from .tokenizer import COMMENT, IDENT, STRING, TEMPLATE, Token, tokenize
+from .transaction import Transaction, TransactionError
+
+UNUSED_VARS_RULES = ('no-unused-vars', '@typescript-eslint/no-unused-vars')
+NEXT_LINE_DIRECTIVE = '// eslint-disable-next-line'
+
+
+@dataclass
+class LintMessage:
+    # None for fatal (parse) errors
+    rule: str | None
+    line: int
+    column: int
+    message: str
+    # ESLint autofix: (start, end) in UTF-16 units and the replacement
+    fix: tuple[int, int, str] | None = None
+
+
+@dataclass
+class LintedFile:
+    messages: list[LintMessage]
+    # Source ESLint linted, when the report includes it
+    source: str | None = None
+
+
+def load_report(data: list[dict], root: Path) -> dict[str, LintedFile]:
+    """Index an ESLint JSON report by repo-relative path; files outside root
+    and files without messages are dropped."""
+    index = {}
+    for entry in data:
+        try:
+            path = Path(entry['filePath']).resolve().relative_to(root.resolve()).as_posix()
+        except ValueError:
+            continue
+        messages = []
+        for message in entry.get('messages', []):
+            fix = message.get('fix')
+            messages.append(LintMessage(message.get('ruleId'), message.get('line', 1), message.get('column', 1),
+                                        message.get('message', ''),
+                                        (fix['range'][0], fix['range'][1], fix['text']) if fix else None))
+        if messages:
+            index[path] = LintedFile(messages, entry.get('source'))
+    return index
+
+
+class _Positions:
+    """Converts ESLint line/column and UTF-16 offsets to str offsets."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.line_starts = [0]
+        for i, char in enumerate(source):
+            if char == '\n':
+                self.line_starts.append(i + 1)
+        # UTF-16 offsets of the astral characters, which take two units
+        self.astral = [i + k for k, i in enumerate(i for i, char in enumerate(source) if ord(char) > 0xFFFF)]
+
+    def line_start(self, line: int) -> int:
+        return self.line_starts[min(max(line, 1), len(self.line_starts)) - 1]
+
+    def offset(self, line: int, column: int) -> int:
+        start = self.line_start(line)
+        units = column - 1
+        i = start
+        while units > 0 and i < len(self.source) and self.source[i] != '\n':
+            units -= 2 if ord(self.source[i]) > 0xFFFF else 1
+            i += 1
+        return i
+
+    def from_utf16(self, units: int) -> int:
+        return units - bisect.bisect_left(self.astral, units)
+
+
+def _merge_directive(source: str, positions: _Positions, line: int,
+                     rules: list[str]) -> tuple[int, int, str] | None:
+    """Edit adding a disable-next-line comment for rules above line, or None
+    when the line is already fully suppressed."""
+    start = positions.line_start(line)
+    indent_end = start
+    while indent_end < len(source) and source[indent_end] in ' \t':
+        indent_end += 1
+    if line > 1:
+        prev_start = positions.line_start(line - 1)
+        prev = source[prev_start:start - 1]
+        stripped = prev.strip()
+        if stripped.startswith(NEXT_LINE_DIRECTIVE):
+            body = stripped[len(NEXT_LINE_DIRECTIVE):]
+            description = ''
+            if '--' in body:
+                body, description = body.split('--', 1)
+                description = ' --' + description
+            existing = [rule.strip() for rule in body.split(',') if rule.strip()]
+            if not existing or all(rule in existing for rule in rules):
+                # Bare directives disable every rule
+                return None
+            merged = existing + [rule for rule in rules if rule not in existing]
+            indent = prev[:len(prev) - len(prev.lstrip())]
+            return prev_start, start - 1, f'{indent}{NEXT_LINE_DIRECTIVE} {", ".join(merged)}{description}'
+    return start, start, f'{source[start:indent_end]}{NEXT_LINE_DIRECTIVE} {", ".join(rules)}\n'
+
+
+def _shorthand_property(code: list[Token], i: int) -> bool:
+    """Whether code[i] is a shorthand property of an object destructuring
+    pattern, where the name is both the key read and the binding."""
+    if i == 0 or code[i - 1].text not in ('{', ','):
+        return False
+    if i + 1 < len(code) and code[i + 1].text not in (',', '}', '='):
+        return False
+    depth = 0
+    for j in range(i - 1, -1, -1):
+        text = code[j].text
+        if text in (')', ']', '}'):
+            depth += 1
+        elif text in ('(', '[', '{'):
+            if depth:
+                depth -= 1
+                continue
+            # Patterns open after a declaration keyword, a parameter list or
+            # an enclosing pattern; blocks and object literals do not count
+            return text == '{' and j > 0 and code[j - 1].text in ('const', 'let', 'var', '(', ',', ':', '[')
+    return False
+
+
+def fix_source(source: str, messages: list[LintMessage], strip_headers: bool = False,
+               rename_prefix: str = '_') -> tuple[str, list[str]]:
+    """Apply the narrowest fix for every message; return (source, notes)."""
+    positions = _Positions(source)
+    tokens = list(tokenize(source, comments=True))
+    code = [tok for tok in tokens if tok.kind != COMMENT]
+    # Offsets inside multi-line strings, templates or comments cannot take a
+    # comment line above them
+    multiline = [(tok.start, tok.end) for tok in tokens
+                 if tok.kind in (STRING, TEMPLATE, COMMENT) and '\n' in tok.text]
+    token_at = {tok.start: i for i, tok in enumerate(code)}
+    # References include template literal expressions, so `${x}` counts as a use
+    counts = Counter(tok.text for tok in iter_references(source, code))
+    declarations = parse_imports(source, code)
+
+    edits = []
+    notes = []
+    unused_imports = set()
+    disables = defaultdict(list)
+    for message in messages:
+        where = f'line {message.line}'
+        if message.rule is None:
+            notes.append(f'{where}: not fixable: {message.message}')
+            continue
+        if message.fix is not None:
+            start, end = positions.from_utf16(message.fix[0]), positions.from_utf16(message.fix[1])
+            edits.append((start, end, message.fix[2], f'{where}: autofix {message.rule}'))
+            continue
+        if message.rule in UNUSED_VARS_RULES:
+            i = token_at.get(positions.offset(message.line, message.column))
+            tok = code[i] if i is not None else None
+            if tok is not None and tok.kind == IDENT:
+                decl = next((d for d in declarations if d.start <= tok.start < d.end), None)
+                if decl is not None:
+                    unused_imports.add(tok.text)
+                    notes.append(f'{where}: removed unused import {tok.text}')
+                    continue
+                if counts[tok.text] == 1 and not tok.text.startswith(rename_prefix):
+                    key = f'{tok.text}: ' if _shorthand_property(code, i) else ''
+                    edits.append((tok.start, tok.end, key + rename_prefix + tok.text,
+                                  f'{where}: renamed {tok.text} to {rename_prefix}{tok.text}'))
+                    continue
+        line_start = positions.line_start(message.line)
+        if any(start < line_start < end for start, end in multiline):
+            notes.append(f'{where}: {message.rule} inside a multi-line literal, not suppressed')
+            continue
+        if message.rule not in disables[message.line]:
+            disables[message.line].append(message.rule)
+
+    if unused_imports:
+        used = {name for decl in declarations for name in decl.local_names()} - unused_imports
+        for start, end, text in prune_imports(source, code, declarations, used):
+            edits.append((start, end, text, None))
+    for line, rules in disables.items():
+        edit = _merge_directive(source, positions, line, rules)
+        if edit is not None:
+            edits.append((*edit, f'line {line}: disabled {", ".join(rules)} for this line'))
+    if strip_headers:
+        for start, end, rules in file_disables(source):
+            start, end = line_span(source, start, end)
+            edits.append((start, end, '', f'line {source.count(chr(10), 0, start) + 1}: removed file-wide '
+                                          f'disable of {", ".join(rules) if rules else "all rules"}'))
+
+    # Apply bottom-up; an edit overlapping one already applied is left for
+    # the next lint pass, as ESLint itself does with conflicting fixes
+    applied_start = len(source) + 1
+    for start, end, text, note in sorted(edits, key=lambda edit: (edit[0], edit[1]), reverse=True):
+        if end > applied_start:
+            notes.append(f'{note or "edit"} skipped: overlaps another fix, lint again')
+            continue
+        source = source[:start] + text + source[end:]
+        applied_start = start
+        if note:
+            notes.append(note)
+    return source, notes
+
+
+def _fix_file(root: str, path: str, linted: LintedFile, strip_headers: bool,
+              rename_prefix: str) -> tuple[str, str, str, str, list[str]]:
+    with open(os.path.join(root, path), 'rb') as f:
+        data = f.read()
+    source = data.decode('utf-8')
+    # Positions in a stale report point at the wrong code
+    if linted.source is not None and linted.source != source:
+        return path, content_digest(data), source, source, ['skipped: changed since the report was made, lint again']
+    new, notes = fix_source(source, linted.messages, strip_headers, rename_prefix)
+    return path, content_digest(data), source, new, notes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.lintfix',
+                                     description='Fix or suppress ESLint findings one by one from its JSON report.')
+    parser.add_argument('report', help="ESLint report from `eslint -f json` ('-' for stdin)")
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--rule', action='append', metavar='RULE', help='only handle these ESLint rules (repeatable)')
+    parser.add_argument('--strip-headers', action='store_true', help='remove whole-file /* eslint-disable */ comments')
+    parser.add_argument('--rename-prefix', default='_', help='prefix for unused variables (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--dry-run', '-n', action='store_true', help='print a unified diff instead of writing')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    root = Path(args.root)
+    try:
+        if args.report == '-':
+            data = json.load(sys.stdin)
+        else:
+            with open(args.report, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+    except (OSError, ValueError) as exc:
+        print(f'Error: cannot read ESLint report: {exc}', file=sys.stderr)
+        return 2
+
+    index = load_report(data, root)
+    if args.rule:
+        index = {path: LintedFile(kept, linted.source) for path, linted in index.items()
+                 if (kept := [m for m in linted.messages if m.rule in args.rule])}
+    if args.strip_headers:
+        # Files whose only problem is the header itself
+        for dirpath, _, filenames in os.walk(root / SRC_DIR):
+            for filename in filenames:
+                rel = Path(dirpath, filename).relative_to(root).as_posix()
+                if filename.endswith(SOURCE_EXTENSIONS) and rel not in index:
+                    with open(os.path.join(dirpath, filename), 'r', encoding='utf-8') as f:
+                        if file_disables(f.read()):
+                            index[rel] = LintedFile([])
+
+    by_rule = Counter(message.rule for linted in index.values() for message in linted.messages)
+    paths = sorted(index)
+    jobs = args.jobs or os.cpu_count() or 1
+    call_args = (paths, [index[path] for path in paths], [args.strip_headers] * len(paths),
+                 [args.rename_prefix] * len(paths))
+    if jobs == 1 or len(paths) < MIN_FILES_FOR_POOL:
+        results = list(map(_fix_file, [str(root)] * len(paths), *call_args))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_fix_file, [str(root)] * len(paths), *call_args, chunksize=4))
+
+    transaction = Transaction(root)
+    out = sys.stderr if args.dry_run else sys.stdout
+    changed = 0
+    for path, digest, source, new, notes in results:
+        for note in notes:
+            print(f'{path}: {note}', file=out)
+        if new == source:
+            continue
+        changed += 1
+        if args.dry_run:
+            sys.stdout.write(unified_diff(path, source, new))
+        else:
+            transaction.stage(path, digest, new)
+    try:
+        transaction.commit()
+    except TransactionError as exc:
+        print(f'Error: {exc}', file=sys.stderr)
+        return 1
+
+    for rule, count in by_rule.most_common():
+        print(f'{count:>6}  {rule or "(fatal)"}', file=out)
+    print(f'{sum(by_rule.values())} findings in {len(paths)} files, {changed} '
+          f'{"would change" if args.dry_run else "changed"}, {(time.perf_counter() - started) * 1000:.1f} ms',
+          file=out)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
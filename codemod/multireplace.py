@@ -0,0 +1,61 @@
+"""
+Single-pass multi-pattern literal replacement.
+
+MultiReplacer compiles a (pattern, replacement) table into one regex built from
+a trie of the patterns, so shared prefixes such as "console.log('[Boss]" are
+matched once instead of once per entry. Each input is rewritten in a single
+left-to-right scan; at any position the longest matching pattern wins and
+matches never overlap. The cost stays proportional to the input size as the
+table grows, unlike calling str.replace once per entry.
+"""
+
+import re
+from collections import Counter
+
+
+def _trie_pattern(node: dict) -> str:
+    # '' marks that a pattern ends at this node
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # Greedy optional: prefer the longer pattern, fall back to ending here
+        body = '(?:' + body + ')?'
+    return body
+
+
+def compile_literals(patterns) -> re.Pattern:
+    """Compile literal strings into one trie-shaped regex."""
+    trie: dict = {}
+    for pattern in patterns:
+        if not pattern:
+            raise ValueError('empty pattern')
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return re.compile(_trie_pattern(trie))
+
+
+class MultiReplacer:
+    def __init__(self, table):
+        self.table = dict(table)
+        self.regex = compile_literals(self.table) if self.table else None
+
+    def replace(self, text: str) -> tuple[str, Counter]:
+        """Return the rewritten text and a Counter of matches per pattern."""
+        counts = Counter()
+        if self.regex is None:
+            return text, counts
+
+        def substitute(match):
+            found = match.group(0)
+            counts[found] += 1
+            return self.table[found]
+
+        return self.regex.sub(substitute, text), counts
+
+    def unmatched(self, counts: Counter) -> list[str]:
+        """Patterns from the table that matched zero times."""
+        return [pattern for pattern in self.table if not counts[pattern]]
@@ -0,0 +1,290 @@
+"""
+Anchor-based structural patches for TypeScript classes.
+
+Instead of matching exact multi-line text, a patch names where it goes:
+a class, a member to insert after or before, or a statement inside a method.
+index_classes() finds every class of a file and its members (with their doc
+comments) in one pass over the token stream, so whitespace, comments and
+formatting changes elsewhere do not move the anchors.
+
+Patches are idempotent: a MemberPatch is skipped when the class already has a
+member of that name, a StatementPatch when the method body already mentions
+its marker identifier. A missing class, member or statement anchor raises
+AnchorError instead of silently doing nothing.
+
+Coverage is limited to what the old fix scripts patched: SpawnSystem
+(spawn_system.py) and, in src/entities/, only Villager (villager.py). Vampire
+and the other Monster and Boss subclasses are generated and synced from
+entity_specs.py by python -m codemod.generate; the remaining entity files have
+no anchor specs. python -m codemod.coverage checks the anchors and lists
+which entity files are patched, generated or skipped.
+"""
+
+import textwrap
+from dataclasses import dataclass, field
+
+from .rule import Rule
+from .tokenizer import COMMENT, IDENT, STRING, tokenize
+
+_MODIFIERS = frozenset(('public', 'private', 'protected', 'static', 'readonly', 'async', 'abstract',
+                        'override', 'declare', 'get', 'set', 'accessor'))
+_OPEN = ('{', '(', '[')
+_CLOSE = ('}', ')', ']')
+
+
+class AnchorError(Exception):
+    pass
+
+
+@dataclass
+class Member:
+    name: str
+    # 'method' (including constructor and accessors) or 'property'
+    kind: str
+    # Offset of the leading doc/line comments, or of the first token
+    start: int
+    end: int
+    # Offsets of the method body braces, None for properties
+    body_start: int | None = None
+    body_end: int | None = None
+
+
+@dataclass
+class ClassInfo:
+    name: str
+    # Offsets just inside the class body braces
+    body_start: int
+    body_end: int
+    members: dict[str, Member] = field(default_factory=dict)
+
+
+def _matching(tokens, i: int) -> int:
+    """Index of the bracket closing the one at tokens[i]."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        text = tokens[j].text
+        if text in _OPEN:
+            depth += 1
+        elif text in _CLOSE:
+            depth -= 1
+            if depth == 0:
+                return j
+    raise AnchorError(f'unbalanced {tokens[i].text!r} at offset {tokens[i].start}')
+
+
+def _parse_member(tokens, i: int, end: int) -> tuple[Member | None, int]:
+    """Parse the member starting at code token i; return it and the index
+    after it."""
+    j = i
+    while j < end and tokens[j].text in _MODIFIERS and tokens[j + 1].text not in ('(', ':', '=', ';', '?', '<'):
+        j += 1
+    if j < end and tokens[j].text == '*':
+        j += 1
+    name_tok = tokens[j]
+    if name_tok.text == '[':
+        # Computed or index-signature member: [key: string]: T
+        j = _matching(tokens, j)
+        name = None
+    else:
+        name = name_tok.text[1:-1] if name_tok.kind == STRING else name_tok.text
+    j += 1
+    if j < end and tokens[j].text in ('?', '!'):
+        j += 1
+
+    if j < end and tokens[j].text in ('(', '<'):
+        if tokens[j].text == '<':
+            while tokens[j].text != '(':
+                j += 1
+        j = _matching(tokens, j) + 1
+        # Skip the return type up to the body; a '{' right after ':' or a
+        # type operator is an object type literal, not the body
+        while j < end and tokens[j].text not in ('{', ';'):
+            if tokens[j].text in _OPEN:
+                j = _matching(tokens, j)
+            j += 1
+        while (j < end and tokens[j].text == '{'
+               and tokens[j - 1].text in (':', '|', '&', '<', ',', '=>')):
+            j = _matching(tokens, j) + 1
+            while j < end and tokens[j].text not in ('{', ';'):
+                if tokens[j].text in _OPEN:
+                    j = _matching(tokens, j)
+                j += 1
+        if j < end and tokens[j].text == '{':
+            close = _matching(tokens, j)
+            member = Member(name, 'method', tokens[i].start, tokens[close].end,
+                            tokens[j].end, tokens[close].start)
+            return member, close + 1
+        # Overload or abstract signature
+        return Member(name, 'method', tokens[i].start, tokens[j].end if j < end else tokens[j - 1].end), j + 1
+
+    while j < end and tokens[j].text != ';':
+        if tokens[j].text in _OPEN:
+            j = _matching(tokens, j)
+        j += 1
+    last = tokens[j] if j < end else tokens[j - 1]
+    return Member(name, 'property', tokens[i].start, last.end), j + 1
+
+
+def index_classes(source: str) -> dict[str, ClassInfo]:
+    """Every named class declared in source, with its members."""
+    all_tokens = list(tokenize(source, comments=True))
+    tokens = [tok for tok in all_tokens if tok.kind != COMMENT]
+    # Start offset of the comments directly above each code token; a comment
+    # after code on the same line (`x = 1; // ms`) belongs to that line
+    doc_start = {}
+    pending = None
+    for tok in all_tokens:
+        if tok.kind == COMMENT:
+            if pending is None and not source[source.rfind('\n', 0, tok.start) + 1:tok.start].strip():
+                pending = tok.start
+        else:
+            if pending is not None:
+                doc_start[tok.start] = pending
+            pending = None
+
+    classes = {}
+    for i, tok in enumerate(tokens[:-2]):
+        if tok.kind != IDENT or tok.text != 'class' or (i and tokens[i - 1].text == '.'):
+            continue
+        name_tok = tokens[i + 1]
+        if name_tok.kind != IDENT or name_tok.text in ('extends', 'implements'):
+            continue
+        j = i + 2
+        while j < len(tokens) and tokens[j].text != '{':
+            if tokens[j].text in ('(', '['):
+                j = _matching(tokens, j)
+            j += 1
+        if j >= len(tokens):
+            continue
+        close = _matching(tokens, j)
+        info = ClassInfo(name_tok.text, tokens[j].end, tokens[close].start)
+        k = j + 1
+        while k < close:
+            if tokens[k].text == ';':
+                k += 1
+                continue
+            member, k = _parse_member(tokens, k, close)
+            if member.name is not None:
+                member.start = doc_start.get(member.start, member.start)
+                info.members.setdefault(member.name, member)
+        classes[info.name] = info
+    return classes
+
+
+def _line_indent(source: str, offset: int) -> str:
+    line_start = source.rfind('\n', 0, offset) + 1
+    indent = source[line_start:offset]
+    return indent if not indent.strip() else ''
+
+
+def _indent(text: str, indent: str) -> str:
+    return textwrap.indent(textwrap.dedent(text).strip('\n'), indent)
+
+
+@dataclass
+class MemberPatch:
+    """Insert a class member (written at any indentation, doc comment included)."""
+    class_name: str
+    text: str
+    # Anchor member to insert after or before; neither means end of the class
+    after: str | None = None
+    before: str | None = None
+
+    def member(self) -> Member:
+        members = index_classes(f'class _ {{\n{textwrap.dedent(self.text)}\n}}')['_'].members
+        if len(members) != 1:
+            raise ValueError(f'MemberPatch for {self.class_name} must contain exactly one member')
+        return next(iter(members.values()))
+
+    def edit(self, source: str, info: ClassInfo) -> tuple[int, str] | None:
+        new = self.member()
+        if new.name in info.members:
+            return None
+        anchor_name = self.after or self.before
+        if anchor_name is not None and anchor_name not in info.members:
+            raise AnchorError(f'class {info.name} has no member {anchor_name!r}')
+        sample = next(iter(info.members.values()), None)
+        indent = _line_indent(source, sample.start) if sample else '  '
+
+        anchor = info.members.get(anchor_name) if anchor_name else None
+        if anchor is None:
+            last = max(info.members.values(), key=lambda m: m.end, default=None)
+            anchor_kind = last.kind if last else 'method'
+        else:
+            anchor_kind = anchor.kind
+        gap = '\n\n' if 'method' in (new.kind, anchor_kind) else '\n'
+        text = _indent(self.text, indent)
+        if self.before:
+            return anchor.start - len(_line_indent(source, anchor.start)), text + gap
+        if anchor is None:
+            if last is None:
+                return info.body_start, '\n' + text + '\n'
+            anchor = last
+        return anchor.end, gap + text
+
+
+@dataclass
+class StatementPatch:
+    """Insert statements into a method body after the statement that starts
+    with the token texts in `after`, e.g. ('let', 'villagerChance')."""
+    class_name: str
+    method: str
+    after: tuple[str, ...]
+    text: str
+    # Identifier whose presence in the body means the patch is applied
+    marker: str
+
+    def edit(self, source: str, info: ClassInfo) -> tuple[int, str] | None:
+        member = info.members.get(self.method)
+        if member is None or member.body_start is None:
+            raise AnchorError(f'class {info.name} has no method {self.method!r}')
+        body = source[member.body_start:member.body_end]
+        tokens = list(tokenize(body))
+        if any(tok.kind == IDENT and tok.text == self.marker for tok in tokens):
+            return None
+        width = len(self.after)
+        depth = 0
+        for i, tok in enumerate(tokens):
+            if tok.text in _OPEN:
+                depth += 1
+            elif tok.text in _CLOSE:
+                depth -= 1
+            elif depth == 0 and tuple(t.text for t in tokens[i:i + width]) == self.after:
+                j = i
+                while j < len(tokens) and not (tokens[j].text == ';' and depth == 0):
+                    if tokens[j].text in _OPEN:
+                        j = _matching(tokens, j)
+                    j += 1
+                if j >= len(tokens):
+                    break
+                indent = _line_indent(body, tok.start)
+                return member.body_start + tokens[j].end, '\n\n' + _indent(self.text, indent)
+        raise AnchorError(f'{info.name}.{self.method} has no statement starting with {" ".join(self.after)!r}')
+
+
+def apply_patches(source: str, patches: list) -> str:
+    """Apply every patch to source, indexing its classes once."""
+    classes = index_classes(source)
+    edits = []
+    for order, patch in enumerate(patches):
+        info = classes.get(patch.class_name)
+        if info is None:
+            raise AnchorError(f'class {patch.class_name} not found')
+        edit = patch.edit(source, info)
+        if edit is not None:
+            edits.append((edit[0], order, edit[1]))
+    # Bottom-up so offsets stay valid; patches at the same offset keep their order
+    for offset, _, text in sorted(edits, reverse=True):
+        source = source[:offset] + text + source[offset:]
+    return source
+
+
+class PatchRule(Rule):
+    """Rule applying structural patches; patches maps path -> patch list."""
+    patches: dict[str, list] = {}
+
+    def matches(self, path: str) -> bool:
+        return path in self.patches
+
+    def apply(self, path: str, source: str) -> str:
+        return apply_patches(source, self.patches[path])
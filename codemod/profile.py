@@ -0,0 +1,87 @@
+"""
+Profiling output for codemod runs.
+
+Every run records a span per file and rule (plus one for reading and hashing
+the file) with its wall time and the file's size; the engine already timed
+each rule, so this costs one list entry per span. From a RunReport this module
+renders:
+
+- a Chrome trace-event JSON file (chrome://tracing, https://ui.perfetto.dev),
+  one track per worker process
+- a table of the slowest file x rule pairs
+
+    python -m codemod --trace codemod-trace.json --profile
+"""
+
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from .engine import READ_SPAN, RunReport, Span
+
+SLOWEST_COUNT = 20
+
+
+def _us(seconds: float) -> float:
+    return round(seconds * 1e6, 1)
+
+
+def chrome_trace(report: RunReport) -> dict:
+    """Trace-event document with complete ('X') events in microseconds since
+    the start of the run."""
+    events = []
+    parent = os.getpid()
+    workers = sorted({span.pid for span in report.spans} - {parent})
+    names = {parent: 'codemod'} | {pid: f'worker {i + 1}' for i, pid in enumerate(workers)}
+    for pid, name in names.items():
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': pid, 'args': {'name': name}})
+
+    for span in report.spans:
+        events.append({
+            'name': span.name, 'cat': 'read' if span.name == READ_SPAN else 'rule', 'ph': 'X',
+            'ts': _us(span.start - report.started), 'dur': _us(span.seconds),
+            'pid': span.pid, 'tid': span.pid,
+            'args': {'path': span.path, 'bytes': span.size},
+        })
+    events.append({'name': 'run', 'cat': 'engine', 'ph': 'X', 'ts': 0, 'dur': _us(report.elapsed),
+                   'pid': parent, 'tid': parent,
+                   'args': {'files': report.files_read, 'cached': report.files_cached,
+                            'changed': len(report.files_changed), 'jobs': report.jobs}})
+    commit_start, commit_seconds = report.commit
+    if commit_start:
+        events.append({'name': 'commit', 'cat': 'engine', 'ph': 'X', 'ts': _us(commit_start - report.started),
+                       'dur': _us(commit_seconds), 'pid': parent, 'tid': parent,
+                       'args': {'files': len(report.files_changed)}})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_trace(report: RunReport, path: Path | str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(report), f)
+
+
+def slowest(report: RunReport, count: int = SLOWEST_COUNT) -> list[Span]:
+    """The count slowest file x rule spans (reads excluded)."""
+    spans = [span for span in report.spans if span.name != READ_SPAN]
+    return sorted(spans, key=lambda span: span.seconds, reverse=True)[:count]
+
+
+def format_slowest(report: RunReport, count: int = SLOWEST_COUNT) -> str:
+    spans = slowest(report, count)
+    if not spans:
+        return 'No rule spans recorded'
+    total = defaultdict(float)
+    for span in report.spans:
+        total[span.name] += span.seconds
+    path_width = max(len('file'), *(len(span.path) for span in spans))
+    rule_width = max(len('rule'), *(len(span.name) for span in spans))
+    lines = [f'{"file":<{path_width}}  {"rule":<{rule_width}}  {"ms":>8}  {"KiB":>7}  {"MB/s":>7}  {"% rule":>6}']
+    for span in spans:
+        rate = span.size / span.seconds / 1e6 if span.seconds else 0.0
+        share = span.seconds / total[span.name] * 100 if total[span.name] else 0.0
+        lines.append(f'{span.path:<{path_width}}  {span.name:<{rule_width}}  {span.seconds * 1000:>8.2f}  '
+                     f'{span.size / 1024:>7.1f}  {rate:>7.2f}  {share:>6.1f}')
+    read = total.get(READ_SPAN, 0.0)
+    lines.append(f'reading and hashing: {read * 1000:.1f} ms over {report.files_read} files')
+    return '\n'.join(lines)
@@ -0,0 +1,79 @@
+"""
+Memory-mapped file reading.
+
+mapped() maps a file read-only and yields the buffer, so it can be hashed,
+searched with a bytes regex or lexed with tokenize() without being decoded;
+only the regions a caller keeps (a match, a clause, a file being rewritten)
+are turned into str. The pages belong to the page cache rather than the
+Python heap, so the peak RSS of a whole-tree scan does not grow with the size
+of the tree.
+
+The engine hashes every file through this and skips decoding a file when
+none of its matching rules' triggers occur in it (see Rule.trigger);
+python -m codemod.grep searches the tree the same way.
+"""
+
+import mmap
+import os
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def mapped(path: str | Path) -> Iterator[mmap.mmap | bytes]:
+    """Read-only map of a file; empty files (which cannot be mapped) give b''."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            yield b''
+            return
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def contains_any(buffer, needles) -> bool:
+    return any(buffer.find(needle) != -1 for needle in needles)
+
+
+@dataclass
+class Region:
+    path: str
+    line: int
+    # Byte offsets in the file
+    start: int
+    end: int
+    text: str
+
+
+def scan_file(path: str, full_path: str, pattern: re.Pattern) -> list[Region]:
+    """Every match of a bytes pattern in one file, decoding only the matches."""
+    regions = []
+    with mapped(full_path) as buffer:
+        line = 1
+        counted = 0
+        for match in pattern.finditer(buffer):
+            # Count newlines from the previous match only
+            line += buffer[counted:match.start()].count(b'\n')
+            counted = match.start()
+            regions.append(Region(path, line, match.start(), match.end(),
+                                  buffer[match.start():match.end()].decode('utf-8', 'replace')))
+    return regions
+
+
+def peak_rss_kb(children: bool = False) -> int | None:
+    """Peak RSS of this process (or of its finished children) in KiB; None
+    where the resource module does not exist (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak // 1024 if sys.platform == 'darwin' else peak
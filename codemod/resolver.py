@@ -0,0 +1,171 @@
+"""
+Module specifier resolution for src/.
+
+Resolves relative specifiers and the tsconfig.json path aliases (@utils/*,
+@config/*, ...) to repo-relative file paths, the way Vite/tsc do with
+moduleResolution "bundler": the exact file, then the file with a .ts/.tsx/
+.d.ts extension, then an index file in the directory. Bare package
+specifiers ('phaser') resolve to None.
+
+Results are cached per (importing directory, specifier), so resolving every
+import of the tree costs one lookup per distinct specifier.
+
+specifier_for() goes the other way: the specifier a file should use for a
+target file in a given style, through the most specific alias or relative.
+It is what codemod.canonical rewrites imports with.
+"""
+
+import json
+import posixpath
+from pathlib import Path
+
+from .tokenizer import COMMENT, tokenize
+
+EXTENSIONS = ('.ts', '.tsx', '.d.ts', '.js', '.json')
+INDEX_FILES = ('index.ts', 'index.tsx', 'index.js')
+# Extensions a specifier leaves out unless it spelled one; longest first
+IMPLIED_EXTENSIONS = ('.d.ts', '.tsx', '.ts', '.js')
+STYLES = ('alias', 'relative')
+
+
+def read_jsonc(path: Path | str) -> dict:
+    """Load a JSON-with-comments file such as tsconfig.json."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    # Drop comments, leaving string contents alone
+    parts = []
+    pos = 0
+    for tok in tokenize(text, comments=True):
+        if tok.kind == COMMENT:
+            parts.append(text[pos:tok.start])
+            pos = tok.end
+    parts.append(text[pos:])
+    text = ''.join(parts)
+    # Trailing commas before } or ]
+    tokens = list(tokenize(text))
+    drop = {a.start for a, b in zip(tokens, tokens[1:]) if a.text == ',' and b.text in ('}', ']')}
+    text = ''.join(ch for i, ch in enumerate(text) if i not in drop) if drop else text
+    return json.loads(text)
+
+
+class Resolver:
+    def __init__(self, root: Path | str, files=None, tsconfig: str = 'tsconfig.json'):
+        """files: optional set of repo-relative paths that exist; when given,
+        the filesystem is never consulted."""
+        self.root = Path(root)
+        self.files = set(files) if files is not None else None
+        # (prefix, suffix, has wildcard, targets)
+        self.aliases: list[tuple[str, str, bool, list[str]]] = []
+        self.base_url = ''
+        self._cache: dict[tuple[str, str], str | None] = {}
+        self._load_tsconfig(tsconfig)
+
+    def _load_tsconfig(self, tsconfig: str) -> None:
+        try:
+            options = read_jsonc(self.root / tsconfig).get('compilerOptions', {})
+        except (OSError, ValueError):
+            return
+        self.base_url = posixpath.normpath(options.get('baseUrl', '.'))
+        for pattern, targets in options.get('paths', {}).items():
+            prefix, star, suffix = pattern.partition('*')
+            self.aliases.append((prefix, suffix, bool(star), targets))
+        # Most specific alias first: '@config/*' before '@/*'
+        self.aliases.sort(key=lambda alias: len(alias[0]), reverse=True)
+
+    def _exists(self, path: str) -> bool:
+        if self.files is not None:
+            return path in self.files
+        return (self.root / path).is_file()
+
+    def _probe(self, base: str) -> str | None:
+        base = posixpath.normpath(base)
+        if self._exists(base):
+            return base
+        for ext in EXTENSIONS:
+            if self._exists(base + ext):
+                return base + ext
+        for index in INDEX_FILES:
+            candidate = posixpath.join(base, index)
+            if self._exists(candidate):
+                return candidate
+        return None
+
+    def resolve(self, specifier: str, from_path: str) -> str | None:
+        """Repo-relative path of the module specifier imported by from_path."""
+        directory = posixpath.dirname(from_path)
+        key = (directory, specifier) if specifier.startswith('.') else ('', specifier)
+        if key in self._cache:
+            return self._cache[key]
+
+        resolved = None
+        if specifier.startswith('.'):
+            resolved = self._probe(posixpath.join(directory, specifier))
+        else:
+            for prefix, suffix, wildcard, targets in self.aliases:
+                if wildcard:
+                    if (len(specifier) < len(prefix) + len(suffix)
+                            or not specifier.startswith(prefix) or not specifier.endswith(suffix)):
+                        continue
+                    middle = specifier[len(prefix):len(specifier) - len(suffix)]
+                elif specifier != prefix:
+                    continue
+                else:
+                    middle = ''
+                for target in targets:
+                    resolved = self._probe(posixpath.join(self.base_url, target.replace('*', middle)))
+                    if resolved:
+                        break
+                if resolved:
+                    break
+        self._cache[key] = resolved
+        return resolved
+
+    def _module_path(self, target: str, like: str) -> str:
+        """target as a specifier would spell it, following the spelling of the
+        existing specifier like: extension and /index only when it had them."""
+        last = like.rsplit('/', 1)[-1]
+        if posixpath.splitext(last)[1] and target.endswith(posixpath.splitext(last)[1]):
+            return target
+        module = target
+        for ext in IMPLIED_EXTENSIONS:
+            if module.endswith(ext):
+                module = module[:-len(ext)]
+                break
+        if posixpath.basename(module) == 'index' and last != 'index':
+            module = posixpath.dirname(module)
+        return module
+
+    def _alias_candidates(self, module: str) -> list[str]:
+        """Alias specifiers for module, the one with the longest target first."""
+        candidates = []
+        for prefix, suffix, wildcard, targets in self.aliases:
+            for target in targets:
+                if not wildcard:
+                    base = posixpath.normpath(posixpath.join(self.base_url, target))
+                    if base == module:
+                        candidates.append((len(base), prefix))
+                    continue
+                head, _, tail = posixpath.join(self.base_url, target).partition('*')
+                head = posixpath.normpath(head) + '/' if head.rstrip('/') else ''
+                if module.startswith(head) and module.endswith(tail) and len(module) > len(head) + len(tail):
+                    middle = module[len(head):len(module) - len(tail)]
+                    candidates.append((len(head), prefix + middle + suffix))
+        return [spec for _, spec in sorted(candidates, key=lambda c: c[0], reverse=True)]
+
+    def specifier_for(self, target: str, from_path: str, style: str = 'alias', like: str = '') -> str:
+        """Specifier from_path should import the repo-relative target with.
+
+        'alias' uses the most specific tsconfig alias, except for files in the
+        importer's own directory, which stay './Name'; 'relative' is always
+        relative. Every candidate is checked to resolve back to target.
+        """
+        module = self._module_path(target, like)
+        directory = posixpath.dirname(from_path)
+        if style == 'alias' and posixpath.dirname(target) != directory:
+            for spec in self._alias_candidates(module):
+                if self.resolve(spec, from_path) == target:
+                    return spec
+        relative = posixpath.relpath(module, directory or '.')
+        if not relative.startswith('.'):
+            relative = './' + relative
+        return relative
@@ -0,0 +1,42 @@
+"""
+Base class for codemod rules.
+
+A rule is a pure text transform: it receives the path and current source of a
+file and returns the new source. Rules never touch the filesystem themselves,
+which lets the engine batch reads/writes and run rules in worker processes.
+"""
+
+
+class Rule:
+    # Unique rule name, used on the command line and in timing output
+    name: str = ''
+    # Module the rule came from (e.g. 'console_logs'); selecting a group on the
+    # command line selects every rule in it
+    group: str = ''
+    # Bump whenever the transform changes so cached results are invalidated
+    version: int = 1
+    description: str = ''
+    # Repo-relative posix paths the rule applies to; None means every .ts file
+    # under src/
+    targets: tuple[str, ...] | None = None
+    # Text that must occur in a file for apply to change it; the engine does
+    # not decode files in which no matching rule's trigger occurs. None means
+    # the rule may change any file it matches.
+    trigger: str | None = None
+
+    def matches(self, path: str) -> bool:
+        """Return True if this rule should run on the repo-relative path."""
+        if self.targets is None:
+            return path.startswith('src/') and path.endswith('.ts')
+        return path in self.targets
+
+    def apply(self, path: str, source: str) -> str:
+        """Return the transformed source (or the input unchanged)."""
+        raise NotImplementedError
+
+    def apply_with_notes(self, path: str, source: str) -> tuple[str, list[str]]:
+        """Like apply, plus informational messages for the run report."""
+        return self.apply(path, source), []
+
+    def __repr__(self) -> str:
+        return f'<Rule {self.name} v{self.version}>'
@@ -0,0 +1,35 @@
+"""
+Rule registry.
+
+Every module in this package exposes a RULES list; ALL_RULES preserves module
+order, which is also the order rules are applied to a file.
+"""
+
+from . import console_calls, console_logs, eslint_issues, spawn_system, theme_utils, villager
+
+ALL_RULES = [
+    *eslint_issues.RULES,
+    *theme_utils.RULES,
+    *spawn_system.RULES,
+    *villager.RULES,
+    *console_logs.RULES,
+    *console_calls.RULES,
+]
+
+RULES_BY_NAME = {rule.name: rule for rule in ALL_RULES}
+
+
+def select_rules(names: list[str] | None = None) -> list:
+    """Resolve rule or group names to rule instances, keeping registry order.
+
+    Raises KeyError for names that match neither a rule nor a group.
+    """
+    if not names:
+        return list(ALL_RULES)
+    wanted = set()
+    for name in names:
+        matched = [r.name for r in ALL_RULES if name in (r.name, r.group)]
+        if not matched:
+            raise KeyError(name)
+        wanted.update(matched)
+    return [rule for rule in ALL_RULES if rule.name in wanted]
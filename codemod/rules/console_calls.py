@@ -0,0 +1,101 @@
+"""
+Token-based console.* -> DebugLogger rewrite.
+
+Unlike the literal table in console_logs.py this finds every console.log,
+console.warn and console.error call in any file under src/, ignoring matches
+inside strings, comments and template literals. Only the callee is renamed, so
+calls whose arguments span several lines are handled like any other. The
+needed helpers are merged into an existing DebugLogger import, or a single
+new import is added after the file's last import declaration.
+
+debugLog/debugWarn/debugError take a string message first; calls whose first
+argument is not a string or template literal are left alone and reported.
+"""
+
+from ..imports import parse_imports
+from ..rule import Rule
+from ..tokenizer import IDENT, STRING, TEMPLATE, line_of, tokenize
+
+HELPERS = {'log': 'debugLog', 'warn': 'debugWarn', 'error': 'debugError'}
+# Export order of DebugLogger.ts, used when writing new import specifiers
+HELPER_ORDER = ['debugLog', 'debugWarn', 'debugError']
+DEBUGLOGGER_PATH = 'src/utils/DebugLogger.ts'
+IMPORT_SOURCE = '@utils/DebugLogger'
+
+
+def _import_edit(source: str, tokens: list, needed: set[str]) -> tuple[int, int, str] | None:
+    """Edit that makes every needed helper imported, or None if already so."""
+    declarations = parse_imports(source, tokens)
+    for decl in declarations:
+        if not decl.module.endswith('/DebugLogger') or decl.type_only or decl.open_brace is None:
+            continue
+        names = set(decl.local_names())
+        missing = [name for name in HELPER_ORDER if name in needed and name not in names]
+        if not missing:
+            return None
+        anchor = decl.close_brace - 1
+        if tokens[anchor].text == ',':
+            anchor -= 1
+        if anchor == decl.open_brace:
+            # `import {} from` - nothing to put a comma after
+            return tokens[anchor].end, tokens[anchor].end, ' ' + ', '.join(missing) + ' '
+        return tokens[anchor].end, tokens[anchor].end, ''.join(f', {name}' for name in missing)
+
+    names = ', '.join(name for name in HELPER_ORDER if name in needed)
+    statement = f"import {{ {names} }} from '{IMPORT_SOURCE}';"
+    if declarations:
+        end = declarations[-1].end
+        return end, end, '\n' + statement
+    start = tokens[0].start if tokens else len(source)
+    return start, start, statement + '\n\n'
+
+
+class ConsoleCallsRule(Rule):
+    name = 'console-calls-to-debuglogger'
+    group = 'console_calls'
+    description = 'Rewrite every console.log/warn/error call to DebugLogger helpers'
+    trigger = 'console'
+
+    def matches(self, path: str) -> bool:
+        return super().matches(path) and path != DEBUGLOGGER_PATH
+
+    def apply(self, path: str, source: str) -> str:
+        return self.apply_with_notes(path, source)[0]
+
+    def apply_with_notes(self, path: str, source: str) -> tuple[str, list[str]]:
+        if 'console' not in source:
+            return source, []
+
+        tokens = list(tokenize(source))
+        edits = []
+        needed = set()
+        notes = []
+        for i, tok in enumerate(tokens[:-3]):
+            if tok.kind != IDENT or tok.text != 'console':
+                continue
+            if i and tokens[i - 1].text in ('.', '?.'):
+                continue
+            dot, method, paren = tokens[i + 1:i + 4]
+            if dot.text != '.' or method.text not in HELPERS or paren.text != '(':
+                continue
+            first_arg = tokens[i + 4] if i + 4 < len(tokens) else None
+            if first_arg is None or first_arg.kind not in (STRING, TEMPLATE):
+                notes.append(f'line {line_of(source, tok.start)}: console.{method.text} not rewritten, '
+                             'first argument is not a string')
+                continue
+            helper = HELPERS[method.text]
+            edits.append((tok.start, method.end, helper))
+            needed.add(helper)
+
+        if not edits:
+            return source, notes
+
+        import_edit = _import_edit(source, tokens, needed)
+        if import_edit:
+            edits.append(import_edit)
+        for start, end, text in sorted(edits, reverse=True):
+            source = source[:start] + text + source[end:]
+        return source, notes
+
+
+RULES = [ConsoleCallsRule()]
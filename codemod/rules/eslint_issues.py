@@ -0,0 +1,134 @@
+"""
+ESLint clean-ups (formerly fix_eslint_issues.py).
+
+Each numbered fix of the old script is a separate rule so it can be selected
+and timed on its own. Fixes 1, 3 and 6 prepended whole-file disable headers;
+they are retired in favour of python -m codemod.lintfix, which fixes or
+suppresses ESLint's own findings line by line and removes those headers with
+--strip-headers.
+"""
+
+import re
+
+from ..imports import line_span, parse_imports, prune_imports, referenced_names
+from ..rule import Rule
+from ..tokenizer import COMMENT, IDENT, STRING, line_of, tokenize
+
+DISABLE_COMMENT = re.compile(r'/\*\s*eslint-disable(?!-)([^*]*?)(?:--[^*]*)?\*/')
+
+
+def file_disables(source: str) -> list[tuple[int, int, tuple[str, ...] | None]]:
+    """(start, end, rule ids) of every file-level /* eslint-disable */
+    comment; rule ids is None for a bare comment that disables everything."""
+    found = []
+    for tok in tokenize(source, comments=True):
+        if tok.kind != COMMENT:
+            continue
+        match = DISABLE_COMMENT.fullmatch(tok.text)
+        if match:
+            rules = tuple(rule.strip() for rule in match.group(1).split(',') if rule.strip())
+            found.append((tok.start, tok.end, rules or None))
+    return found
+
+
+# Fix 1 (no-unused-vars header on types.ts) is retired, see the module
+# docstring
+
+
+# Fix 2: ObjectPool.ts references the Phaser namespace
+class ObjectPoolPhaserImportRule(Rule):
+    name = 'objectpool-phaser-import'
+    group = 'eslint_issues'
+    description = 'Import Phaser in ObjectPool.ts'
+    targets = ('src/utils/ObjectPool.ts',)
+    version = 2
+
+    def apply(self, path: str, source: str) -> str:
+        # `import type Phaser` also counts, a second import would be a
+        # duplicate identifier
+        tokens = list(tokenize(source))
+        for i, tok in enumerate(tokens[:-2]):
+            if tok.kind == IDENT and tok.text == 'import':
+                name = tokens[i + 2] if tokens[i + 1].text == 'type' else tokens[i + 1]
+                if name.text == 'Phaser':
+                    return source
+        return "import Phaser from 'phaser';\n" + source
+
+
+# Fix 3 (no-undef header on DataLoader.ts) is retired, see the module
+# docstring
+
+
+# Fix 4: duplicate case labels in ResponsiveManager.ts. The original script
+# kept one seen-set for the whole file and deleted only the first line of each
+# "duplicate"; labels are now compared per switch statement (see switches.py).
+class DuplicateCasesRule(Rule):
+    name = 'responsive-duplicate-cases'
+    group = 'eslint_issues'
+    description = 'Drop duplicate case labels in ResponsiveManager.ts'
+    targets = ('src/utils/ResponsiveManager.ts',)
+    trigger = 'case'
+    version = 4
+
+    def apply(self, path: str, source: str) -> str:
+        return self.apply_with_notes(path, source)[0]
+
+    def apply_with_notes(self, path: str, source: str) -> tuple[str, list[str]]:
+        if 'case' not in source:
+            return source, []
+        # Imported here: switches is also a command that imports the engine
+        from ..switches import duplicate_cases
+
+        spans = []
+        notes = []
+        for switch, first, dup, unreachable in duplicate_cases(source):
+            line = line_of(source, dup.start)
+            if unreachable or dup.empty:
+                # Nothing reaches the body (or there is none): drop the clause
+                spans.append(line_span(source, dup.start, dup.end))
+                notes.append(f'line {line}: removed duplicate case {dup.label}')
+            else:
+                # The previous clause falls through into this body; keep it
+                spans.append(line_span(source, dup.start, dup.colon_end))
+                notes.append(f'line {line}: removed duplicate label {dup.label}, body kept for fall-through')
+        for start, end in sorted(spans, reverse=True):
+            source = source[:start] + source[end:]
+        return source, notes
+
+
+# Fix 5 (console.error -> debugError in DebugLogger.ts) is intentionally not
+# ported: debugError itself is implemented with console.error, so the rewrite
+# turned it into infinite recursion.
+
+
+# Fix 6 (no-console header on helpers.ts) is retired, see the module
+# docstring
+
+
+# Fix 7: unused imports, computed per file from the import index
+class UnusedImportsRule(Rule):
+    name = 'remove-unused-imports'
+    group = 'eslint_issues'
+    description = 'Remove import bindings that are never referenced'
+    trigger = 'import'
+    version = 3
+
+    def matches(self, path: str) -> bool:
+        return super().matches(path) and not path.endswith('.d.ts')
+
+    def apply(self, path: str, source: str) -> str:
+        tokens = list(tokenize(source))
+        declarations = parse_imports(source, tokens)
+        if not declarations:
+            return source
+        used = referenced_names(source, tokens, declarations)
+        for start, end, text in reversed(prune_imports(source, tokens, declarations, used)):
+            source = source[:start] + text + source[end:]
+        return source
+
+
+RULES = [
+    ObjectPoolPhaserImportRule(),
+    DuplicateCasesRule(),
+    UnusedImportsRule(),
+]
@@ -0,0 +1,57 @@
+"""
+SpawnSystem.setDifficultyModifiers for endless mode (formerly fix_spawnsystem.py).
+
+Anchored on class members and the villagerChance statement rather than exact
+text, so reformatting SpawnSystem.ts does not make the rule silently stop
+matching; a missing anchor is reported as an error.
+"""
+
+from ..patching import MemberPatch, PatchRule, StatementPatch
+
+PATH = 'src/systems/SpawnSystem.ts'
+
+DIFFICULTY_FIELD = MemberPatch('SpawnSystem', after='spawnPattern', text="""
+    // Difficulty modifier for endless mode villager chance
+    private difficultyVillagerChance: number | null = null;
+""")
+
+# Add setDifficultyModifiers method after setSpawnPattern method
+SET_DIFFICULTY_MODIFIERS = MemberPatch('SpawnSystem', after='setSpawnPattern', text="""
+    /**
+     * Set difficulty modifiers for endless mode
+     */
+    setDifficultyModifiers(modifiers: {
+      spawnRateMultiplier: number;
+      speedMultiplier: number;
+      villagerChance: number;
+    }): void {
+      // Apply spawn rate multiplier
+      this.spawnInterval = Math.max(
+        this.minSpawnInterval,
+        this.spawnInterval / modifiers.spawnRateMultiplier,
+      );
+
+      // Store villager chance for spawnEntity
+      this.difficultyVillagerChance = modifiers.villagerChance;
+    }
+""")
+
+# Update spawnEntity to use difficultyVillagerChance if set
+USE_DIFFICULTY_CHANCE = StatementPatch('SpawnSystem', 'spawnEntity', after=('let', 'villagerChance'),
+                                       marker='difficultyVillagerChance', text="""
+    // Use difficulty modifier if set
+    if (this.difficultyVillagerChance !== null) {
+      villagerChance = this.difficultyVillagerChance;
+    }
+""")
+
+
+class SpawnSystemDifficultyRule(PatchRule):
+    name = 'spawnsystem-difficulty-modifiers'
+    group = 'spawn_system'
+    description = 'Add SpawnSystem.setDifficultyModifiers and use it in spawnEntity'
+    version = 2
+    patches = {PATH: [DIFFICULTY_FIELD, SET_DIFFICULTY_MODIFIERS, USE_DIFFICULTY_CHANCE]}
+
+
+RULES = [SpawnSystemDifficultyRule()]
@@ -0,0 +1,22 @@
+"""
+Phaser import for ThemeUtils.ts (formerly fix_imports.py).
+"""
+
+from ..rule import Rule
+
+TYPES_IMPORT = "import { ThemeConfig, GradientPalette, ShadowConfig } from '../config/types';"
+
+
+class ThemeUtilsPhaserImportRule(Rule):
+    name = 'theme-utils-phaser-import'
+    group = 'theme_utils'
+    description = 'Import Phaser ahead of the types import in ThemeUtils.ts'
+    targets = ('src/utils/ThemeUtils.ts',)
+
+    def apply(self, path: str, source: str) -> str:
+        if "import Phaser from 'phaser';" in source:
+            return source
+        return source.replace(TYPES_IMPORT, "import Phaser from 'phaser';\n" + TYPES_IMPORT)
+
+
+RULES = [ThemeUtilsPhaserImportRule()]
@@ -0,0 +1,27 @@
+"""
+Villager.spawn helper (formerly fix_villager.py).
+"""
+
+from ..patching import MemberPatch, PatchRule
+
+# Add spawn method after the constructor, ahead of createAnimations
+SPAWN_METHOD = MemberPatch('Villager', before='createAnimations', text="""
+    /**
+     * Spawn the villager with velocity
+     */
+    spawn(x: number, y: number, velocityX: number, velocityY: number): void {
+      this.setPosition(x, y);
+      this.setVelocity(velocityX, velocityY);
+    }
+""")
+
+
+class VillagerSpawnRule(PatchRule):
+    name = 'villager-spawn-method'
+    group = 'villager'
+    description = 'Add Villager.spawn(x, y, velocityX, velocityY)'
+    version = 3
+    patches = {'src/entities/Villager.ts': [SPAWN_METHOD]}
+
+
+RULES = [VillagerSpawnRule()]
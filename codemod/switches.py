@@ -0,0 +1,244 @@
+"""
+Scope-aware duplicate switch-case analysis.
+
+Each switch statement is found in the token stream and its clauses are read
+at the brace depth of that switch only, so a nested switch or two switches in
+the same file never share labels. A label is the whole case expression
+(`case Breakpoint.MOBILE:`, `case 'a':`); string literals compare by value.
+A duplicate is a label already used earlier in the same switch: it can never
+match, because the first clause wins.
+
+    python -m codemod.switches                 # every .ts file under src/
+    python -m codemod.switches --json src/utils/ResponsiveManager.ts
+
+Findings carry the full text of the duplicate clause and whether its body is
+unreachable (the clause before it does not fall through), which is what the
+responsive-duplicate-cases rule uses to decide between dropping the label and
+dropping the whole clause.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .cli import run_cli
+from .engine import MIN_FILES_FOR_POOL, REPO_ROOT, SOURCE_EXTENSIONS, SRC_DIR
+from .reader import mapped
+from .tokenizer import IDENT, STRING, Token, line_of, tokenize
+
+_OPEN = ('{', '(', '[')
+_CLOSE = ('}', ')', ']')
+_JUMPS = ('break', 'return', 'throw', 'continue')
+
+
+@dataclass
+class CaseClause:
+    # Source text of the case expression; None for default
+    label: str | None
+    # Comparison key: token texts, string literals by value
+    key: str | None
+    # Offsets: `case`/`default` keyword, just after its ':', and where the
+    # next clause (or the switch's closing brace) begins
+    start: int
+    colon_end: int
+    end: int
+    # Token index range of the body, inclusive; empty when first > last
+    first: int
+    last: int
+
+    @property
+    def empty(self) -> bool:
+        return self.first > self.last
+
+
+@dataclass
+class Switch:
+    start: int
+    clauses: list[CaseClause]
+
+
+@dataclass
+class Finding:
+    path: str
+    line: int
+    label: str
+    # Line of the clause that already uses the label, and of the switch
+    first_line: int
+    switch_line: int
+    # Full text of the duplicate clause, label through body
+    clause: str
+    # True when nothing falls through into the duplicate's body
+    unreachable: bool
+
+
+def _matching(tokens: list[Token], i: int) -> int:
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j].text in _OPEN:
+            depth += 1
+        elif tokens[j].text in _CLOSE:
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+
+def _label_key(tokens: list[Token]) -> str:
+    return ' '.join(tok.text[1:-1] if tok.kind == STRING else tok.text for tok in tokens)
+
+
+def find_switches(source: str, tokens: list[Token]) -> list[Switch]:
+    """Every switch statement in the file, nested ones included."""
+    switches = []
+    for i, tok in enumerate(tokens):
+        if tok.kind != IDENT or tok.text != 'switch' or i + 1 >= len(tokens) or tokens[i + 1].text != '(':
+            continue
+        if i and tokens[i - 1].text in ('.', '?.'):
+            continue
+        open_brace = _matching(tokens, i + 1) + 1
+        if open_brace >= len(tokens) or tokens[open_brace].text != '{':
+            continue
+        close_brace = _matching(tokens, open_brace)
+
+        clauses = []
+        depth = 0
+        j = open_brace + 1
+        while j < close_brace:
+            t = tokens[j]
+            if t.text in _OPEN:
+                depth += 1
+            elif t.text in _CLOSE:
+                depth -= 1
+            elif depth == 0 and t.kind == IDENT and t.text in ('case', 'default') and \
+                    tokens[j - 1].text not in ('.', '?.'):
+                # Find the ':' ending the label, skipping brackets and ?: pairs
+                k = j + 1
+                nested = 0
+                ternary = 0
+                while k < close_brace:
+                    text = tokens[k].text
+                    if text in _OPEN:
+                        nested += 1
+                    elif text in _CLOSE:
+                        nested -= 1
+                    elif nested == 0 and text == '?':
+                        ternary += 1
+                    elif nested == 0 and text == ':':
+                        if not ternary:
+                            break
+                        ternary -= 1
+                    k += 1
+                label_tokens = tokens[j + 1:k] if t.text == 'case' else []
+                if clauses:
+                    clauses[-1].end = t.start
+                    clauses[-1].last = j - 1
+                clauses.append(CaseClause(
+                    source[label_tokens[0].start:label_tokens[-1].end] if label_tokens else None,
+                    _label_key(label_tokens) if label_tokens else None,
+                    t.start, tokens[k].end, tokens[close_brace].start, k + 1, close_brace - 1))
+                j = k
+            j += 1
+        switches.append(Switch(tok.start, clauses))
+    return switches
+
+
+def terminates(tokens: list[Token], first: int, last: int) -> bool:
+    """True when the statements tokens[first..last] end in a jump, so control
+    never falls through past them."""
+    if first > last:
+        return False
+    if tokens[first].text == '{' and _matching(tokens, first) == last:
+        return terminates(tokens, first + 1, last - 1)
+    statement = first
+    depth = 0
+    for k in range(first, last + 1):
+        text = tokens[k].text
+        if text in _OPEN:
+            depth += 1
+        elif text in _CLOSE:
+            depth -= 1
+            if depth == 0 and text == '}' and k < last and tokens[k + 1].text != ';':
+                statement = k + 1
+        elif depth == 0 and text == ';' and k < last:
+            statement = k + 1
+    return tokens[statement].text in _JUMPS
+
+
+def duplicate_cases(source: str, tokens: list[Token] | None = None) -> list[tuple[Switch, CaseClause, CaseClause, bool]]:
+    """(switch, first clause, duplicate clause, duplicate unreachable) for
+    every repeated label, per switch."""
+    if tokens is None:
+        tokens = list(tokenize(source))
+    found = []
+    for switch in find_switches(source, tokens):
+        seen = {}
+        for index, clause in enumerate(switch.clauses):
+            if clause.key is None:
+                continue
+            if clause.key not in seen:
+                seen[clause.key] = clause
+                continue
+            previous = switch.clauses[index - 1] if index else None
+            unreachable = previous is not None and terminates(tokens, previous.first, previous.last)
+            found.append((switch, seen[clause.key], clause, unreachable))
+    return found
+
+
+def find_duplicates(path: str, source: str) -> list[Finding]:
+    return [Finding(path, line_of(source, dup.start), dup.label, line_of(source, first.start),
+                    line_of(source, switch.start), source[dup.start:dup.end].rstrip(), unreachable)
+            for switch, first, dup, unreachable in duplicate_cases(source)]
+
+
+def _scan_file(root: str, path: str) -> list[Finding]:
+    with mapped(os.path.join(root, path)) as buffer:
+        # Most files have no switch at all and are never decoded
+        if buffer.find(b'switch') == -1:
+            return []
+        return find_duplicates(path, str(buffer, 'utf-8'))
+
+
+def scan(root: Path | str = REPO_ROOT, paths: list[str] | None = None, jobs: int | None = None) -> list[Finding]:
+    """Duplicate-case findings for paths (default: every source file under src/)."""
+    root = Path(root)
+    if paths is None:
+        paths = sorted(Path(dirpath, filename).relative_to(root).as_posix()
+                       for dirpath, _, filenames in os.walk(root / SRC_DIR)
+                       for filename in filenames if filename.endswith(SOURCE_EXTENSIONS))
+    if len(paths) < MIN_FILES_FOR_POOL or jobs == 1:
+        results = [_scan_file(str(root), path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_scan_file, [str(root)] * len(paths), paths, chunksize=8))
+    return [finding for findings in results for finding in findings]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.switches',
+                                     description='Report duplicate case labels per switch statement.')
+    parser.add_argument('paths', nargs='*', metavar='PATH', help='repo-relative files (default: all of src/)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='print findings as a JSON array')
+    args = parser.parse_args(argv)
+
+    findings = scan(args.root, args.paths or None, args.jobs)
+    if args.json:
+        json.dump([asdict(finding) for finding in findings], sys.stdout, indent=2)
+        print()
+    else:
+        for finding in findings:
+            fix = 'unreachable clause' if finding.unreachable else 'label only'
+            print(f'{finding.path}:{finding.line}: duplicate case {finding.label} '
+                  f'(first at line {finding.first_line}, switch at line {finding.switch_line}; {fix})')
+            for line in finding.clause.split('\n'):
+                print(f'    {line}')
+    return 1 if findings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
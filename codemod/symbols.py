@@ -0,0 +1,302 @@
+"""
+Project-wide symbol reference index for src/.
+
+For every .ts file the index stores its exports, its imports (including
+re-exports), its module dependencies and the lines on which each imported or
+exported name is used. It lives in .codemod-symbols at the repo root and is
+refreshed incrementally: files whose size and mtime are unchanged are not even
+read, and files whose content hash is unchanged are not re-parsed. Queries
+then resolve imports with the tsconfig-aware Resolver and follow re-exports
+through barrels such as src/managers/loading/index.ts, without reading any
+source.
+
+    python -m codemod.symbols refs COLORS          # definition + every use
+    python -m codemod.symbols refs SPAWN_PATTERNS  # exit status 1 if unused
+    python -m codemod.symbols unused [PREFIX ...]  # exports nobody references
+
+Members accessed through namespace imports (import * as X) are not tracked.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import content_digest
+from .cli import run_cli
+from .engine import MIN_FILES_FOR_POOL, REPO_ROOT, SRC_DIR
+from .imports import declaration_indexes, iter_references, parse_exports, parse_imports
+from .resolver import Resolver
+from .tokenizer import STRING, tokenize
+
+INDEX_FILENAME = '.codemod-symbols'
+# Bump when the per-file record layout changes
+INDEX_VERSION = 2
+SOURCE_EXTENSIONS = ('.ts', '.tsx')
+# Modules `unused` looks at when no prefix is given
+DEFAULT_SCOPE = ('src/config/constants.ts', 'src/config/types.ts', 'src/utils/')
+
+
+@dataclass
+class Site:
+    path: str
+    line: int
+
+    def __str__(self) -> str:
+        return f'{self.path}:{self.line}'
+
+
+@dataclass
+class Definition:
+    name: str
+    kind: str
+    site: Site
+    references: list[Site]
+
+
+def index_source(source: str) -> dict:
+    """Build the index record (minus stat/digest fields) for one file."""
+    tokens = list(tokenize(source))
+    line_starts = [0]
+    pos = source.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = source.find('\n', pos + 1)
+
+    def line(offset):
+        return bisect.bisect_right(line_starts, offset)
+
+    declarations = parse_imports(source, tokens)
+    exports, stars = parse_exports(tokens)
+
+    imports = []
+    for decl in declarations:
+        if decl.default:
+            imports.append([decl.module, 'default', decl.default])
+        if decl.namespace:
+            imports.append([decl.module, '*', decl.namespace])
+        imports.extend([decl.module, spec.imported, spec.local] for spec in decl.named)
+
+    # Module dependencies with how they are loaded: 'static', 'type' (erased
+    # at runtime) or 'dynamic' (import('...'))
+    deps = []
+    for decl in declarations:
+        type_only = decl.type_only or (decl.named and decl.default is None and decl.namespace is None
+                                       and all(spec.type_only for spec in decl.named))
+        deps.append([decl.module, 'type' if type_only else 'static'])
+    deps.extend([e.module, 'static'] for e in exports if e.module is not None)
+    deps.extend([s.module, 'static'] for s in stars)
+    for i, tok in enumerate(tokens[:-2]):
+        if (tok.text == 'import' and tokens[i + 1].text == '(' and tokens[i + 2].kind == STRING
+                and (i == 0 or tokens[i - 1].text != '.')):
+            deps.append([tokens[i + 2].text[1:-1], 'dynamic'])
+
+    tracked = {local for _, _, local in imports}
+    tracked.update(entry.local for entry in exports if entry.module is None)
+    # The names in export declarations themselves are not uses
+    declaration_sites = {entry.start for entry in exports}
+    refs: dict[str, list[int]] = {}
+    for tok in iter_references(source, tokens, declaration_indexes(declarations)):
+        if tok.text in tracked and tok.start not in declaration_sites:
+            lines = refs.setdefault(tok.text, [])
+            ln = line(tok.start)
+            if not lines or lines[-1] != ln:
+                lines.append(ln)
+
+    return {
+        'exports': [[e.name, e.local, e.kind, line(e.start)] for e in exports if e.module is None],
+        'reexports': [[e.module, e.local, e.name, line(e.start)] for e in exports if e.module is not None],
+        'stars': [[s.module, line(s.start)] for s in stars],
+        'imports': imports,
+        'deps': deps,
+        'refs': refs,
+    }
+
+
+def _index_file(root: str, path: str, digest: str) -> tuple[str, dict]:
+    with open(os.path.join(root, path), 'r', encoding='utf-8') as f:
+        record = index_source(f.read())
+    record['digest'] = digest
+    return path, record
+
+
+class SymbolIndex:
+    def __init__(self, root: Path | str = REPO_ROOT):
+        self.root = Path(root)
+        self.path = self.root / INDEX_FILENAME
+        self.files: dict[str, dict] = {}
+        self._resolver = None
+
+    def load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.files = data.get('files', {})
+
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, jobs: int | None = None) -> list[str]:
+        """Bring the index up to date; return the paths that were re-parsed."""
+        self.load()
+        seen = set()
+        stale = []
+        changed = False
+        for dirpath, _, filenames in os.walk(self.root / SRC_DIR):
+            for filename in filenames:
+                if not filename.endswith(SOURCE_EXTENSIONS):
+                    continue
+                full = os.path.join(dirpath, filename)
+                path = Path(full).relative_to(self.root).as_posix()
+                seen.add(path)
+                st = os.stat(full)
+                stat = [st.st_mtime_ns, st.st_size]
+                record = self.files.get(path)
+                if record and record.get('stat') == stat:
+                    continue
+                with open(full, 'rb') as f:
+                    digest = content_digest(f.read())
+                if record and record.get('digest') == digest:
+                    record['stat'] = stat
+                    changed = True
+                    continue
+                stale.append((path, digest, stat))
+
+        removed = set(self.files) - seen
+        for path in removed:
+            del self.files[path]
+
+        if stale:
+            stats = {path: stat for path, _, stat in stale}
+            args = ([str(self.root)] * len(stale), [p for p, _, _ in stale], [d for _, d, _ in stale])
+            if len(stale) < MIN_FILES_FOR_POOL or jobs == 1:
+                records = list(map(_index_file, *args))
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    records = list(pool.map(_index_file, *args, chunksize=8))
+            for path, record in records:
+                record['stat'] = stats[path]
+                self.files[path] = record
+
+        if stale or removed or changed:
+            self.save()
+        self._resolver = None
+        return [path for path, _, _ in stale]
+
+    @property
+    def resolver(self) -> Resolver:
+        if self._resolver is None:
+            self._resolver = Resolver(self.root, files=self._known_files())
+        return self._resolver
+
+    def _known_files(self) -> set[str]:
+        files = set(self.files)
+        # Non-TS modules (JSON data) can be imported too
+        for dirpath, _, filenames in os.walk(self.root / SRC_DIR):
+            for filename in filenames:
+                if not filename.endswith(SOURCE_EXTENSIONS):
+                    files.add(Path(dirpath, filename).relative_to(self.root).as_posix())
+        return files
+
+    def definitions(self, name: str) -> list[Definition]:
+        """Every definition of an exported name with all its reference sites."""
+        found = []
+        for path, record in sorted(self.files.items()):
+            for exported, local, kind, line in record['exports']:
+                if exported == name:
+                    found.append(Definition(name, kind, Site(path, line), self.references(path, exported, local)))
+        return found
+
+    def references(self, module_path: str, exported: str, local: str | None = None) -> list[Site]:
+        """Use sites of export `exported` of module_path, across the tree."""
+        sites = []
+        if local is not None:
+            sites.extend(Site(module_path, ln) for ln in self.files[module_path]['refs'].get(local, ()))
+
+        resolve = self.resolver.resolve
+        # (module, name) pairs reachable through re-exports
+        pending = [(module_path, exported)]
+        visited = set()
+        while pending:
+            target = pending.pop()
+            if target in visited:
+                continue
+            visited.add(target)
+            target_path, target_name = target
+            for path, record in self.files.items():
+                for module, imported, local_name in record['imports']:
+                    if imported == target_name and resolve(module, path) == target_path:
+                        sites.extend(Site(path, ln) for ln in record['refs'].get(local_name, ()))
+                for module, imported, name, line in record['reexports']:
+                    if imported == target_name and resolve(module, path) == target_path:
+                        sites.append(Site(path, line))
+                        pending.append((path, name))
+                for module, line in record['stars']:
+                    if resolve(module, path) == target_path:
+                        pending.append((path, target_name))
+        return sorted(sites, key=lambda site: (site.path, site.line))
+
+    def unused(self, prefixes: tuple[str, ...] = DEFAULT_SCOPE) -> list[Definition]:
+        """Exports under the given path prefixes with no reference at all."""
+        result = []
+        for path, record in sorted(self.files.items()):
+            if not path.startswith(prefixes):
+                continue
+            for exported, local, kind, line in record['exports']:
+                if not self.references(path, exported, local):
+                    result.append(Definition(exported, kind, Site(path, line), []))
+        return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m codemod.symbols', description='Query the src/ symbol index.')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='repository root (default: %(default)s)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    refs = sub.add_parser('refs', help='show definition and references of exported names')
+    refs.add_argument('names', nargs='+')
+    unused = sub.add_parser('unused', help='list exports that are never referenced')
+    unused.add_argument('prefixes', nargs='*', help=f'path prefixes (default: {" ".join(DEFAULT_SCOPE)})')
+    sub.add_parser('build', help='refresh the index and report re-parsed files')
+    args = parser.parse_args(argv)
+
+    index = SymbolIndex(args.root)
+    reparsed = index.refresh()
+
+    if args.command == 'build':
+        print(f'{len(index.files)} files indexed, {len(reparsed)} re-parsed')
+        return 0
+
+    if args.command == 'unused':
+        for definition in index.unused(tuple(args.prefixes) or DEFAULT_SCOPE):
+            print(f'{definition.site}  {definition.kind} {definition.name}')
+        return 0
+
+    status = 0
+    for name in args.names:
+        definitions = index.definitions(name)
+        if not definitions:
+            print(f'{name}: no exported definition')
+            status = 1
+        for definition in definitions:
+            files = {site.path for site in definition.references}
+            print(f'{name}: {definition.kind} defined at {definition.site}, '
+                  f'{len(definition.references)} reference(s) in {len(files)} file(s)')
+            for site in definition.references:
+                print(f'  {site}')
+            if not definition.references:
+                status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main))
@@ -0,0 +1,225 @@
+"""
+Lightweight TypeScript tokenizer shared by the codemod rules.
+
+Splits source into identifiers, numbers, strings, template literals, regex
+literals, punctuators and (optionally) comments, each with its start and end
+offset. There is no parsing: rules work on the token stream so that code
+inside strings, comments and template literals is never mistaken for real code.
+
+tokenize() accepts either text or a UTF-8 buffer (bytes, bytearray, mmap).
+For text the offsets are character offsets and Token.text is a str; for a
+buffer they are byte offsets and Token.text is bytes, so a file can be lexed
+without decoding it. Tokens are produced lazily, one regex match per token.
+
+Template literals are returned as a single token, including any ${...}
+expressions they contain. Whether a '/' starts a regex literal or is a
+division is decided from the previous significant token (and, after ++ or
+--, the one before it). That is a heuristic, not a parse: a regex right
+after `)` (as in `if (x) /re/.test(y)`) or `}` is read as a division.
+
+Timing over the whole tree: python -m codemod.bench_tokenizer
+"""
+
+import re
+from typing import Iterator, NamedTuple
+
+IDENT = 'ident'
+NUMBER = 'number'
+STRING = 'string'
+TEMPLATE = 'template'
+REGEX = 'regex'
+PUNCT = 'punct'
+COMMENT = 'comment'
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str | bytes
+    start: int
+    end: int
+
+
+_TOKEN_PATTERN = r'''
+    (?P<ws>WS+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+  | (?P<ident>IDENT_START IDENT_PART*)
+  | (?P<number>
+        0[xX][0-9a-fA-F_]+n?
+      | 0[bB][01_]+n?
+      | 0[oO][0-7_]+n?
+      | (?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?n?
+    )
+  | (?P<punct>
+        >>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|\?\?=|&&=|\|\|=
+      | =>|==|!=|<=|>=|&&|\|\||\?\?|\?\.|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|<<|>>|\*\*
+      | .
+    )
+'''
+
+_REGEX_BODY_PATTERN = r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*'
+
+# After these keywords a '/' starts a regex literal rather than a division
+_REGEX_KEYWORDS = (
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+)
+
+
+class _Lexer:
+    """Compiled patterns and constants for one source type (str or bytes)."""
+
+    def __init__(self, text: bool):
+        if text:
+            ident_start, ident_part, ws = r'(?:[^\W\d]|\$)', r'[\w$]', r'[\s\ufeff]'
+            encode = char = str
+        else:
+            # Any non-ASCII byte is part of an identifier (UTF-8 letters) or
+            # of a string/comment, where it does not matter
+            ident_start, ident_part, ws = r'[A-Za-z_$\x80-\xff]', r'[\w$\x80-\xff]', r'\s'
+
+            def encode(s):
+                return s.encode('ascii')
+
+            # Indexing a bytes-like object yields ints
+            char = ord
+
+        pattern = (_TOKEN_PATTERN.replace('IDENT_START', ident_start)
+                   .replace('IDENT_PART', ident_part).replace('WS', ws))
+        self.token_re = re.compile(encode(pattern), re.VERBOSE | re.DOTALL)
+        self.regex_body_re = re.compile(encode(_REGEX_BODY_PATTERN))
+        self.regex_keywords = frozenset(encode(k) for k in _REGEX_KEYWORDS)
+        self.no_regex_after = frozenset(encode(p) for p in (')', ']', '}'))
+        self.inc_dec = frozenset(encode(p) for p in ('++', '--'))
+        # Single characters compare against source[i]
+        self.backtick = char('`')
+        self.backslash = char('\\')
+        self.dollar = char('$')
+        self.slash = char('/')
+        self.dollar_brace = encode('${')
+        self.comment_starts = (encode('//'), encode('/*'))
+        self.open_brace = encode('{')
+        self.close_brace = encode('}')
+
+
+_TEXT_LEXER = _Lexer(text=True)
+_BYTES_LEXER = _Lexer(text=False)
+
+
+def _regex_allowed(lexer: _Lexer, prev: Token | None, before: bool) -> bool:
+    """Whether a '/' after prev starts a regex; before is the answer for the
+    token ahead of prev."""
+    if prev is None:
+        return True
+    if prev.kind == PUNCT:
+        if prev.text in lexer.inc_dec:
+            # Prefix after an operator (an operand follows), postfix after an
+            # operand (the expression has ended)
+            return before
+        return prev.text not in lexer.no_regex_after
+    if prev.kind == IDENT:
+        return prev.text in lexer.regex_keywords
+    return False
+
+
+def _template_end(lexer: _Lexer, source, pos: int) -> int:
+    """Offset just past the template literal starting with '`' at pos."""
+    i = pos + 1
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch == lexer.backslash:
+            i += 2
+        elif ch == lexer.backtick:
+            return i + 1
+        elif ch == lexer.dollar and source[i:i + 2] == lexer.dollar_brace:
+            i += 2
+            for tok in _scan(lexer, source, i, nested=True):
+                i = tok.end
+        else:
+            i += 1
+    return n
+
+
+def _scan(lexer: _Lexer, source, pos: int = 0, comments: bool = False, nested: bool = False) -> Iterator[Token]:
+    # With nested=True, stop after the '}' that closes a template ${...}
+    n = len(source)
+    depth = 0
+    regex_allowed = True
+    match = lexer.token_re.match
+    while pos < n:
+        ch = source[pos]
+        if ch == lexer.backtick:
+            end = _template_end(lexer, source, pos)
+            tok = Token(TEMPLATE, source[pos:end], pos, end)
+        elif (ch == lexer.slash and regex_allowed
+              and source[pos:pos + 2] not in lexer.comment_starts
+              and (m := lexer.regex_body_re.match(source, pos))):
+            tok = Token(REGEX, m.group(), pos, m.end())
+        else:
+            m = match(source, pos)
+            kind = m.lastgroup
+            if kind == 'ws':
+                pos = m.end()
+                continue
+            tok = Token(kind, m.group(), pos, m.end())
+            if kind == COMMENT:
+                pos = tok.end
+                if comments:
+                    yield tok
+                continue
+        pos = tok.end
+        regex_allowed = _regex_allowed(lexer, tok, regex_allowed)
+        if tok.kind == PUNCT:
+            if tok.text == lexer.open_brace:
+                depth += 1
+            elif tok.text == lexer.close_brace:
+                if nested and depth == 0:
+                    yield tok
+                    return
+                depth -= 1
+        yield tok
+
+
+def tokenize(source, comments: bool = False) -> Iterator[Token]:
+    """Yield the tokens of source; comments are skipped unless requested.
+
+    source may be a str (character offsets) or a UTF-8 bytes-like object such
+    as bytes or mmap (byte offsets, bytes token text).
+    """
+    lexer = _TEXT_LEXER if isinstance(source, str) else _BYTES_LEXER
+    return _scan(lexer, source, 0, comments)
+
+
+def template_tokens(source, token: Token) -> Iterator[Token]:
+    """Yield the tokens of the ${...} expressions inside a template token.
+
+    Templates nested in those expressions are expanded too, so the result is
+    every code token of the template, in order, with offsets into source.
+    """
+    lexer = _TEXT_LEXER if isinstance(source, str) else _BYTES_LEXER
+    i = token.start + 1
+    while i < token.end:
+        ch = source[i]
+        if ch == lexer.backslash:
+            i += 2
+        elif ch == lexer.dollar and source[i:i + 2] == lexer.dollar_brace:
+            i += 2
+            pending = None
+            for tok in _scan(lexer, source, i, nested=True):
+                if pending is not None:
+                    if pending.kind == TEMPLATE:
+                        yield from template_tokens(source, pending)
+                    else:
+                        yield pending
+                pending = tok
+                i = tok.end
+            # The last token is the '}' closing the expression
+        else:
+            i += 1
+
+
+def line_of(source, offset: int) -> int:
+    """1-based line number of an offset into source."""
+    newline = '\n' if isinstance(source, str) else b'\n'
+    return source.count(newline, 0, offset) + 1
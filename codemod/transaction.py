@@ -0,0 +1,207 @@
+"""
+All-or-nothing file writes with a rollback journal.
+
+A run stages every new file content in memory and commits them together:
+
+1. each new content is written to a temp file next to its target and fsynced
+2. the original bytes are copied into .codemod-journal/ and a journal listing
+   every (path, original digest, new digest) is written and fsynced with
+   state 'prepared'
+3. the temp files are renamed over their targets (os.replace is atomic per
+   file) and the directories fsynced
+4. the journal state becomes 'committed'
+
+A crash before step 2 finishes leaves only temp files, which the next run
+removes. A crash during step 3 leaves a 'prepared' journal: the next run rolls
+it back before doing anything else. A committed journal stays until the next
+run that writes, so `python -m codemod --rollback` can undo the last run; files
+edited since then are left alone and reported.
+
+Staging a path with digest None creates a new file; rolling back removes it.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+from .cache import content_digest
+
+JOURNAL_DIRNAME = '.codemod-journal'
+JOURNAL_FILENAME = 'journal.json'
+TEMP_SUFFIX = '.codemod-tmp'
+
+
+class TransactionError(Exception):
+    def __init__(self, message: str, paths=()):
+        super().__init__(message)
+        # Repo-relative paths the error is about, when it is about files
+        self.paths = tuple(paths)
+
+
+def _fsync_dir(path: Path) -> None:
+    # Not supported on every platform (Windows); rename durability is best effort there
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_synced(path: Path, data: bytes) -> None:
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _temp_path(target: Path) -> Path:
+    return target.with_name(target.name + TEMP_SUFFIX)
+
+
+class Transaction:
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.journal_dir = self.root / JOURNAL_DIRNAME
+        # path -> (digest of the content the new source was computed from, or
+        # None for a new file, new bytes)
+        self._staged: dict[str, tuple[str | None, bytes]] = {}
+        self._entries: list[dict] = []
+
+    def stage(self, path: str, digest: str | None, new_source: str) -> None:
+        """Queue path to be replaced by new_source, which was computed from
+        content hashing to digest."""
+        self._staged[path] = (digest, new_source.encode('utf-8'))
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def commit(self) -> list[str]:
+        """Write every staged file or none; return the committed paths."""
+        if not self._staged:
+            return []
+        paths = sorted(self._staged)
+        originals = {}
+        for path in paths:
+            try:
+                with open(self.root / path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+            if (content_digest(data) if data is not None else None) != self._staged[path][0]:
+                raise TransactionError(f'{path} changed while the run was in progress; nothing was written',
+                                       [path])
+            originals[path] = data
+
+        temps = []
+        try:
+            for path in paths:
+                temp = _temp_path(self.root / path)
+                _write_synced(temp, self._staged[path][1])
+                temps.append(temp)
+            self._write_journal(paths, originals)
+        except BaseException:
+            for temp in temps:
+                temp.unlink(missing_ok=True)
+            raise
+
+        for path, temp in zip(paths, temps):
+            os.replace(temp, self.root / path)
+        for directory in {(self.root / path).parent for path in paths}:
+            _fsync_dir(directory)
+        self._set_state('committed')
+        self._staged.clear()
+        return paths
+
+    def _write_journal(self, paths: list[str], originals: dict[str, bytes]) -> None:
+        shutil.rmtree(self.journal_dir, ignore_errors=True)
+        self.journal_dir.mkdir()
+        entries = []
+        for i, path in enumerate(paths):
+            original = originals[path]
+            backup = None
+            if original is not None:
+                backup = f'{i}.orig'
+                _write_synced(self.journal_dir / backup, original)
+            entries.append({'path': path, 'backup': backup,
+                            'before': content_digest(original) if original is not None else None,
+                            'after': content_digest(self._staged[path][1])})
+        self._entries = entries
+        self._set_state('prepared')
+
+    def _set_state(self, state: str) -> None:
+        journal = self.journal_dir / JOURNAL_FILENAME
+        temp = _temp_path(journal)
+        _write_synced(temp, json.dumps({'state': state, 'files': self._entries}, indent=1).encode('utf-8'))
+        os.replace(temp, journal)
+        _fsync_dir(self.journal_dir)
+
+
+def pending_state(root: Path | str) -> str | None:
+    """State of the journal under root ('prepared', 'committed') or None."""
+    try:
+        with open(Path(root) / JOURNAL_DIRNAME / JOURNAL_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f).get('state')
+    except (OSError, ValueError):
+        return None
+
+
+def rollback(root: Path | str) -> tuple[list[str], list[str]]:
+    """Restore the files of the last journaled run.
+
+    Returns (restored paths, skipped paths). A file is skipped when its
+    content is neither what the run wrote nor the original, i.e. it was edited
+    afterwards. The journal is removed afterwards either way.
+    """
+    root = Path(root)
+    journal_dir = root / JOURNAL_DIRNAME
+    try:
+        with open(journal_dir / JOURNAL_FILENAME, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+    except OSError:
+        return [], []
+    except ValueError as exc:
+        raise TransactionError(f'unreadable journal in {journal_dir}: {exc}') from exc
+
+    restored = []
+    skipped = []
+    for entry in journal['files']:
+        target = root / entry['path']
+        _temp_path(target).unlink(missing_ok=True)
+        try:
+            with open(target, 'rb') as f:
+                current = content_digest(f.read())
+        except FileNotFoundError:
+            current = None
+        if current == entry['before']:
+            continue
+        if current != entry['after']:
+            skipped.append(entry['path'])
+            continue
+        if entry['backup'] is None:
+            # Created by the run
+            target.unlink()
+            restored.append(entry['path'])
+            continue
+        with open(journal_dir / entry['backup'], 'rb') as f:
+            original = f.read()
+        temp = _temp_path(target)
+        _write_synced(temp, original)
+        os.replace(temp, target)
+        _fsync_dir(target.parent)
+        restored.append(entry['path'])
+
+    shutil.rmtree(journal_dir, ignore_errors=True)
+    return restored, skipped
+
+
+def remove_stale_temps(root: Path | str, paths) -> None:
+    """Delete temp files an interrupted commit left next to paths."""
+    root = Path(root)
+    for path in paths:
+        _temp_path(root / path).unlink(missing_ok=True)
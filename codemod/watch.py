@@ -0,0 +1,256 @@
+"""
+Watch mode: reapply rules to files under src/ as they are saved.
+
+On Linux the tree is watched with inotify (through ctypes, no extra package);
+elsewhere, or when inotify is unavailable, the tree is polled by mtime and
+size. Bursts of events (editors writing a temp file and renaming it, git
+checkouts) are debounced, then only the changed files that some selected rule
+matches go through the engine, serially in this process and with the content
+cache, so a single-file save is fixed within a few tens of milliseconds.
+
+The engine's own writes show up as events too; re-checking those files finds
+nothing to change and records them in the cache.
+
+A file saved while its batch runs fails the transaction's digest check, and
+one deleted between the event and the read cannot be opened; either way
+nothing is written, the paths are reported through on_error and the batch is
+retried after RETRY_SECONDS (a deleted file then simply drops out).
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from .engine import REPO_ROOT, SOURCE_EXTENSIONS, SRC_DIR, RunReport, run
+from .rules import select_rules
+from .transaction import TransactionError
+
+# Quiet period that ends a burst of events, and the cap on how long one burst
+# may delay processing
+DEBOUNCE_SECONDS = 0.02
+MAX_DELAY_SECONDS = 0.2
+POLL_INTERVAL_SECONDS = 0.05
+# Delay before retrying a batch that lost a race with an edit
+RETRY_SECONDS = 0.1
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Recursive inotify watch of one directory."""
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # watch descriptor -> directory
+        self.dirs: dict[int, str] = {}
+        self._watch_tree(str(directory))
+
+    def _watch_tree(self, directory: str) -> None:
+        for dirpath, _, _ in os.walk(directory):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {dirpath}')
+            self.dirs[wd] = dirpath
+
+    def wait(self, timeout: float | None) -> set[str] | None:
+        """Changed file paths, an empty set on timeout, or None when events
+        were lost and the caller should rescan."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                    continue
+                directory = self.dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(path)
+                        changed.update(_source_files(path))
+                    continue
+                changed.add(path)
+        return None if overflow else changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback: compare (mtime, size) of every source file each interval."""
+
+    def __init__(self, directory: Path, interval: float = POLL_INTERVAL_SECONDS):
+        self.directory = str(directory)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for path in _source_files(self.directory):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[str] | None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(0.0, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def _source_files(directory: str) -> list[str]:
+    return [os.path.join(dirpath, filename)
+            for dirpath, _, filenames in os.walk(directory)
+            for filename in filenames if filename.endswith(SOURCE_EXTENSIONS)]
+
+
+def make_watcher(directory: Path, polling: bool = False):
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory)
+
+
+def _race_paths(root: Path, exc: Exception, paths: list[str] | None) -> list[str]:
+    """The files an edit race was about, for the report."""
+    if isinstance(exc, TransactionError) and exc.paths:
+        return list(exc.paths)
+    if isinstance(exc, FileNotFoundError) and exc.filename:
+        path = Path(exc.filename)
+        return [path.relative_to(root).as_posix() if path.is_relative_to(root) else str(path)]
+    return paths or [SRC_DIR]
+
+
+def watch(rule_names: list[str] | None = None, root: Path | str = REPO_ROOT, use_cache: bool = True,
+          polling: bool = False, on_report=None, on_ready=None, on_error=None) -> None:
+    """Run until interrupted, calling on_report(report, latency) per batch
+    and on_error(paths, exc) for a batch lost to an edit race, which is
+    retried.
+
+    latency is the time from the first event of a batch to the end of its run
+    (for the initial full run, its duration).
+    """
+    root = Path(root)
+    rules = select_rules(rule_names)
+    src = root / SRC_DIR
+    watcher = make_watcher(src, polling)
+
+    def attempt(paths: list[str] | None) -> RunReport | None:
+        try:
+            if paths is None:
+                return run(rule_names, root=root, use_cache=use_cache)
+            return run(rule_names, root=root, jobs=1, use_cache=use_cache, paths=paths)
+        except (TransactionError, FileNotFoundError) as exc:
+            if on_error:
+                on_error(_race_paths(root, exc, paths), exc)
+            return None
+
+    try:
+        # Bring the tree up to date before watching it
+        report = attempt(None)
+        # Absolute paths to retry, or None when a full run has to be retried
+        retry = set() if report is not None else None
+        if report is not None and on_report:
+            on_report(report, report.elapsed)
+        if on_ready:
+            on_ready(watcher)
+        while True:
+            changed = watcher.wait(RETRY_SECONDS if retry != set() else None)
+            first_event = time.perf_counter()
+            rescan = changed is None or retry is None
+            changed = (changed or set()) | (retry or set())
+            retry = set()
+            # Debounce: wait for a quiet period, but not forever
+            while time.perf_counter() - first_event < MAX_DELAY_SECONDS:
+                more = watcher.wait(DEBOUNCE_SECONDS)
+                if more is None:
+                    rescan = True
+                elif not more:
+                    break
+                else:
+                    changed |= more
+
+            if rescan:
+                report = attempt(None)
+                if report is None:
+                    retry = None
+                    continue
+            else:
+                paths = []
+                for path in changed:
+                    rel = Path(path).relative_to(root).as_posix()
+                    if os.path.isfile(path) and any(rule.matches(rel) for rule in rules):
+                        paths.append(rel)
+                if not paths:
+                    continue
+                report = attempt(paths)
+                if report is None:
+                    retry = {str(root / path) for path in paths}
+                    continue
+            if on_report:
+                on_report(report, time.perf_counter() - first_event)
+    finally:
+        watcher.close()
+
+
+def format_race(paths: list[str], exc: Exception) -> str:
+    reason = 'changed during the run' if isinstance(exc, TransactionError) else 'disappeared before it was read'
+    return f'[watch] {", ".join(sorted(paths))}: {reason}, nothing written; retrying'
+
+
+def format_batch(report: RunReport, latency: float) -> str:
+    return (f'[watch] {report.files_read} file(s) checked, {len(report.files_changed)} fixed '
+            f'in {latency * 1000:.1f} ms')
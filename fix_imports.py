@@ -1,18 +1,6 @@
-import os
+# Moved to codemod/rules/theme_utils.py; this wrapper runs that rule group.
+import sys
 
-# Add Phaser import to ThemeUtils.ts
-filepath = 'src/utils/ThemeUtils.ts'
-with open(filepath, 'r', encoding='utf-8') as f:
-    content = f.read()
+from codemod.cli import main
 
-# Add Phaser import after the comment block
-if "import Phaser from 'phaser';" not in content:
-    content = content.replace(
-        "import { ThemeConfig, GradientPalette, ShadowConfig } from '../config/types';",
-        "import Phaser from 'phaser';\nimport { ThemeConfig, GradientPalette, ShadowConfig } from '../config/types';"
-    )
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f'Updated: {filepath}')
-else:
-    print(f'Skipping (already has import): {filepath}')
+sys.exit(main(['--rule', 'theme_utils', *sys.argv[1:]]))
@@ -1,31 +1,6 @@
-with open('src/entities/Villager.ts', 'r', encoding='utf-8') as f:
-    content = f.read()
+# Moved to codemod/rules/villager.py; this wrapper runs that rule group.
+import sys
 
-# Add spawn method after the constructor
-old_text = """    this.createAnimations(texture);
-  }
+from codemod.cli import main
 
-  /**
-   * Create villager animations
-   */"""
-new_text = """    this.createAnimations(texture);
-  }
-
-  /**
-   * Spawn the villager with velocity
-   */
-  spawn(x: number, y: number, velocityX: number, velocityY: number): void {
-    this.setPosition(x, y);
-    this.setVelocity(velocityX, velocityY);
-  }
-
-  /**
-   * Create villager animations
-   */"""
-
-content = content.replace(old_text, new_text)
-
-with open('src/entities/Villager.ts', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print('Fixed Villager.ts')
+sys.exit(main(['--rule', 'villager', *sys.argv[1:]]))
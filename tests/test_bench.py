@@ -0,0 +1,14 @@
+from codemod.bench import _measure, build_corpus
+
+
+def test_measure_counts_replicas_and_reports_rss_growth(tmp_path):
+    root = tmp_path / 'repo'
+    (root / 'src').mkdir(parents=True)
+    (root / 'src' / 'a.ts').write_text("console.log('a');\n")
+    (root / 'src' / 'b.ts').write_text('export const b = 1;\n')
+    files = build_corpus(root, tmp_path / 'corpus', 3)
+
+    result = _measure('console-calls-to-debuglogger', files, all_files=False, repeat=2)
+
+    assert (result['files'], result['changed'], result['errors']) == (6, 3, 0)
+    assert result['rss_growth_kb'] == result['peak_rss_kb'] - result['baseline_rss_kb'] >= 0
@@ -0,0 +1,55 @@
+from codemod import Rule, run
+from codemod.cache import CACHE_FILENAME, ContentCache, rules_signature
+
+RULE = 'console-calls-to-debuglogger'
+
+
+def write(root, path, source):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(source, encoding='utf-8')
+
+
+def test_rewritten_file_is_cached_once_verified(tmp_path):
+    write(tmp_path, 'src/a.ts', "console.log('hi');\n")
+
+    assert run([RULE], root=tmp_path, jobs=1).files_changed == ['src/a.ts']
+    # Just rewritten: checked once more before it gets an entry
+    second = run([RULE], root=tmp_path, jobs=1)
+    assert (second.files_changed, second.files_cached) == ([], 0)
+    third = run([RULE], root=tmp_path, jobs=1)
+    assert (third.files_changed, third.files_cached) == ([], 1)
+
+
+def test_edited_file_is_processed_again(tmp_path):
+    write(tmp_path, 'src/a.ts', 'export const a = 1;\n')
+    run([RULE], root=tmp_path, jobs=1)
+    assert run([RULE], root=tmp_path, jobs=1).files_cached == 1
+
+    write(tmp_path, 'src/a.ts', "console.error('e');\n")
+    report = run([RULE], root=tmp_path, jobs=1)
+
+    assert (report.files_changed, report.files_cached) == (['src/a.ts'], 0)
+
+
+def test_entries_are_keyed_on_the_rule_set(tmp_path):
+    class Old(Rule):
+        name = 'r'
+
+    class New(Rule):
+        name = 'r'
+        version = 2
+
+    cache = ContentCache(tmp_path / CACHE_FILENAME)
+    cache.record('src/a.ts', 'digest', rules_signature([Old()], 'src/a.ts'))
+    cache.save()
+
+    reloaded = ContentCache(tmp_path / CACHE_FILENAME)
+    assert reloaded.lookup('src/a.ts', rules_signature([Old()], 'src/a.ts')) == 'digest'
+    assert reloaded.lookup('src/a.ts', rules_signature([New()], 'src/a.ts')) is None
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    (tmp_path / CACHE_FILENAME).write_text('{not json', encoding='utf-8')
+
+    assert ContentCache(tmp_path / CACHE_FILENAME).entries == {}
@@ -0,0 +1,82 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from balance.calibrate import GHOST, GhostCycle, draw_frames, kill_spans
+from balance.constants import load_constants
+from balance.spawnsim import MONSTER_TYPES, Physics, simulate_level
+from codemod.engine import REPO_ROOT
+
+FPS = 60
+ZOMBIE = MONSTER_TYPES.index('zombie')
+LEVEL = {'duration': 20, 'minKills': 5, 'villagerChance': 0.2, 'powerUpInterval': 10, 'spawnPattern': 'ghost_realm',
+         'monsterWeights': {'zombie': 40, 'vampire': 0, 'ghost': 60}}
+
+
+@pytest.fixture(scope='module')
+def constants():
+    return load_constants(REPO_ROOT)
+
+
+def sliceable_frames(constants, frames):
+    """Ghost.update() and its Linear alpha tweens frame by frame; True where
+    isSliceable()."""
+    delta = 1000 / FPS
+    fade = constants['GHOST_FADE_DURATION'] * 1000
+    timer, visible, alpha, tween = 0.0, True, 1.0, None
+    sliceable = []
+    for frame in range(frames):
+        timer += delta
+        duration = constants['GHOST_VISIBLE_DURATION' if visible else 'GHOST_INVISIBLE_DURATION'] * 1000
+        if timer >= duration:
+            visible, timer = not visible, 0.0
+            tween = (frame, alpha, 1.0 if visible else 0.2)
+        if tween is not None:
+            start, origin, target = tween
+            alpha = origin + (target - origin) * min((frame - start) * delta / fade, 1)
+        sliceable.append(alpha > 0.5)
+    return sliceable
+
+
+def test_ghost_cycle_matches_the_visibility_timer(constants):
+    cycle = GhostCycle.from_constants(constants, FPS)
+    expected = [frame for frame, ok in enumerate(sliceable_frames(constants, 3000)) if ok]
+    modelled = [frame for frame in range(3000)
+                if (cycle.fade_in if frame >= cycle.period else 0) <= frame % cycle.period < cycle.fade_out]
+
+    assert modelled == expected
+
+
+def test_kills_are_drawn_from_sliceable_in_view_frames(constants):
+    cycle = GhostCycle.from_constants(constants, FPS)
+    batch = simulate_level(LEVEL, 40, np.random.default_rng(5), Physics.from_constants(constants, FPS),
+                           concurrency=False)
+    spans = kill_spans(batch, cycle)
+    frame, total = draw_frames(np.random.default_rng(6), spans)
+
+    in_view = np.zeros(batch.kind.shape, bool)
+    for first, last in batch.view_spans:
+        in_view |= (first <= frame) & (frame <= last)
+    phase = frame % cycle.period
+    sliceable = (phase >= np.where(frame >= cycle.period, cycle.fade_in, 0)) & (phase < cycle.fade_out)
+    ghost = batch.kind == GHOST
+
+    assert ((frame >= 0) == (total > 0)).all()
+    assert in_view[frame >= 0].all()
+    assert sliceable[ghost & (frame >= 0)].all()
+    assert (total[~ghost] == batch.frames_in_view[~ghost]).all()
+
+
+def test_long_lived_ghost_loses_its_hidden_frames(constants):
+    cycle = GhostCycle.from_constants(constants, FPS)
+    batch = simulate_level(LEVEL, 1, np.random.default_rng(0), Physics.from_constants(constants, FPS),
+                           concurrency=False)
+    # A ghost and a zombie in view from frame 100 to 400, the second span empty
+    view_spans = np.array([[[[100, 100]], [[400, 400]]], [[[0, 0]], [[-1, -1]]]], np.int16)
+    batch = dataclasses.replace(batch, kind=np.array([[GHOST, ZOMBIE]], np.int8), view_spans=view_spans)
+
+    _, total = draw_frames(np.random.default_rng(0), kill_spans(batch, cycle))
+    sliceable = [frame for frame in range(100, 401) if cycle.fade_in <= frame % cycle.period < cycle.fade_out]
+
+    assert total.tolist() == [[len(sliceable), 301]]
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_dry_run_into_closed_pipe_exits_quietly(tmp_path):
+    for i in range(50):
+        (tmp_path / 'src').mkdir(exist_ok=True)
+        (tmp_path / 'src' / f'f{i:02}.ts').write_text(f"console.log('{i}');\n" * 50)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'codemod', '--dry-run', '--no-cache', '--jobs', '1', '--root', str(tmp_path)],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # Like `| head -n 1`
+    process.stdout.readline()
+    process.stdout.close()
+    stderr = process.stderr.read().decode()
+    process.wait()
+
+    assert 'Traceback' not in stderr
+    assert process.returncode == 1
@@ -0,0 +1,52 @@
+import numpy as np
+
+from balance.constants import load_constants
+from balance.economy import Catalog, Rewards, _shop
+from codemod.engine import REPO_ROOT
+
+WEAPONS = [
+    {'id': 'sword', 'unlockCost': 0, 'isStarter': True,
+     'tiers': [{'upgradeCost': 0}, {'upgradeCost': 200}, {'upgradeCost': 500}]},
+    {'id': 'axe', 'unlockCost': 300, 'isStarter': False, 'tiers': [{'upgradeCost': 0}, {'upgradeCost': 400}]},
+]
+UPGRADES = [
+    {'id': 'score_multiplier', 'maxTier': 2, 'baseValue': 1.0,
+     'tiers': [{'cost': 100, 'value': 1.1}, {'cost': 150, 'value': 1.2}, {'cost': 999, 'value': 1.3}]},
+]
+
+
+def test_catalog_skips_owned_tiers_and_values_index_the_owned_tier():
+    catalog = Catalog.from_data(WEAPONS, UPGRADES)
+
+    assert catalog.slots == ('weapon:sword', 'weapon:axe', 'upgrade:score_multiplier')
+    assert catalog.items == ('sword@2', 'sword@3', 'axe@1', 'axe@2', 'score_multiplier@1', 'score_multiplier@2')
+    assert catalog.costs[0].tolist() == [np.inf, 200, 500, np.inf]
+    # tiers[tier]?.value || baseValue: one tier ahead, baseValue once maxed out
+    assert catalog.score_multiplier.tolist() == [1.1, 1.2, 1.3, 1.0]
+
+
+def test_shop_buys_the_best_ranked_purchase_or_saves_for_it():
+    catalog = Catalog.from_data(WEAPONS, UPGRADES)
+    tier = np.tile(catalog.start, (3, 1))
+    souls = np.array([150, 250, 1000])
+    unlocked = np.full((3, len(catalog.items)), np.nan)
+
+    _shop(catalog, catalog.ranks('weapons'), tier, souls, unlocked, np.array([1.0, 2.0, 3.0]))
+
+    # Weapons first, cheapest first; 150 saves for sword@2 instead of the 100 upgrade
+    assert tier.tolist() == [[1, 0, 0], [2, 0, 0], [2, 2, 0]]
+    assert souls.tolist() == [150, 50, 100]
+    assert np.isnan(unlocked[0]).all()
+    assert np.isnan(unlocked[2]).tolist() == [False, True, False, False, True, True]
+
+
+def test_rewards_follow_the_world_and_stars():
+    constants = load_constants(REPO_ROOT)
+    levels = [{'world': 1}, {'world': 3}, {'world': 2, 'isBoss': True, 'bossId': 'titan'}]
+
+    rewards = Rewards.from_constants(constants, levels, {'titan': {'soulsReward': 500}})
+
+    assert rewards.manager.tolist() == [50, 90, 150]
+    assert rewards.scene.tolist() == [70, 110, 90]
+    assert rewards.boss.tolist() == [0, 0, 500]
+    assert rewards.star_bonus.tolist() == [0.0, 1.0, 1.15, 1.25]
@@ -0,0 +1,71 @@
+from codemod import Rule, run
+from codemod.engine import apply_rules
+
+RULE = 'console-calls-to-debuglogger'
+
+
+def make_tree(root, files):
+    for path, source in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(source, encoding='utf-8')
+
+
+def test_run_rewrites_matching_files_only(tmp_path):
+    make_tree(tmp_path, {'src/a.ts': "console.log('hi');\n", 'src/b.ts': 'export const b = 1;\n'})
+    before = (tmp_path / 'src/b.ts').stat().st_mtime_ns
+
+    report = run([RULE], root=tmp_path, jobs=1, use_cache=False)
+
+    assert report.files_changed == ['src/a.ts']
+    assert report.errors == []
+    assert (tmp_path / 'src/a.ts').read_text() == "import { debugLog } from '@utils/DebugLogger';\n\ndebugLog('hi');\n"
+    assert (tmp_path / 'src/b.ts').stat().st_mtime_ns == before
+
+
+def test_dry_run_streams_diffs_and_writes_nothing(tmp_path):
+    make_tree(tmp_path, {'src/a.ts': "console.warn('w');\n"})
+    results = []
+
+    report = run([RULE], root=tmp_path, jobs=1, write=False, use_cache=False, diff=True,
+                 on_result=results.append)
+
+    assert report.files_changed == ['src/a.ts']
+    assert (tmp_path / 'src/a.ts').read_text() == "console.warn('w');\n"
+    assert "+debugWarn('w');" in results[0].diff.splitlines()
+
+
+def test_pool_matches_serial_run(tmp_path):
+    files = {f'src/f{i:02}.ts': f"console.log('{i}');\n" for i in range(20)}
+    make_tree(tmp_path / 'serial', files)
+    make_tree(tmp_path / 'pool', files)
+
+    serial = run([RULE], root=tmp_path / 'serial', jobs=1, use_cache=False)
+    pool = run([RULE], root=tmp_path / 'pool', jobs=4, use_cache=False)
+
+    assert pool.jobs > 1
+    assert pool.files_changed == serial.files_changed == sorted(files)
+    for path in files:
+        assert (tmp_path / 'pool' / path).read_text() == (tmp_path / 'serial' / path).read_text()
+
+
+class Broken(Rule):
+    name = 'broken'
+
+    def apply(self, path, source):
+        raise ValueError('boom')
+
+
+class Upper(Rule):
+    name = 'upper'
+
+    def apply(self, path, source):
+        return source.upper()
+
+
+def test_a_failing_rule_does_not_stop_the_others():
+    result = apply_rules([Broken(), Upper()], 'src/a.ts', 'x;\n')
+
+    assert result.errors == [('broken', 'ValueError: boom')]
+    assert result.changed_by == ['upper']
+    assert result.new_source == 'X;\n'
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from codemod.entity_specs import ENTITIES, SPECS_BY_NAME
+from codemod.generate import render, stale_members, sync
+from codemod.patching import index_classes
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def read(spec):
+    return (REPO_ROOT / spec.path).read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('spec', ENTITIES, ids=lambda spec: spec.name)
+def test_templates_match_the_current_sources(spec):
+    source = read(spec)
+
+    assert stale_members(source, index_classes(source)[spec.name], spec) == []
+    assert sync(source, spec, regenerate=True) == (source, [])
+
+
+@pytest.mark.parametrize('spec', ENTITIES, ids=lambda spec: spec.name)
+def test_rendered_class_is_in_sync_with_its_spec(spec):
+    source = render(spec)
+
+    assert stale_members(source, index_classes(source)[spec.name], spec) == []
+    assert sync(source, spec) == (source, [])
+
+
+def test_regenerate_rewrites_only_the_stale_member():
+    spec = SPECS_BY_NAME['Zombie']
+    source = read(spec).replace('leftBody.setGravityY(GRAVITY);', 'leftBody.setGravityY(0);')
+
+    new, notes = sync(source, spec, regenerate=True)
+
+    assert notes == ['rewrote createHalves from its template']
+    assert 'leftBody.setGravityY(GRAVITY);' in new
+    assert 'this.createFlashEffect();' in new
+    assert 'leftHalf.y > 850' in new
+
+
+def test_no_onsliced_when_die_already_splits():
+    spec = SPECS_BY_NAME['Vampire']
+    source = read(spec)
+
+    new, notes = sync(source, spec, regenerate=True)
+
+    assert 'onSliced' not in new
+    assert notes == []
+
+
+def test_rendered_ghost_has_its_visibility_cycle():
+    members = index_classes(render(SPECS_BY_NAME['Ghost']))['Ghost'].members
+
+    assert {'isVisible', 'update', 'toggleVisibility', 'isSliceable', 'onSliced', 'createMistEffect'} <= set(members)
+
+
+def test_regenerate_adds_missing_fields_after_the_last_field():
+    spec = SPECS_BY_NAME['Ghost']
+    source = read(spec).replace('  private alwaysVisible: boolean = false;\n', '')
+
+    new, notes = sync(source, spec, regenerate=True)
+
+    assert notes == ['added alwaysVisible from its template']
+    assert '  private fadeDuration: number = 300; // ms\n  private alwaysVisible: boolean = false;\n' in new
@@ -0,0 +1,38 @@
+from codemod.rules.eslint_issues import UnusedImportsRule
+
+
+def prune(source):
+    return UnusedImportsRule().apply('src/a.ts', source)
+
+
+def test_drops_unused_named_binding():
+    assert prune("import { A, B } from './m';\nuse(B);\n") == "import { B } from './m';\nuse(B);\n"
+
+
+def test_removes_declaration_left_without_bindings():
+    assert prune("import { A } from './m';\nimport { B } from './n';\nuse(B);\n") == \
+        "import { B } from './n';\nuse(B);\n"
+
+
+def test_keeps_default_and_drops_namespace():
+    assert prune("import D, * as ns from './m';\nuse(D);\n") == "import D from './m';\nuse(D);\n"
+
+
+def test_type_position_counts_as_a_reference():
+    source = "import type { T } from './m';\nlet x: T;\n"
+    assert prune(source) == source
+
+
+def test_side_effect_import_is_kept():
+    source = "import './polyfill';\n"
+    assert prune(source) == source
+
+
+def test_multiline_keeps_missing_trailing_comma():
+    source = "import {\n  A,\n  B,\n  C\n} from './m';\nuse(A, C);\n"
+    assert prune(source) == "import {\n  A,\n  C\n} from './m';\nuse(A, C);\n"
+
+
+def test_multiline_keeps_trailing_comma():
+    source = "import {\n  A,\n  B,\n  C,\n} from './m';\nuse(A, C);\n"
+    assert prune(source) == "import {\n  A,\n  C,\n} from './m';\nuse(A, C);\n"
@@ -0,0 +1,56 @@
+import re
+
+from codemod.lintfix import LintMessage, fix_source
+
+RULE = '@typescript-eslint/no-unused-vars'
+
+
+def unused(source, name):
+    """A no-unused-vars message pointing at the first occurrence of name."""
+    offset = re.search(rf'\b{name}\b', source).start()
+    line = source.count('\n', 0, offset) + 1
+    column = offset - (source.rfind('\n', 0, offset) + 1) + 1
+    return LintMessage(RULE, line, column, f"'{name}' is defined but never used.")
+
+
+def test_unused_variable_is_renamed():
+    source = 'const total = 1;\nconsole.log(2);\n'
+
+    new, notes = fix_source(source, [unused(source, 'total')])
+
+    assert new == 'const _total = 1;\nconsole.log(2);\n'
+    assert notes == ['line 1: renamed total to _total']
+
+
+def test_shorthand_destructuring_keeps_its_key():
+    source = 'const { foo, ...rest } = obj;\nfunction f({ bar = 1, baz }) {\n  return baz;\n}\nuse(rest);\n'
+
+    new, _ = fix_source(source, [unused(source, 'foo'), unused(source, 'bar')])
+
+    assert new == ('const { foo: _foo, ...rest } = obj;\nfunction f({ bar: _bar = 1, baz }) {\n  return baz;\n}\n'
+                   'use(rest);\n')
+
+
+def test_renamed_property_and_block_declarations_are_renamed_in_place():
+    source = 'const { foo: unusedFoo } = obj;\nif (ok) {\n  let a = 1, b = 2;\n  use(a);\n}\n'
+
+    new, _ = fix_source(source, [unused(source, 'unusedFoo'), unused(source, 'b')])
+
+    assert new == 'const { foo: _unusedFoo } = obj;\nif (ok) {\n  let a = 1, _b = 2;\n  use(a);\n}\n'
+
+
+def test_unused_import_is_removed():
+    source = "import { a, b } from './m';\nuse(a);\n"
+
+    new, notes = fix_source(source, [unused(source, 'b')])
+
+    assert new == "import { a } from './m';\nuse(a);\n"
+    assert notes == ['line 1: removed unused import b']
+
+
+def test_other_rules_get_a_merged_disable_comment():
+    source = '  // eslint-disable-next-line no-console\n  x == y;\n'
+
+    new, _ = fix_source(source, [LintMessage('eqeqeq', 2, 3, 'Expected ===')])
+
+    assert new == '  // eslint-disable-next-line no-console, eqeqeq\n  x == y;\n'
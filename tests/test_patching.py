@@ -0,0 +1,62 @@
+import pytest
+
+from codemod.patching import AnchorError, MemberPatch, StatementPatch, apply_patches, index_classes
+
+SOURCE = '''export class Spawner {
+  private rate: number = 1;
+
+  /**
+   * Spawn one entity
+   */
+  spawn(): void {
+    let chance = 0.1;
+    if (Math.random() < chance) {
+      this.villager();
+    }
+  }
+}
+'''
+
+RESET = MemberPatch('Spawner', '''
+    reset(): void {
+      this.rate = 1;
+    }
+''', after='rate')
+
+BOOST = StatementPatch('Spawner', 'spawn', ('let', 'chance'), 'chance *= this.boost;', marker='boost')
+
+
+def test_index_classes_members_start_at_their_doc_comment():
+    members = index_classes(SOURCE)['Spawner'].members
+
+    assert list(members) == ['rate', 'spawn']
+    assert (members['rate'].kind, members['spawn'].kind) == ('property', 'method')
+    assert SOURCE[members['spawn'].start:].startswith('/**')
+
+
+def test_member_and_statement_patches_keep_the_file_indentation():
+    patched = apply_patches(SOURCE, [RESET, BOOST])
+
+    assert '  private rate: number = 1;\n\n  reset(): void {\n    this.rate = 1;\n  }\n\n  /**' in patched
+    assert '    let chance = 0.1;\n\n    chance *= this.boost;\n    if' in patched
+
+
+def test_patches_are_idempotent():
+    once = apply_patches(SOURCE, [RESET, BOOST])
+
+    assert apply_patches(once, [RESET, BOOST]) == once
+
+
+def test_anchors_survive_reformatting():
+    reformatted = SOURCE.replace('  private rate', '  // tuning\n  private   rate')
+
+    assert 'reset(): void' in apply_patches(reformatted, [RESET])
+
+
+def test_missing_anchor_raises():
+    with pytest.raises(AnchorError):
+        apply_patches(SOURCE, [MemberPatch('Spawner', 'x = 1;', after='missing')])
+    with pytest.raises(AnchorError):
+        apply_patches(SOURCE, [StatementPatch('Spawner', 'spawn', ('let', 'nope'), 'x();', marker='x')])
+    with pytest.raises(AnchorError):
+        apply_patches(SOURCE, [MemberPatch('Other', 'x = 1;')])
@@ -0,0 +1,33 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from codemod.reader import contains_any, mapped, peak_rss_kb, scan_file
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_mapped_empty_file_and_scan(tmp_path):
+    (tmp_path / 'empty.ts').write_bytes(b'')
+    (tmp_path / 'a.ts').write_bytes(b'one\ntwo console.log\nthree console.warn\n')
+
+    with mapped(tmp_path / 'empty.ts') as buffer:
+        assert buffer == b''
+    with mapped(tmp_path / 'a.ts') as buffer:
+        assert contains_any(buffer, [b'nope', b'warn'])
+        assert not contains_any(buffer, [b'error'])
+    regions = scan_file('a.ts', str(tmp_path / 'a.ts'), re.compile(rb'console\.\w+'))
+    assert [(region.line, region.text) for region in regions] == [(2, 'console.log'), (3, 'console.warn')]
+
+
+def test_peak_rss_without_the_resource_module(monkeypatch):
+    assert peak_rss_kb() > 0
+    # As on Windows, where the module does not exist
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    assert peak_rss_kb() is None
+
+
+def test_engine_imports_without_the_resource_module():
+    code = 'import sys; sys.modules["resource"] = None; import codemod.engine, codemod.grep, codemod.bench'
+    subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, check=True)
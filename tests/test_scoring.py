@@ -0,0 +1,50 @@
+import re
+
+import numpy as np
+import pytest
+
+from balance.constants import load_constants
+from balance.scoring import ScoreRules, check, random_streams, score_runs, score_stream
+from balance.spawnsim import MONSTER_TYPES
+from codemod.engine import REPO_ROOT
+
+GHOST, ZOMBIE = MONSTER_TYPES.index('ghost'), MONSTER_TYPES.index('zombie')
+
+
+@pytest.fixture(scope='module')
+def constants():
+    return load_constants(REPO_ROOT)
+
+
+@pytest.fixture(scope='module')
+def rules(constants):
+    return ScoreRules.from_constants(constants)
+
+
+def test_points_are_what_each_constructor_assigns(constants, rules):
+    expected = []
+    for name in MONSTER_TYPES:
+        source = (REPO_ROOT / f'src/entities/{name.capitalize()}.ts').read_text(encoding='utf-8')
+        override = re.search(r'this\.points = (\d+);', source)
+        expected.append(int(override[1]) if override else constants['MONSTER_BASE_POINTS'][name])
+
+    assert rules.points == tuple(expected)
+    assert rules.points[GHOST] == 30
+
+
+def test_multi_kill_cycle(rules):
+    # Ghost at combo 0, zombie at combo 1 (x1.15), then the double-kill bonus
+    expected = 30 + 11 + (30 + 11) * 3 // 4
+    stream = score_stream([(0, GHOST, False, False, False, False), (0, ZOMBIE, False, False, False, False)], [],
+                          rules)
+    scores = score_runs(1, np.array([0, 0]), np.array([0, 0]), np.array([GHOST, ZOMBIE]),
+                        np.array([], np.int64), np.array([], np.int64), rules)
+
+    assert stream['score'] == expected
+    assert (int(scores.score[0]), int(scores.multi_kill_score[0])) == (expected, 30)
+
+
+def test_vectorized_scoring_matches_the_reference(rules):
+    streams = random_streams(np.random.default_rng(1), 200, 60, rules, villagers=4)
+
+    assert check(streams, 200, rules, score_multiplier=1.25) == []
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from balance.constants import load_constants
+from balance.spawnsim import (GHOST_REALM, VILLAGER, Physics, _spawn_entities, _visible_spans, simulate_level,
+                              spawn_schedule)
+from codemod.engine import REPO_ROOT
+
+LEVEL = {'duration': 30, 'minKills': 5, 'villagerChance': 0.2, 'powerUpInterval': 10,
+         'monsterWeights': {'zombie': 50, 'vampire': 25, 'ghost': 25}}
+
+
+@pytest.fixture(scope='module')
+def physics():
+    return Physics.from_constants(load_constants(REPO_ROOT))
+
+
+def in_view_frames(sx, sy, vx, vy, alive, physics):
+    """Frame-by-frame semi-implicit Euler, as Arcade Physics steps a body."""
+    dt = physics.delta / 1000
+    x, y, frames = sx, sy, []
+    for k in range(alive):
+        if 0 <= x <= physics.width and 0 <= y <= physics.height:
+            frames.append(k)
+        vy += (physics.gravity + physics.world_gravity) * dt
+        x += vx * dt
+        y += vy * dt
+    return frames
+
+
+@pytest.mark.parametrize('pattern', [None, GHOST_REALM])
+def test_visible_spans_match_stepping_the_physics(physics, pattern):
+    _, sx, sy, vx, vy = _spawn_entities({**LEVEL, 'spawnPattern': pattern}, physics,
+                                        np.random.default_rng(3), (1, 300))
+    alive = np.full(sx.shape, 400)
+    spans = _visible_spans(sx, sy, vx, vy, alive, physics)
+
+    for i in range(sx.shape[1]):
+        expected = in_view_frames(sx[0, i], sy[0, i], vx[0, i], vy[0, i], 400, physics)
+        actual = [k for first, last in spans for k in range(first[0, i], last[0, i] + 1)]
+        assert actual == expected, i
+
+
+def test_spawn_interval_shrinks_over_the_first_minute():
+    entities, power_ups = spawn_schedule(90, 20, 1000 / 60)
+    gaps = np.diff(entities)
+
+    # 118 frames: 1966.7 ms elapsed against an interval already down to 1950.8 ms
+    assert entities[0] == 117
+    assert gaps[0] > gaps[-1] == 30
+    assert power_ups == [1199, 2399, 3599, 4799]
+
+
+def test_on_screen_counts_agree_with_the_spans(physics):
+    batch = simulate_level(LEVEL, 50, np.random.default_rng(0), physics)
+    counts = np.maximum(batch.view_spans[:, 1].astype(int) - batch.view_spans[:, 0] + 1, 0).sum(axis=0)
+
+    assert (counts == batch.frames_in_view).all()
+    assert (batch.on_screen.sum(axis=1) == batch.frames_in_view.sum(axis=1)).all()
+    monsters = np.where(batch.kind < VILLAGER, batch.frames_in_view, 0)
+    assert (batch.monsters_on_screen.sum(axis=1) == monsters.sum(axis=1)).all()
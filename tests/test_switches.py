@@ -0,0 +1,64 @@
+from codemod.switches import duplicate_cases, find_switches
+from codemod.tokenizer import tokenize
+
+
+def clauses(source):
+    [switch] = find_switches(source, list(tokenize(source)))
+    return [(clause.label, source[clause.start:clause.end].strip()) for clause in switch.clauses]
+
+
+def labels(source):
+    return [(first.label, dup.label, unreachable) for _, first, dup, unreachable in duplicate_cases(source)]
+
+
+def test_member_named_default_or_case_is_not_a_clause():
+    source = '''switch (kind) {
+  case 'a':
+    return mod.default;
+  case 'b':
+    return mod?.case;
+  default:
+    return null;
+}'''
+
+    assert clauses(source) == [
+        ("'a'", "case 'a':\n    return mod.default;"),
+        ("'b'", "case 'b':\n    return mod?.case;"),
+        (None, 'default:\n    return null;'),
+    ]
+
+
+def test_duplicate_label_and_reachability():
+    source = '''switch (size) {
+  case Size.S:
+    return 1;
+  case "S":
+  case Size.S:
+    return 2;
+  case 'S':
+    return 3;
+}'''
+
+    assert labels(source) == [('Size.S', 'Size.S', False), ('"S"', "'S'", True)]
+
+
+def test_nested_switches_do_not_share_labels():
+    source = '''switch (a) {
+  case 1:
+    switch (b) {
+      case 1:
+        break;
+    }
+    break;
+  case 2:
+    break;
+}'''
+
+    assert labels(source) == []
+    assert len(find_switches(source, list(tokenize(source)))) == 2
+
+
+def test_ternary_in_label_is_skipped():
+    source = 'switch (x) { case a ? b : c: f(); break; case a ? b : c: g(); }'
+
+    assert labels(source) == [('a ? b : c', 'a ? b : c', True)]
@@ -0,0 +1,40 @@
+from codemod.tokenizer import IDENT, PUNCT, REGEX, tokenize
+
+
+def kinds(source):
+    return [(tok.kind, tok.text) for tok in tokenize(source)]
+
+
+def test_postfix_increment_then_division():
+    assert kinds('x = a++ / 2 / 3;') == [
+        (IDENT, 'x'), (PUNCT, '='), (IDENT, 'a'), (PUNCT, '++'), (PUNCT, '/'), ('number', '2'),
+        (PUNCT, '/'), ('number', '3'), (PUNCT, ';'),
+    ]
+
+
+def test_postfix_decrement_then_division():
+    assert REGEX not in {kind for kind, _ in kinds('y = i-- / n / 2;')}
+
+
+def test_prefix_increment_keeps_regex_after_operator():
+    # `++` after an operator is a prefix: what follows is an operand
+    assert (REGEX, '/a+/g') in kinds('x = [++/a+/g.lastIndex];')
+
+
+def test_division_after_closing_paren():
+    assert REGEX not in {kind for kind, _ in kinds('const r = (a + b) / 2 / c;')}
+
+
+def test_division_after_closing_bracket():
+    assert REGEX not in {kind for kind, _ in kinds('const r = values[i] / 2 / c;')}
+
+
+def test_regex_after_operator_and_keyword():
+    assert (REGEX, '/\\d+/g') in kinds('const re = /\\d+/g;')
+    assert (REGEX, '/x/') in kinds('return /x/.test(s);')
+
+
+def test_bytes_match_text():
+    source = 'x = a++ / 2 / 3; y = (b) / 4 / 5; z = /re/;'
+    assert [(tok.kind, tok.start, tok.end) for tok in tokenize(source.encode())] == \
+        [(tok.kind, tok.start, tok.end) for tok in tokenize(source)]
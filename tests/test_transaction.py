@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from codemod import run
+from codemod.cache import content_digest
+from codemod.transaction import (JOURNAL_DIRNAME, JOURNAL_FILENAME, Transaction, TransactionError, pending_state,
+                                 rollback)
+
+
+def write(root, path, source):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(source.encode('utf-8'))
+    return content_digest(source.encode('utf-8'))
+
+
+def test_commit_writes_every_file(tmp_path):
+    digest = write(tmp_path, 'src/a.ts', 'a')
+    transaction = Transaction(tmp_path)
+    transaction.stage('src/a.ts', digest, 'A')
+    transaction.stage('src/new.ts', None, 'N')
+
+    assert transaction.commit() == ['src/a.ts', 'src/new.ts']
+    assert (tmp_path / 'src/a.ts').read_text() == 'A'
+    assert (tmp_path / 'src/new.ts').read_text() == 'N'
+    assert pending_state(tmp_path) == 'committed'
+
+
+def test_changed_file_aborts_the_whole_commit(tmp_path):
+    digest_a = write(tmp_path, 'src/a.ts', 'a')
+    digest_b = write(tmp_path, 'src/b.ts', 'b')
+    transaction = Transaction(tmp_path)
+    transaction.stage('src/a.ts', digest_a, 'A')
+    transaction.stage('src/b.ts', digest_b, 'B')
+    write(tmp_path, 'src/b.ts', 'edited')
+
+    with pytest.raises(TransactionError) as raised:
+        transaction.commit()
+
+    assert raised.value.paths == ('src/b.ts',)
+    assert (tmp_path / 'src/a.ts').read_text() == 'a'
+    assert (tmp_path / 'src/b.ts').read_text() == 'edited'
+    assert pending_state(tmp_path) is None
+
+
+def test_rollback_restores_originals_and_removes_created_files(tmp_path):
+    digest = write(tmp_path, 'src/a.ts', 'a')
+    transaction = Transaction(tmp_path)
+    transaction.stage('src/a.ts', digest, 'A')
+    transaction.stage('src/new.ts', None, 'N')
+    transaction.commit()
+
+    assert rollback(tmp_path) == (['src/a.ts', 'src/new.ts'], [])
+    assert (tmp_path / 'src/a.ts').read_text() == 'a'
+    assert not (tmp_path / 'src/new.ts').exists()
+    assert not (tmp_path / JOURNAL_DIRNAME).exists()
+
+
+def test_rollback_skips_files_edited_after_the_run(tmp_path):
+    digest = write(tmp_path, 'src/a.ts', 'a')
+    transaction = Transaction(tmp_path)
+    transaction.stage('src/a.ts', digest, 'A')
+    transaction.commit()
+    write(tmp_path, 'src/a.ts', 'edited')
+
+    assert rollback(tmp_path) == ([], ['src/a.ts'])
+    assert (tmp_path / 'src/a.ts').read_text() == 'edited'
+
+
+def test_next_run_rolls_back_an_interrupted_commit(tmp_path):
+    digest_a = write(tmp_path, 'src/a.ts', "console.log('a');\n")
+    digest_b = write(tmp_path, 'src/b.ts', "console.log('b');\n")
+    transaction = Transaction(tmp_path)
+    transaction.stage('src/a.ts', digest_a, 'A')
+    transaction.stage('src/b.ts', digest_b, 'B')
+    transaction.commit()
+    # As if the process died after replacing a.ts but before b.ts
+    journal = tmp_path / JOURNAL_DIRNAME / JOURNAL_FILENAME
+    journal.write_text(json.dumps({**json.loads(journal.read_text()), 'state': 'prepared'}))
+    write(tmp_path, 'src/b.ts', "console.log('b');\n")
+
+    report = run(['console-calls-to-debuglogger'], root=tmp_path, jobs=1, use_cache=False)
+
+    assert report.recovered == ['src/a.ts']
+    assert report.files_changed == ['src/a.ts', 'src/b.ts']
+    assert "debugLog('a');" in (tmp_path / 'src/a.ts').read_text()